@@ -1,17 +1,12 @@
 import logging
-import threading
-import time
 import os
-
-# google-cloud-storage is only needed in SQL/GCS mode; skip gracefully if absent
-try:
-    from google.cloud import storage
-except ImportError:
-    storage = None
+import time
 
 from flask import Flask
 from flask_cors import CORS
 
+import metrics
+
 app = Flask(__name__, static_folder='static', template_folder='templates')
 
 STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'sql')
@@ -27,14 +22,14 @@ _origins = [o.strip() for o in ALLOWED_ORIGINS.split(",") if o.strip()]
 CORS(app, resources={r"/*": {
     "origins": _origins,
     "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH", "HEAD"],
-    "allow_headers": ["Content-Type", "X-Download-Token", "Authorization", "X-Requested-With"]
+    "allow_headers": ["Content-Type", "X-Download-Token", "Authorization", "X-Requested-With", "Idempotency-Key"]
 }}, supports_credentials=True)
 
 app.logger.info("CORS configured for origins: %s", _origins)
 
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
-if STORAGE_BACKEND != 'json':
+if STORAGE_BACKEND == 'sql':
     # Prefer explicit URI for local dev
     env_uri = os.environ.get("SQLALCHEMY_DATABASE_URI")
     if env_uri:
@@ -59,16 +54,37 @@ if STORAGE_BACKEND != 'json':
     # initialize SQLAlchemy from models.py
     from models import db
     db.init_app(app)
+    metrics.install_sqlalchemy()
 
-    # Ensure DB tables exist at startup (works under gunicorn)
-    with app.app_context():
-        try:
-            db.create_all()
-            app.logger.info("DB tables ensured/created")
-        except Exception:
-            app.logger.exception("Failed to create DB tables")
+    # Schema changes are applied by `python -m migrations upgrade`, not on every
+    # worker boot; AUTO_MIGRATE=1 opts back in for dev / single-instance setups.
+    if os.environ.get("AUTO_MIGRATE", "").lower() in ("1", "true", "yes"):
+        import migrations
+        with app.app_context():
+            try:
+                ran = migrations.upgrade(db.engine, log=app.logger.info)
+                app.logger.info("AUTO_MIGRATE: %d migration(s) applied", len(ran))
+            except Exception:
+                app.logger.exception("AUTO_MIGRATE failed")
+    elif os.environ.get("SCHEMA_CHECK", "1").lower() not in ("0", "false", "no"):
+        # Refuse to boot on a stale schema rather than answer every read with
+        # "no active season"; an unreachable database is only logged, as before.
+        import migrations
+        from sqlalchemy.exc import OperationalError
+        with app.app_context():
+            try:
+                todo = migrations.pending(db.engine)
+            except OperationalError:
+                app.logger.exception("schema check skipped: database unreachable")
+                todo = []
+        if todo:
+            names = ", ".join(f"{version:04d}_{name}" for version, name in todo)
+            raise RuntimeError(f"schema migrations pending ({names}); run `python -m migrations upgrade`")
 else:
-    app.logger.info("STORAGE_BACKEND=json — skipping database initialization")
+    app.logger.info("STORAGE_BACKEND=%s — skipping database initialization", STORAGE_BACKEND)
+
+# request timing first, so it also covers the blueprint's before-request hooks
+metrics.init_app(app)
 
 # register blueprint routes
 from routes import routes as routes_bp
@@ -76,10 +92,41 @@ app.register_blueprint(routes_bp)
 
 logging.basicConfig(level=logging.INFO)
 
+
+# Opt-in warm-up (WARM_UP=1): run the hot read paths once while the worker boots
+# so the first visitor after a scale-from-zero does not pay for the DB
+# connection, the JSON store load, the standings/h2h/leaders aggregates or the
+# first render of each page's response.
+WARM_UP_PATHS = ('/routes/teams', '/routes/standings', '/routes/leaders',
+                 '/routes/h2h', '/routes/rosters', '/routes/results')
+
+
+def warm_up():
+    start = time.perf_counter()
+    if STORAGE_BACKEND == 'sql':
+        from sqlalchemy import text
+        with app.app_context():
+            with db.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+    client = app.test_client()
+    for path in WARM_UP_PATHS:
+        resp = client.get(path)
+        if resp.status_code != 200:
+            app.logger.warning("warm-up %s returned %s", path, resp.status_code)
+    app.logger.info("warm-up finished in %.0f ms", (time.perf_counter() - start) * 1000.0)
+
+
+if os.environ.get("WARM_UP", "").lower() in ("1", "true", "yes"):
+    try:
+        warm_up()
+    except Exception:
+        app.logger.exception("warm-up failed")
+
 if __name__ == "__main__":
     FLASK_ENV = os.environ.get("FLASK_ENV", "production")
-    if STORAGE_BACKEND != 'json':
+    if STORAGE_BACKEND == 'sql':
+        import migrations
         with app.app_context():
             from models import db
-            db.create_all()
+            migrations.upgrade(db.engine)
     app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 8080)), debug=(FLASK_ENV != "production"))
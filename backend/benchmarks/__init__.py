@@ -0,0 +1,2 @@
+"""Benchmark scripts for the backend. Run them from backend/ as modules, e.g.
+``python -m benchmarks.query_plans``."""
@@ -0,0 +1,224 @@
+"""
+league.py — seeded synthetic leagues for benchmarks.
+
+generate() builds a league shaped like the real one: a round-robin schedule
+(one matchup per team per night, a bye when the team count is odd), a fixed
+number of games per matchup, and player stat lines accumulated game by game.
+The same seed always produces the same league.
+
+The result is a dict {'teams': [...], 'players': [...], 'results': [...],
+'seasons': [...]} in the record format of backend/data/*.json. With several
+seasons the earlier ones are closed (without snapshots) and team/player
+counters cover only the last, as after storage.close_season. write_json() saves it as a JSON
+data directory and load_sql() loads it into a migrated SQL database.
+
+    python -m benchmarks.league --teams 12 --seasons 3 --out /tmp/league
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIRST_NAMES = ('Ike', 'Doug', 'Katie', 'Bub', 'Paul', 'Will', 'Beck', 'Tim', 'Mo', 'Jen',
+               'Ray', 'Lou', 'Deb', 'Hank', 'Sue', 'Cal', 'Gus', 'Dot', 'Red', 'Vic')
+TEAM_WORDS = ('Tossers', 'Darts', 'Dads', 'Aces', 'Bombers', 'Flyers', 'Sharks', 'Arrows',
+              'Hillbillies', 'Outlaws', 'Bandits', 'Rockets')
+
+# outcome of one at-bat: (probability, stat field); anything else is an out
+AT_BAT = ((0.17, 'Singles'), (0.07, 'Doubles'), (0.02, 'Triples'), (0.02, 'HRs'), (0.05, 'Dimes'))
+
+
+def _round_robin(team_ids):
+    """Yield the nightly pairings of one round robin (circle method)."""
+    ids = list(team_ids) + ([None] if len(team_ids) % 2 else [])
+    n = len(ids)
+    for _ in range(n - 1):
+        yield [(ids[i], ids[n - 1 - i]) for i in range(n // 2)
+               if ids[i] is not None and ids[n - 1 - i] is not None]
+        ids.insert(1, ids.pop())
+
+
+def generate(teams=9, players_per_team=9, seasons=1, nights=32, games_per_night=3,
+             seed=0, start=datetime.date(2025, 10, 1)):
+    """Return a league dict; see the module docstring."""
+    rng = random.Random(seed)
+    team_ids = list(range(1, teams + 1))
+    team_rows = {t: {'id': t, 'name': f'{TEAM_WORDS[(t - 1) % len(TEAM_WORDS)]} {t}',
+                     'wins': 0, 'losses': 0, 'win_pct': 0.0, 'games_behind': 0.0, 'games_played': 0}
+                 for t in team_ids}
+    players = []
+    roster = {}
+    for t in team_ids:
+        for n in range(players_per_team):
+            p = {'id': len(players) + 1,
+                 'name': f'{rng.choice(FIRST_NAMES)} {chr(65 + rng.randrange(26))}.',
+                 'team_id': t, 'Singles': 0, 'Doubles': 0, 'Triples': 0, 'Dimes': 0,
+                 'HRs': 0, 'Avg': 0.0, 'GP': 0, 'AtBats': 0, 'hits': 0}
+            players.append(p)
+            roster.setdefault(t, []).append(p)
+    skill = {p['id']: rng.uniform(0.7, 1.3) for p in players}
+
+    results = []
+    season_rows = []
+    day = start
+    for season_id in range(1, seasons + 1):
+        if season_id > 1:
+            season_rows[-1].update(status='closed', closed_on=day.isoformat())
+            for t in team_rows.values():
+                t.update(wins=0, losses=0)
+            for p in players:
+                p.update({f: 0 for f in ('Singles', 'Doubles', 'Triples', 'Dimes', 'HRs',
+                                         'AtBats', 'hits', 'GP')}, Avg=0.0)
+        season_rows.append({'id': season_id, 'name': f'Season {season_id}', 'status': 'active',
+                            'started_on': day.isoformat(), 'closed_on': None})
+        schedule = []
+        while len(schedule) < nights:
+            schedule.extend(_round_robin(team_ids))
+        for pairings in schedule[:nights]:
+            game_number = 0
+            for t1, t2 in pairings:
+                for _ in range(games_per_night):
+                    game_number += 1
+                    s1 = rng.randint(0, 6)
+                    s2 = rng.randint(0, 6)
+                    if s1 == s2:
+                        s1 += 1   # no ties in dartball
+                    results.append({'id': len(results) + 1, 'season_id': season_id,
+                                    'date': day.isoformat(),
+                                    'game_number': game_number, 'team1_id': t1, 'team2_id': t2,
+                                    'team1_score': s1, 'team2_score': s2})
+                    winner, loser = (t1, t2) if s1 > s2 else (t2, t1)
+                    team_rows[winner]['wins'] += 1
+                    team_rows[loser]['losses'] += 1
+                    for p in roster.get(t1, []) + roster.get(t2, []):
+                        apply_game(rng, p, skill[p['id']])
+            day += datetime.timedelta(days=7)
+        day += datetime.timedelta(days=140)
+
+    for t in team_rows.values():
+        t['games_played'] = t['wins'] + t['losses']
+        t['win_pct'] = t['wins'] / t['games_played'] * 100.0 if t['games_played'] else 0.0
+    leader = max(team_rows.values(), key=lambda t: (t['win_pct'], t['wins']), default=None)
+    for t in team_rows.values():
+        t['games_behind'] = ((leader['wins'] - t['wins']) + (t['losses'] - leader['losses'])) / 2
+    return {'teams': list(team_rows.values()), 'players': players, 'results': results,
+            'seasons': season_rows}
+
+
+def stat_line(rng, skill=1.0):
+    """One game's increments for a player, as update_player / the batch endpoint take them."""
+    line = {'Singles': 0, 'Doubles': 0, 'Triples': 0, 'HRs': 0, 'Dimes': 0,
+            'AtBats': rng.randint(5, 7)}
+    for _ in range(line['AtBats']):
+        roll = rng.random() / skill
+        for prob, field in AT_BAT:
+            if roll < prob:
+                line[field] += 1
+                break
+            roll -= prob
+    return line
+
+
+def apply_game(rng, p, skill=1.0):
+    line = stat_line(rng, skill)
+    for field, value in line.items():
+        p[field] += value
+    p['hits'] = p['Singles'] + p['Doubles'] + p['Triples'] + p['HRs']
+    p['GP'] += 1
+    p['Avg'] = p['hits'] / p['AtBats'] if p['AtBats'] else 0.0
+
+
+# ── Output ────────────────────────────────────────────────────────────────────
+
+def write_json(league, data_dir):
+    """Write teams.json / players.json / results.json (and seasons.json) into data_dir."""
+    os.makedirs(data_dir, exist_ok=True)
+    for entity in ('teams', 'players', 'results', 'seasons'):
+        if entity not in league:
+            continue
+        with open(os.path.join(data_dir, f'{entity}.json'), 'w') as f:
+            json.dump(league[entity], f, indent=2)
+
+
+def read_json(data_dir):
+    """Read a JSON data directory (e.g. backend/data) back into a league dict."""
+    league = {}
+    for entity in ('teams', 'players', 'results', 'seasons'):
+        path = os.path.join(data_dir, f'{entity}.json')
+        if entity == 'seasons' and not os.path.exists(path):
+            continue
+        with open(path) as f:
+            league[entity] = json.load(f)
+    return league
+
+
+def load_sql(league, engine, target=None):
+    """Migrate engine's database (up to target) and bulk-insert the league.
+
+    Only columns the migrated schema has are loaded, so older targets work too.
+    """
+    from sqlalchemy import MetaData, Table, inspect, insert, text
+    import migrations
+
+    migrations.upgrade(engine, target=target, log=lambda *_: None)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    with engine.begin() as conn:
+        has_seasons = inspect(conn).has_table('seasons')
+        metadata = MetaData()
+        if has_seasons and league.get('seasons'):
+            # replaces the migration's default season
+            conn.execute(Table('seasons', metadata, autoload_with=conn).delete())
+        for entity in ('seasons', 'teams', 'players', 'results'):
+            if entity == 'seasons' and not (has_seasons and league.get('seasons')):
+                continue
+            # the migrated schema's table, not models.py's: older targets lack columns
+            table = Table(entity, metadata, autoload_with=conn)
+            cols = set(table.c.keys())
+            rows = [{k: v for k, v in r.items() if k in cols} for r in league[entity]]
+            for r in rows:
+                for field in ('date', 'started_on', 'closed_on'):
+                    if r.get(field):
+                        r[field] = datetime.date.fromisoformat(r[field])
+                if entity == 'results' and 'season_id' in cols:
+                    r['season_id'] = r.get('season_id') or 1
+                if 'updated_at' in cols:
+                    r['updated_at'] = now
+            for i in range(0, len(rows), 5000):
+                conn.execute(insert(table), rows[i:i + 5000])
+            if conn.dialect.name == 'postgresql' and rows:
+                # explicit ids were inserted; move the serial past them
+                conn.execute(text(f"SELECT setval(pg_get_serial_sequence('{entity}', 'id'), "
+                                  f"(SELECT MAX(id) FROM {entity}))"))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--teams', type=int, default=9)
+    ap.add_argument('--players-per-team', type=int, default=9)
+    ap.add_argument('--seasons', type=int, default=1)
+    ap.add_argument('--nights', type=int, default=32, help='game nights per season')
+    ap.add_argument('--games-per-night', type=int, default=3, help='games per matchup per night')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--out', help='write a JSON data directory here')
+    ap.add_argument('--database-url', help='load into this (empty) SQL database')
+    args = ap.parse_args(argv)
+
+    league = generate(args.teams, args.players_per_team, args.seasons, args.nights,
+                      args.games_per_night, args.seed)
+    if args.out:
+        write_json(league, args.out)
+    if args.database_url:
+        from sqlalchemy import create_engine
+        load_sql(league, create_engine(args.database_url))
+    print(f"{len(league['teams'])} teams, {len(league['players'])} players, "
+          f"{len(league['results'])} results")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,351 @@
+"""
+load.py — replay a traffic mix against the Flask app and report latency.
+
+For each storage backend a fresh worker process is started on a generated
+league (see league.py). Its threads then drive the app in-process through
+Flask's test client with a weighted mix of requests:
+
+  browse       standings / results / rosters / leaders / h2h loads, player searches
+  match_night  browse traffic plus bursts of whole-match submissions and
+               player stat batches, as on a league night
+  mixed        mostly reads with an occasional write
+
+For every backend the report has p50/p95/p99 latency (overall and per
+operation), throughput, errors and peak RSS. Use --out to save it as JSON,
+and --compare to diff against a saved run. The exit status is 1 when an
+operation's p95 regressed beyond --tolerance, so runs from two commits can
+be compared directly.
+
+    python -m benchmarks.load
+    python -m benchmarks.load --mix match_night --requests 5000 --threads 8 --out after.json
+    python -m benchmarks.load --backend json --compare before.json
+    python -m benchmarks.load --backend sqlite
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+from benchmarks import league as league_gen  # noqa: E402
+
+READS = {
+    'standings': 25, 'results_latest': 12, 'results_team': 8, 'results_page': 5,
+    'rosters': 10, 'leaders': 10, 'h2h': 8, 'search': 15, 'teams': 7,
+}
+MIXES = {
+    'browse': READS,
+    'match_night': {**READS, 'record_match': 14, 'player_batch': 6},
+    'mixed': {**READS, 'record_match': 3, 'player_batch': 2},
+}
+
+
+# ── Operations ────────────────────────────────────────────────────────────────
+
+class Context:
+    """What the operations need to know about the generated league."""
+
+    def __init__(self, info):
+        self.team_ids = info['team_ids']
+        self.rosters = {int(t): ids for t, ids in info['rosters'].items()}
+        self.prefixes = info['prefixes']
+        self._keys = itertools.count()
+        self._lock = threading.Lock()
+        self.match_day = datetime.date.fromisoformat(info['last_date']) + datetime.timedelta(days=7)
+
+    def next_key(self):
+        with self._lock:
+            return f'bench-{os.getpid()}-{next(self._keys)}'
+
+
+def _stat_lines(rng, player_ids):
+    return [{'player_id': pid, **league_gen.stat_line(rng)} for pid in player_ids[:100]]
+
+
+def op_request(client, name, ctx, rng):
+    if name == 'standings':
+        return client.get('/routes/standings')
+    if name == 'teams':
+        return client.get('/routes/teams')
+    if name == 'results_latest':
+        return client.get('/routes/results')
+    if name == 'results_team':
+        return client.get(f'/routes/results?team_id={rng.choice(ctx.team_ids)}')
+    if name == 'results_page':
+        return client.get('/routes/results?page_size=100')
+    if name == 'rosters':
+        return client.get('/routes/rosters')
+    if name == 'leaders':
+        return client.get('/routes/leaders')
+    if name == 'h2h':
+        return client.get('/routes/h2h')
+    if name == 'search':
+        return client.get(f'/routes/players/search?q={rng.choice(ctx.prefixes)}')
+    if name == 'record_match':
+        t1, t2 = rng.sample(ctx.team_ids, 2)
+        games = []
+        for n in range(1, 4):
+            s1, s2 = rng.randint(0, 6), rng.randint(0, 6)
+            games.append({'game_number': n, 'team1_score': s1 + (s1 == s2), 'team2_score': s2})
+        body = {'date': ctx.match_day.isoformat(), 'team1_id': t1, 'team2_id': t2, 'games': games,
+                'players': _stat_lines(rng, ctx.rosters.get(t1, []) + ctx.rosters.get(t2, []))}
+        return client.post('/routes/admin/matches', json=body, headers={'Idempotency-Key': ctx.next_key()})
+    if name == 'player_batch':
+        team = rng.choice(ctx.team_ids)
+        lines = _stat_lines(rng, ctx.rosters.get(team, []))
+        if not lines:
+            return client.get('/routes/teams')
+        return client.post('/routes/admin/update_players/batch', json={'players': lines})
+    raise ValueError(f'unknown operation {name}')
+
+
+# ── Child: one backend under load ─────────────────────────────────────────────
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0, 1)
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    i = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return round(sorted_values[i], 3)
+
+
+def _summary(latencies):
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'p50_ms': _percentile(values, 50), 'p95_ms': _percentile(values, 95),
+        'p99_ms': _percentile(values, 99),
+        'mean_ms': round(sum(values) / len(values), 3) if values else None,
+        'max_ms': round(values[-1], 3) if values else None,
+    }
+
+
+def child(args, info):
+    import logging
+    logging.disable(logging.INFO)   # per-request INFO logging would dominate the numbers
+
+    import storage
+    if args.data_dir:
+        storage.DATA_DIR = args.data_dir
+    import app
+    boot_rss = _peak_rss_mb()
+
+    weights = MIXES[args.mix]
+    names, cum = list(weights), list(itertools.accumulate(weights.values()))
+    ctx = Context(info)
+    samples = {name: [] for name in names}
+    errors = {}
+    remaining = itertools.count()
+    sample_lock = threading.Lock()
+
+    def worker(i):
+        rng = random.Random(args.seed * 1000 + i)
+        client = app.app.test_client()
+        local = []
+        while next(remaining) < args.requests:
+            name = rng.choices(names, cum_weights=cum)[0]
+            start = time.perf_counter()
+            resp = op_request(client, name, ctx, rng)
+            elapsed = (time.perf_counter() - start) * 1000.0
+            local.append((name, elapsed, resp.status_code))
+        with sample_lock:
+            for name, elapsed, status in local:
+                samples[name].append(elapsed)
+                if status >= 400:
+                    errors[name] = errors.get(name, 0) + 1
+
+    # warm the resident store and aggregates so the run measures steady state
+    warm = app.app.test_client()
+    for path in ('/routes/standings', '/routes/h2h', '/routes/leaders'):
+        warm.get(path)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duration = time.perf_counter() - start
+
+    everything = [v for values in samples.values() for v in values]
+    print(json.dumps({
+        'requests': len(everything),
+        'errors': sum(errors.values()),
+        'errors_by_op': errors,
+        'duration_s': round(duration, 3),
+        'throughput_rps': round(len(everything) / duration, 1) if duration else None,
+        'latency': _summary(everything),
+        'ops': {name: _summary(values) for name, values in samples.items() if values},
+        'boot_rss_mb': boot_rss,
+        'peak_rss_mb': _peak_rss_mb(),
+    }))
+
+
+# ── Parent ────────────────────────────────────────────────────────────────────
+
+def _league_info(league):
+    rosters = {}
+    for p in league['players']:
+        rosters.setdefault(p['team_id'], []).append(p['id'])
+    prefixes = sorted({p['name'][:2].lower() for p in league['players']}) or ['a']
+    return {
+        'team_ids': [t['id'] for t in league['teams']],
+        'rosters': rosters,
+        'prefixes': prefixes,
+        'last_date': max((r['date'] for r in league['results']), default='2025-10-01'),
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_backend(backend, args, lg, info_path, scratch):
+    env = {k: v for k, v in os.environ.items() if k not in ('AUTO_MIGRATE', 'WARM_UP')}
+    cmd = [sys.executable, '-m', 'benchmarks.load', '--child', '--info', info_path,
+           '--mix', args.mix, '--requests', str(args.requests),
+           '--threads', str(args.threads), '--seed', str(args.seed)]
+    if backend == 'json':
+        data_dir = os.path.join(scratch, 'data')
+        league_gen.write_json(lg, data_dir)
+        env['STORAGE_BACKEND'] = 'json'
+        cmd += ['--data-dir', data_dir]
+    elif backend == 'sqlite':
+        from sqlalchemy import create_engine
+        path = os.path.join(scratch, 'league.db')
+        engine = create_engine(f'sqlite:///{path}')
+        league_gen.load_sql(lg, engine)
+        engine.dispose()
+        env['STORAGE_BACKEND'] = 'sqlite'
+        env['SQLITE_PATH'] = path
+    else:
+        from sqlalchemy import create_engine
+        url = args.database_url or f"sqlite:///{os.path.join(scratch, 'league.db')}"
+        engine = create_engine(url)
+        league_gen.load_sql(lg, engine)
+        engine.dispose()
+        env['STORAGE_BACKEND'] = 'sql'
+        env['SQLALCHEMY_DATABASE_URI'] = url
+    out = subprocess.run(cmd, cwd=BACKEND, env=env, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise SystemExit(f'{backend} run failed:\n{out.stderr[-4000:]}')
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def compare(report, baseline, tolerance):
+    """Print p95 changes per backend/operation; return the list of regressions."""
+    regressions = []
+    for backend, current in report['backends'].items():
+        old = baseline.get('backends', {}).get(backend)
+        if not old:
+            continue
+        print(f'\n{backend}: p95 vs baseline {baseline.get("commit") or "?"}')
+        for op, stats in sorted(current['ops'].items()):
+            before = old.get('ops', {}).get(op)
+            if not before or not before.get('p95_ms') or stats['p95_ms'] is None:
+                continue
+            ratio = stats['p95_ms'] / before['p95_ms']
+            # ignore sub-half-millisecond jitter on very fast operations
+            worse = ratio > 1 + tolerance and stats['p95_ms'] - before['p95_ms'] > 0.5
+            if worse:
+                regressions.append((backend, op, before['p95_ms'], stats['p95_ms']))
+            print(f"  {op:<16}{before['p95_ms']:>10.2f} -> {stats['p95_ms']:>8.2f} ms"
+                  f"  ({ratio:.2f}x){'  REGRESSION' if worse else ''}")
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--backend', choices=('json', 'sql', 'sqlite', 'both', 'all'), default='all',
+                    help="'both' is json and sql; 'all' adds sqlite")
+    ap.add_argument('--mix', choices=sorted(MIXES), default='match_night')
+    ap.add_argument('--requests', type=int, default=2000)
+    ap.add_argument('--threads', type=int, default=4)
+    ap.add_argument('--teams', type=int, default=9)
+    ap.add_argument('--players-per-team', type=int, default=9)
+    ap.add_argument('--seasons', type=int, default=3)
+    ap.add_argument('--nights', type=int, default=32)
+    ap.add_argument('--games-per-night', type=int, default=3)
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--database-url', help='empty SQL database for the sql run (default: temp SQLite)')
+    ap.add_argument('--out', help='save the report as JSON')
+    ap.add_argument('--compare', help='baseline report to diff against')
+    ap.add_argument('--tolerance', type=float, default=0.20, help='allowed p95 slowdown (default 0.20)')
+    ap.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    ap.add_argument('--info', help=argparse.SUPPRESS)
+    ap.add_argument('--data-dir', help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        with open(args.info) as f:
+            child(args, json.load(f))
+        return 0
+
+    lg = league_gen.generate(args.teams, args.players_per_team, args.seasons, args.nights,
+                             args.games_per_night, args.seed)
+    report = {
+        'commit': _git_commit(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'params': {k: v for k, v in vars(args).items()
+                   if k not in ('child', 'info', 'data_dir', 'out', 'compare', 'database_url')},
+        'league': {e: len(lg[e]) for e in ('teams', 'players', 'results')},
+        'backends': {},
+    }
+    backends = {'both': ('json', 'sql'), 'all': ('json', 'sql', 'sqlite')}.get(args.backend, (args.backend,))
+    for backend in backends:
+        scratch = tempfile.mkdtemp(prefix=f'bench-{backend}-')
+        try:
+            info_path = os.path.join(scratch, 'info.json')
+            with open(info_path, 'w') as f:
+                json.dump(_league_info(lg), f)
+            report['backends'][backend] = run_backend(backend, args, lg, info_path, scratch)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    print(f"{report['league']['results']} results, {report['league']['players']} players; "
+          f"mix={args.mix}, {args.requests} requests on {args.threads} threads")
+    for backend, r in report['backends'].items():
+        lat = r['latency']
+        print(f"\n{backend}: {r['throughput_rps']} req/s, p50 {lat['p50_ms']} / p95 {lat['p95_ms']} / "
+              f"p99 {lat['p99_ms']} ms, errors {r['errors']}, peak RSS {r['peak_rss_mb']} MB")
+        for op, s in sorted(r['ops'].items()):
+            print(f"  {op:<16}{s['count']:>6}  p50 {s['p50_ms']:>8.2f}  p95 {s['p95_ms']:>8.2f}"
+                  f"  p99 {s['p99_ms']:>8.2f} ms")
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f'\n{len(regressions)} p95 regression(s) beyond {args.tolerance:.0%}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
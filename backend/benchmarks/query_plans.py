@@ -0,0 +1,158 @@
+"""
+query_plans.py — query plans and latencies for the SQL read paths, before and
+after the 0002_query_indexes migration.
+
+Builds a synthetic multi-season league in a scratch database at the baseline
+schema (0001), times the statements storage.py issues, applies the index
+migration, and times them again.
+
+    python -m benchmarks.query_plans                          # SQLite temp file
+    python -m benchmarks.query_plans --seasons 40 --teams 32
+    python -m benchmarks.query_plans --database-url postgresql+psycopg2://...  # empty scratch DB!
+    python -m benchmarks.query_plans --json > plans.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, or_, select, text  # noqa: E402
+from sqlalchemy.orm import aliased  # noqa: E402
+
+import migrations  # noqa: E402
+from benchmarks import league  # noqa: E402
+from models import Player, Result, Team  # noqa: E402
+
+NIGHTS_PER_SEASON = 48
+GAMES_PER_MATCHUP = 3
+PLAYERS_PER_TEAM = 10
+
+
+# ── Query shapes (as issued by storage.py) ────────────────────────────────────
+
+def _results(where=None, limit=500):
+    r = Result.__table__
+    t1, t2 = aliased(Team.__table__), aliased(Team.__table__)
+    # the columns of the 0001 schema, which both phases have
+    cols = [r.c[name] for name in ('id', 'date', 'game_number', 'team1_id', 'team2_id',
+                                   'team1_score', 'team2_score')]
+    stmt = (select(*cols, t1.c.name, t2.c.name)
+            .select_from(r.outerjoin(t1, t1.c.id == r.c.team1_id)
+                          .outerjoin(t2, t2.c.id == r.c.team2_id)))
+    if where is not None:
+        stmt = stmt.where(where)
+    return stmt.order_by(r.c.date.desc(), r.c.game_number.asc()).limit(limit)
+
+
+def queries(teams, some_date):
+    r, p = Result.__table__, Player.__table__
+    team = teams // 2
+    return {
+        'results_latest': _results(),
+        'results_by_date': _results(r.c.date == some_date),
+        'results_by_team': _results(or_(r.c.team1_id == team, r.c.team2_id == team)),
+        'players_by_team': (select(*[c for c in p.c if c.name != 'updated_at'])   # 0001 columns
+                            .where(p.c.team_id == team).order_by(p.c.id)),
+    }
+
+
+def explain(conn, stmt):
+    sql = str(stmt.compile(conn, compile_kwargs={'literal_binds': True}))
+    if conn.dialect.name == 'sqlite':
+        return [row[-1] for row in conn.execute(text('EXPLAIN QUERY PLAN ' + sql))]
+    return [row[0] for row in conn.execute(text('EXPLAIN ' + sql))]
+
+
+def measure(conn, stmt, repeat):
+    conn.execute(stmt).fetchall()   # warm the page cache
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(stmt).fetchall()
+        times.append((time.perf_counter() - start) * 1000.0)
+    times.sort()
+    return {'p50_ms': round(statistics.median(times), 3),
+            'p95_ms': round(times[int(len(times) * 0.95) - 1], 3),
+            'mean_ms': round(statistics.fmean(times), 3)}
+
+
+def run_phase(engine, shapes, repeat):
+    out = {}
+    with engine.connect() as conn:
+        conn.execute(text('ANALYZE'))   # fresh planner statistics for both engines
+        for name, stmt in shapes.items():
+            out[name] = {'plan': explain(conn, stmt), **measure(conn, stmt, repeat)}
+    return out
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--database-url', help='scratch database (default: a temporary SQLite file)')
+    ap.add_argument('--seasons', type=int, default=20)
+    ap.add_argument('--teams', type=int, default=24)
+    ap.add_argument('--repeat', type=int, default=50)
+    ap.add_argument('--seed', type=int, default=1)
+    ap.add_argument('--json', action='store_true', help='print machine-readable JSON')
+    args = ap.parse_args(argv)
+
+    tmp = None
+    url = args.database_url
+    if not url:
+        fd, tmp = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        url = f'sqlite:///{tmp}'
+    engine = create_engine(url)
+
+    def quiet(*_):
+        pass
+
+    try:
+        lg = league.generate(args.teams, PLAYERS_PER_TEAM, args.seasons, NIGHTS_PER_SEASON,
+                             GAMES_PER_MATCHUP, args.seed)
+        league.load_sql(lg, engine, target=1)   # baseline schema, no indexes yet
+        n_results = len(lg['results'])
+        mid = datetime.date.fromisoformat(lg['results'][n_results // 2]['date'])
+        shapes = queries(args.teams, mid)
+
+        before = run_phase(engine, shapes, args.repeat)
+        migrations.upgrade(engine, target=2, log=quiet)
+        after = run_phase(engine, shapes, args.repeat)
+    finally:
+        engine.dispose()
+        if tmp:
+            os.unlink(tmp)
+
+    report = {
+        'dialect': engine.dialect.name,
+        'seasons': args.seasons, 'teams': args.teams,
+        'results': n_results, 'players': args.teams * PLAYERS_PER_TEAM,
+        'queries': {name: {'before': before[name], 'after': after[name]} for name in shapes},
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{report['dialect']}: {report['results']} results over {args.seasons} seasons, "
+          f"{report['players']} players\n")
+    for name, phases in report['queries'].items():
+        b, a = phases['before'], phases['after']
+        speedup = b['p50_ms'] / a['p50_ms'] if a['p50_ms'] else float('inf')
+        print(f"{name}: p50 {b['p50_ms']:.3f} ms -> {a['p50_ms']:.3f} ms ({speedup:.1f}x)")
+        for label, phase in (('before', b), ('after', a)):
+            for line in phase['plan']:
+                print(f'    {label:6}  {line}')
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
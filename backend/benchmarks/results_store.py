@@ -0,0 +1,165 @@
+"""
+results_store.py — resident memory and get_results(team_id=...) latency of
+the JSON engine's results table (jsonstore.ResultsTable) as results pile up
+over seasons.
+
+For each season count a synthetic league (league.py) is generated and its
+results loaded twice, from the same JSON text: into jsonstore.ResultsTable,
+and into the previous store — a dict per result, kept by id with date /
+team / season / season+team index sets and a cache of sorted lists (the
+baseline below is that code, trimmed to results). Memory is what tracemalloc
+sees while loading. A team's page of the active season is then fetched the
+way storage_json.get_results does it, "cold" (right after a write, which
+dropped the baseline's sorted-list cache) and "warm" (repeated, cache kept),
+and by a plain filter-and-sort over every result dict, for scale. Every page
+is checked against the baseline.
+
+    python -m benchmarks.results_store
+    python -m benchmarks.results_store --seasons 1 5 20 --teams 24 --json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jsonstore  # noqa: E402
+from benchmarks import league  # noqa: E402
+
+
+class DictTable:
+    """The results store before ResultsTable: dicts by id plus index sets."""
+
+    INDEXES = {
+        'date': lambda r: (r.get('date'),),
+        'team_id': lambda r: {r.get('team1_id'), r.get('team2_id')},
+        'season': lambda r: (jsonstore.season_of(r),),
+        'season_team': lambda r: {(jsonstore.season_of(r), r.get('team1_id')),
+                                  (jsonstore.season_of(r), r.get('team2_id'))},
+    }
+
+    def __init__(self, records):
+        self.by_id = {}
+        self.indexes = {name: {} for name in self.INDEXES}
+        self._ordered = {}
+        for r in records:
+            self.put(r)
+
+    def put(self, r):
+        self._ordered.clear()
+        self.by_id[r['id']] = r
+        for name, keys in self.INDEXES.items():
+            for k in keys(r):
+                self.indexes[name].setdefault(k, set()).add(r['id'])
+
+    def ordered(self, key, index, value):
+        cache_key = (key, index, value)
+        rows = self._ordered.get(cache_key)
+        if rows is None:
+            rows = sorted((self.by_id[i] for i in self.indexes[index].get(value, ())), key=key)
+            self._ordered[cache_key] = rows
+        return rows
+
+
+def listing_order(r):
+    d = r.get('date')
+    return (-datetime.date.fromisoformat(d).toordinal() if d else 0, r.get('game_number', 0), r['id'])
+
+
+def baseline_results(table, sid, team_id, limit=500):
+    """get_results(team_id=...) as storage_json did it over DictTable."""
+    rows = table.ordered(listing_order, 'season_team', (sid, team_id))[:limit]
+    return [{**r, 'season_id': jsonstore.season_of(r)} for r in rows]
+
+
+def scan_results(table, sid, team_id, limit=500):
+    """The same page from the dicts alone: filter everything, then sort."""
+    rows = sorted((r for r in table.by_id.values()
+                   if jsonstore.season_of(r) == sid and team_id in (r.get('team1_id'), r.get('team2_id'))),
+                  key=listing_order)[:limit]
+    return [{**r, 'season_id': jsonstore.season_of(r)} for r in rows]
+
+
+def columnar_results(table, sid, team_id, limit=500):
+    return table.select(season=sid, team_id=team_id, limit=limit)
+
+
+def loaded(build, text):
+    """(table, bytes allocated while parsing text and building the table)."""
+    tracemalloc.start()
+    try:
+        table = build(json.loads(text))
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return table, size
+
+
+def timed(fn, repeat, before=None):
+    times = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000.0)
+    return round(statistics.median(times), 4)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--seasons', type=int, nargs='+', default=[1, 5, 20])
+    ap.add_argument('--teams', type=int, default=24)
+    ap.add_argument('--repeat', type=int, default=50)
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--json', action='store_true', help='print machine-readable JSON')
+    args = ap.parse_args(argv)
+
+    jsonstore.ResultsTable('results', [])   # imports numpy, which the memory figures should not count
+
+    report = {}
+    for seasons in args.seasons:
+        data = league.generate(teams=args.teams, seasons=seasons, seed=args.seed)
+        text = json.dumps(data['results'])
+        sid = data['seasons'][-1]['id']
+        old, old_bytes = loaded(DictTable, text)
+        new, new_bytes = loaded(lambda rows: jsonstore.ResultsTable('results', rows), text)
+        for team_id in range(1, args.teams + 1):
+            if columnar_results(new, sid, team_id) != baseline_results(old, sid, team_id):
+                raise SystemExit(f'team {team_id}: ResultsTable disagrees with the baseline')
+        extra = dict(data['results'][-1], id=len(data['results']) + 1)
+        n = len(data['results'])
+        report[seasons] = {
+            'results': n,
+            'bytes_per_result': {'dicts': round(old_bytes / n, 1), 'columns': round(new_bytes / n, 1)},
+            'team_page_ms': {
+                'dicts_cold': timed(lambda: baseline_results(old, sid, 1), args.repeat,
+                                    before=lambda: old.put(extra)),
+                'dicts_warm': timed(lambda: baseline_results(old, sid, 1), args.repeat),
+                'dicts_scan': timed(lambda: scan_results(old, sid, 1), args.repeat),
+                'columns': timed(lambda: columnar_results(new, sid, 1), args.repeat),
+            },
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"{args.teams} teams; get_results(team_id=1) in the last season, median of {args.repeat}\n")
+    print(f"{'seasons':>8}{'results':>9}{'B/result dicts':>16}{'columns':>9}"
+          f"{'page cold':>12}{'warm':>9}{'scan':>10}{'columns':>10}")
+    for seasons, r in report.items():
+        b, t = r['bytes_per_result'], r['team_page_ms']
+        print(f"{seasons:>8}{r['results']:>9}{b['dicts']:>16.0f}{b['columns']:>9.1f}"
+              f"{t['dicts_cold']:>10.3f}ms{t['dicts_warm']:>7.3f}ms{t['dicts_scan']:>8.3f}ms"
+              f"{t['columns']:>8.3f}ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
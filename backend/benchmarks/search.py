@@ -0,0 +1,120 @@
+"""
+search.py — per-keystroke latency of /routes/players/search as the player
+list grows (JSON mode).
+
+For each size a JSON data directory with that many synthetic players is
+built, and a few names are "typed" one character at a time through
+storage.search_players. The previous implementation — a lowercase substring
+test over every player — is timed on the same data for comparison. A
+misspelt name is timed separately: once nothing matches literally, the search
+falls back to trigram similarity, whose cost follows the number of names
+sharing the query's rarer trigrams.
+
+    python -m benchmarks.search
+    python -m benchmarks.search --sizes 1000 10000 100000 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.league import FIRST_NAMES  # noqa: E402
+
+LAST_NAMES = ('Miller', 'Schmidt', 'Keller', 'Hoffman', 'Yoder', 'Graber', 'Lehman', 'Bontrager',
+              'Stutzman', 'Troyer', 'Weaver', 'Hershberger', 'Kauffman', 'Zook', 'Beachy', 'Mast')
+TYPED = ('Katie Yoder', 'hersh', 'Doug Z', 'stutz')
+TYPO = 'stutsman'
+
+
+def players(n, seed):
+    rng = random.Random(seed)
+    return [{'id': i, 'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{rng.randrange(100)}',
+             'team_id': 1 + i % 24, 'Singles': 0, 'Doubles': 0, 'Triples': 0, 'Dimes': 0,
+             'HRs': 0, 'Avg': 0.0, 'GP': 0, 'AtBats': 0, 'hits': 0}
+            for i in range(1, n + 1)]
+
+
+def linear_scan(rows, q, limit=200):
+    """The search before the name index: substring test over every player."""
+    return [dict(p) for p in rows if q.lower() in (p.get('name') or '').lower()][:limit]
+
+
+def keystrokes(texts=TYPED):
+    for text in texts:
+        for i in range(1, len(text) + 1):
+            yield text[:i]
+
+
+def timed(fn, repeat, texts=TYPED):
+    times = []
+    for q in keystrokes(texts):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(q)
+            times.append((time.perf_counter() - start) * 1000.0)
+    times.sort()
+    return {'p50_ms': round(statistics.median(times), 4),
+            'p95_ms': round(times[int(len(times) * 0.95) - 1], 4),
+            'max_ms': round(times[-1], 4)}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    ap.add_argument('--repeat', type=int, default=5)
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--json', action='store_true', help='print machine-readable JSON')
+    args = ap.parse_args(argv)
+
+    os.environ['STORAGE_BACKEND'] = 'json'
+    import jsonstore
+    import storage
+    storage.STORAGE_BACKEND = 'json'
+
+    report = {'keystrokes': sum(1 for _ in keystrokes()), 'sizes': {}}
+    for n in args.sizes:
+        data_dir = tempfile.mkdtemp()
+        try:
+            rows = players(n, args.seed)
+            for entity, records in (('teams', [{'id': t, 'name': f'Team {t}'} for t in range(1, 25)]),
+                                    ('players', rows), ('results', [])):
+                with open(os.path.join(data_dir, f'{entity}.json'), 'w') as f:
+                    json.dump(records, f)
+            storage.DATA_DIR = data_dir
+            start = time.perf_counter()
+            storage.search_players('')   # load and index
+            load_ms = (time.perf_counter() - start) * 1000.0
+            report['sizes'][n] = {
+                'index_build_ms': round(load_ms, 1),
+                'indexed': timed(storage.search_players, args.repeat),
+                'linear_scan': timed(lambda q: linear_scan(rows, q), args.repeat),
+                'typo': timed(storage.search_players, args.repeat, texts=(TYPO,)),
+            }
+        finally:
+            jsonstore._stores.pop(data_dir, None)
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"{report['keystrokes']} keystrokes per size, {args.repeat} repeats each\n")
+    print(f"{'players':>9}{'build':>10}{'indexed p50':>14}{'p95':>10}{'scan p50':>12}{'p95':>10}"
+          f"{'typo p50':>12}{'p95':>10}")
+    for n, r in report['sizes'].items():
+        print(f"{n:>9}{r['index_build_ms']:>8.1f}ms{r['indexed']['p50_ms']:>12.3f}ms"
+              f"{r['indexed']['p95_ms']:>8.3f}ms{r['linear_scan']['p50_ms']:>10.3f}ms"
+              f"{r['linear_scan']['p95_ms']:>8.3f}ms{r['typo']['p50_ms']:>10.3f}ms"
+              f"{r['typo']['p95_ms']:>8.3f}ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+startup.py — cold-start cost of a worker in each storage mode.
+
+Each run starts a fresh interpreter (as a new Cloud Run instance would) and
+measures:
+
+  import_ms          `import app` — module imports, app/DB setup, optional warm-up
+  first_ms           first GET of --path after boot
+  second_ms          the same GET again (steady state)
+  boot_to_first_ms   interpreter start to first response body
+
+Every mode is measured with WARM_UP off and on. SQL and SQLite modes run
+against the same temporary SQLite copy of backend/data/*.json built with the
+migrations (SQL through SQLAlchemy, SQLite through storage_sqlite.py).
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --path /routes/results --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ── Child: one cold boot ──────────────────────────────────────────────────────
+
+def child(path):
+    t0 = time.perf_counter()
+    sys.path.insert(0, BACKEND)
+    import app
+    t_import = time.perf_counter()
+    client = app.app.test_client()
+    first = client.get(path)
+    t_first = time.perf_counter()
+    client.get(path)
+    t_second = time.perf_counter()
+    print(json.dumps({
+        'status': first.status_code,
+        'import_ms': (t_import - t0) * 1000.0,
+        'first_ms': (t_first - t_import) * 1000.0,
+        'second_ms': (t_second - t_first) * 1000.0,
+    }))
+
+
+# ── Parent ────────────────────────────────────────────────────────────────────
+
+def seed_sqlite(path):
+    """Create a migrated SQLite database holding the bundled JSON data."""
+    sys.path.insert(0, BACKEND)
+    from sqlalchemy import create_engine
+    from benchmarks import league
+
+    engine = create_engine(f'sqlite:///{path}')
+    league.load_sql(league.read_json(os.path.join(BACKEND, 'data')), engine)
+    engine.dispose()
+
+
+def boot(env, path):
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, '-m', 'benchmarks.startup', '--child', '--path', path],
+                         cwd=BACKEND, env=env, capture_output=True, text=True, check=True)
+    wall = (time.perf_counter() - start) * 1000.0
+    m = json.loads(out.stdout.strip().splitlines()[-1])
+    m['boot_to_first_ms'] = wall - m['second_ms']
+    return m
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--runs', type=int, default=5)
+    ap.add_argument('--path', default='/routes/standings')
+    ap.add_argument('--json', action='store_true', help='print machine-readable JSON')
+    ap.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.child:
+        child(args.path)
+        return 0
+
+    fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        seed_sqlite(db_path)
+        modes = {
+            'json': {'STORAGE_BACKEND': 'json'},
+            'sql': {'STORAGE_BACKEND': 'sql', 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'},
+            'sqlite': {'STORAGE_BACKEND': 'sqlite', 'SQLITE_PATH': db_path},
+        }
+        report = {'path': args.path, 'runs': args.runs, 'modes': {}}
+        for mode, mode_env in modes.items():
+            for warm in (False, True):
+                env = {**os.environ, **mode_env, 'WARM_UP': '1' if warm else '0'}
+                env.pop('AUTO_MIGRATE', None)
+                samples = [boot(env, args.path) for _ in range(args.runs)]
+                report['modes'][f"{mode}{'+warm_up' if warm else ''}"] = {
+                    key: round(statistics.median(s[key] for s in samples), 1)
+                    for key in ('import_ms', 'first_ms', 'second_ms', 'boot_to_first_ms')
+                }
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"GET {report['path']}, median of {report['runs']} cold boots\n")
+    print(f"{'mode':<14}{'import':>10}{'first':>10}{'second':>10}{'boot->first':>14}")
+    for mode, m in report['modes'].items():
+        print(f"{mode:<14}{m['import_ms']:>8.1f}ms{m['first_ms']:>8.1f}ms"
+              f"{m['second_ms']:>8.1f}ms{m['boot_to_first_ms']:>12.1f}ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+transfer.py — time and memory of export_to_json.py export / import as the
+league grows.
+
+For each size a synthetic league (league.py) is loaded into a scratch
+database, exported to a JSON data directory and to JSONL, then imported into
+a second, freshly migrated database; every step verifies counts and checksums.
+Peak memory is Python's traced allocations during a second run of the step
+(tracemalloc), so it shows whether a step streams or holds whole tables.
+
+    python -m benchmarks.transfer
+    python -m benchmarks.transfer --seasons 5 20 80 --json
+    python -m benchmarks.transfer --database-url postgresql+psycopg2://... --target-url ...  # scratch DBs!
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+import export_to_json  # noqa: E402
+import migrations  # noqa: E402
+from benchmarks import league  # noqa: E402
+
+
+def measured(fn, *args, **kwargs):
+    """Run fn twice: once for wall time, once under tracemalloc (which slows it) for memory."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        tracemalloc.start()
+        fn(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {'seconds': round(seconds, 3), 'peak_mb': round(peak / 2**20, 2)}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--seasons', type=int, nargs='+', default=[5, 20, 60])
+    ap.add_argument('--teams', type=int, default=24)
+    ap.add_argument('--database-url', help='scratch source database (default: temporary SQLite files)')
+    ap.add_argument('--target-url', help='scratch import target (default: temporary SQLite file)')
+    ap.add_argument('--seed', type=int, default=1)
+    ap.add_argument('--json', action='store_true', help='print machine-readable JSON')
+    args = ap.parse_args(argv)
+
+    report = {}
+    for seasons in args.seasons:
+        tmp = tempfile.mkdtemp()
+        src = create_engine(args.database_url or f'sqlite:///{tmp}/src.db')
+        dst = create_engine(args.target_url or f'sqlite:///{tmp}/dst.db')
+        try:
+            lg = league.generate(args.teams, 10, seasons, 48, 3, args.seed)
+            league.load_sql(lg, src)
+            migrations.upgrade(dst, log=lambda *_: None)
+            rows = sum(len(lg[e]) for e in ('teams', 'players', 'results'))
+            del lg
+            out, jsonl = os.path.join(tmp, 'data'), os.path.join(tmp, 'jsonl')
+            report[seasons] = {
+                'rows': rows,
+                'export_json': measured(export_to_json.export, src, out),
+                'export_jsonl': measured(export_to_json.export, src, jsonl, fmt='jsonl'),
+                'import': measured(export_to_json.import_, dst, jsonl, replace=True),
+                'json_bytes': sum(os.path.getsize(os.path.join(out, f)) for f in os.listdir(out)),
+            }
+        finally:
+            src.dispose()
+            dst.dispose()
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"{'seasons':>8}{'rows':>10}{'export json':>22}{'export jsonl':>22}{'import':>22}")
+    for seasons, r in report.items():
+        cells = ''.join(f"{r[k]['seconds']:>10.2f}s {r[k]['peak_mb']:>7.1f} MB"
+                        for k in ('export_json', 'export_jsonl', 'import'))
+        print(f"{seasons:>8}{r['rows']:>10}{cells}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
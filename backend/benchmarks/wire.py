@@ -0,0 +1,116 @@
+"""
+wire.py — payload size and serialization time of /routes/results and
+/routes/players, plain rows vs ?format=columnar (see backend/wire.py).
+
+For each league size a synthetic season (league.py) is rendered the way the
+endpoints render it: a full-season results listing (rows enriched with
+team1_name / team2_name, as get_results returns them) and the full player
+list. Each shape is serialized with Flask's JSON provider, timed, and
+compressed with gzip and (if installed) brotli at the levels httpcache.py
+uses. results.json as written to disk (indent=2) is shown for reference.
+Every columnar payload is decoded and checked against the rows.
+
+    python -m benchmarks.wire
+    python -m benchmarks.wire --teams 9 24 48 --json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+
+import httpcache  # noqa: E402
+import wire  # noqa: E402
+from benchmarks import league  # noqa: E402
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        times.append((time.perf_counter() - start) * 1000.0)
+    return out, round(statistics.median(times), 3)
+
+
+def measure(render, repeat):
+    body, ms = timed(render, repeat)
+    sizes = {'raw': len(body)}
+    for coding in httpcache._codings():
+        sizes[coding] = len(httpcache._compress(body, coding))
+    return {'serialize_ms': ms, 'bytes': sizes}
+
+
+def payloads(teams, seed):
+    data = league.generate(teams=teams, seed=seed)
+    names = {t['id']: t['name'] for t in data['teams']}
+    # get_results order: newest date first, then game_number and id
+    results = sorted(data['results'], key=lambda r: (-datetime.date.fromisoformat(r['date']).toordinal(),
+                                                      r['game_number'], r['id']))
+    results = [{**r, 'team1_name': names[r['team1_id']], 'team2_name': names[r['team2_id']]}
+               for r in results]
+    return results, data['players'], names
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--teams', type=int, nargs='+', default=[9, 24, 48])
+    ap.add_argument('--repeat', type=int, default=20)
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--json', action='store_true', help='print machine-readable JSON')
+    args = ap.parse_args(argv)
+
+    app = Flask('bench')
+
+    def dumps(payload):
+        # exactly what jsonify sends: compact separators, sorted keys
+        return app.json.response(payload).get_data()
+
+    report = {}
+    for teams in args.teams:
+        results, players, names = payloads(teams, args.seed)
+        season_id = results[0]['season_id']
+        if wire.decode(wire.results(results, season_id)) != results:
+            raise SystemExit('columnar results do not round-trip')
+        decoded = wire.decode(wire.players(players, names))
+        if [{k: p[k] for k in wire.PLAYER_COLUMNS} for p in players] != decoded:
+            raise SystemExit('columnar players do not round-trip')
+        report[teams] = {
+            'results': len(results),
+            'players': len(players),
+            'results_file_indent2': len(json.dumps(results, indent=2).encode('utf-8')),
+            'results_rows': measure(lambda: dumps(results), args.repeat),
+            'results_columnar': measure(lambda: dumps(wire.results(results, season_id)), args.repeat),
+            'players_rows': measure(lambda: dumps(players), args.repeat),
+            'players_columnar': measure(lambda: dumps(wire.players(players, names)), args.repeat),
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    codings = list(httpcache._codings())
+    print(f"median of {args.repeat} serializations; bytes raw / {' / '.join(codings)}\n")
+    for teams, r in report.items():
+        print(f"{teams} teams: {r['results']} results, {r['players']} players "
+              f"(results.json with indent=2: {r['results_file_indent2']} bytes)")
+        for name in ('results_rows', 'results_columnar', 'players_rows', 'players_columnar'):
+            m = r[name]
+            sizes = ' / '.join(str(m['bytes'][c]) for c in ['raw'] + codings)
+            print(f"  {name:<18}{m['serialize_ms']:>9.2f} ms   {sizes}")
+        for kind in ('results', 'players'):
+            rows, col = r[f'{kind}_rows'], r[f'{kind}_columnar']
+            print(f"  {kind} columnar/rows: time x{col['serialize_ms'] / rows['serialize_ms']:.2f}, "
+                  + ', '.join(f"{c} x{col['bytes'][c] / rows['bytes'][c]:.2f}" for c in ['raw'] + codings))
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,26 +1,92 @@
+-- Reference DDL (PostgreSQL) for the SQL backend, kept in step with
+-- backend/models.py. The live schema is owned by backend/migrations:
+--     cd backend && python -m migrations upgrade
+-- Do not apply this file to a database that migrations manage.
+
 CREATE TABLE IF NOT EXISTS teams (
-    id INT AUTO_INCREMENT PRIMARY KEY,
-    name VARCHAR(100) NOT NULL,
-    wins INT NOT NULL DEFAULT 0,
-    losses INT NOT NULL DEFAULT 0,
-    win_pct DOUBLE NOT NULL DEFAULT 0.0,
-    games_behind DOUBLE NOT NULL DEFAULT 0.0,
-    games_played INT NOT NULL DEFAULT 0
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    id SERIAL PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    wins INTEGER,
+    losses INTEGER,
+    win_pct DOUBLE PRECISION,
+    games_behind DOUBLE PRECISION,
+    games_played INTEGER,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
 
 CREATE TABLE IF NOT EXISTS players (
-    id INT AUTO_INCREMENT PRIMARY KEY,
+    id SERIAL PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    team_id INTEGER REFERENCES teams(id),
+    "Singles" INTEGER,
+    "Doubles" INTEGER,
+    "Triples" INTEGER,
+    "Dimes" INTEGER,
+    "HRs" INTEGER,
+    "Avg" DOUBLE PRECISION,
+    "GP" INTEGER,
+    "AtBats" INTEGER,
+    hits INTEGER NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS seasons (
+    id SERIAL PRIMARY KEY,
     name VARCHAR(100) NOT NULL,
-    team_id INT NULL,
-    Singles INT NOT NULL DEFAULT 0,
-    Doubles INT NOT NULL DEFAULT 0,
-    Triples INT NOT NULL DEFAULT 0,
-    Dimes INT NOT NULL DEFAULT 0,
-    HRs INT NOT NULL DEFAULT 0,
-    Avg DOUBLE NOT NULL DEFAULT 0.0,
-    GP INT NOT NULL DEFAULT 0,
-    AtBats INT NOT NULL DEFAULT 0,
-    hits INT NOT NULL DEFAULT 0,
-    CONSTRAINT fk_players_team FOREIGN KEY (team_id) REFERENCES teams(id)
-        ON DELETE SET NULL ON UPDATE CASCADE
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
\ No newline at end of file
+    status VARCHAR(10) NOT NULL,          -- 'active' | 'closed'
+    started_on DATE,
+    closed_on DATE,
+    snapshot TEXT,                        -- frozen JSON of a closed season
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    id SERIAL PRIMARY KEY,
+    season_id INTEGER REFERENCES seasons(id),
+    date DATE NOT NULL,
+    game_number INTEGER NOT NULL,
+    team1_id INTEGER NOT NULL REFERENCES teams(id),
+    team2_id INTEGER NOT NULL REFERENCES teams(id),
+    team1_score INTEGER NOT NULL,
+    team2_score INTEGER NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS match_submissions (
+    id SERIAL PRIMARY KEY,
+    key VARCHAR(100) NOT NULL UNIQUE,
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    response TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS data_version (
+    id SERIAL PRIMARY KEY,
+    version BIGINT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(200) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 0002_query_indexes
+CREATE INDEX IF NOT EXISTS ix_results_date_game ON results (date, game_number);
+CREATE INDEX IF NOT EXISTS ix_results_team1_date ON results (team1_id, date);
+CREATE INDEX IF NOT EXISTS ix_results_team2_date ON results (team2_id, date);
+CREATE INDEX IF NOT EXISTS ix_players_team_id ON players (team_id);
+
+-- 0003_seasons
+CREATE INDEX IF NOT EXISTS ix_results_season_date ON results (season_id, date, game_number);
+CREATE INDEX IF NOT EXISTS ix_results_season_team1 ON results (season_id, team1_id, date);
+CREATE INDEX IF NOT EXISTS ix_results_season_team2 ON results (season_id, team2_id, date);
+
+-- 0004_player_name_trgm
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS ix_players_name_trgm ON players USING gin (lower(name) gin_trgm_ops);
+
+-- 0005_updated_at
+CREATE INDEX IF NOT EXISTS ix_teams_updated_at ON teams (updated_at);
+CREATE INDEX IF NOT EXISTS ix_players_updated_at ON players (updated_at);
+CREATE INDEX IF NOT EXISTS ix_results_updated_at ON results (updated_at);
+CREATE INDEX IF NOT EXISTS ix_seasons_updated_at ON seasons (updated_at);
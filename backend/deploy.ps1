@@ -36,6 +36,34 @@ if ($CloudSqlInstance -ne "" -and $DbUser -ne "" -and $DbPass -ne "" -and $DbNam
 
 $envStr = ($envVars -join ",")
 
+# The app no longer creates tables on boot, and its workers refuse to start while
+# migrations are pending: apply them with a one-off job before deploying the service.
+if ($envStr -ne "") {
+    Write-Host "Applying database migrations (Cloud Run job dartball-migrate)..."
+    $jobArgs = @(
+      "run","jobs","deploy","dartball-migrate",
+      "--image",$Image,
+      "--region","us-central1",
+      "--command","python","--args","-m,migrations,upgrade",
+      "--set-env-vars",$envStr,
+      "--max-retries","0",
+      "--project",$Project
+    )
+    if ($CloudSqlInstance -ne "") {
+        $jobArgs += @("--set-cloudsql-instances",$CloudSqlInstance)
+    }
+    & gcloud @jobArgs
+    if ($LASTEXITCODE -ne 0) {
+        Write-Error "gcloud run jobs deploy failed with exit code $LASTEXITCODE"
+        exit $LASTEXITCODE
+    }
+    gcloud run jobs execute dartball-migrate --region us-central1 --wait --project $Project
+    if ($LASTEXITCODE -ne 0) {
+        Write-Error "Migrations failed with exit code $LASTEXITCODE; the service was not deployed"
+        exit $LASTEXITCODE
+    }
+}
+
 Write-Host "Deploying image to Cloud Run..."
 $deployCmd = "gcloud run deploy dartball-backend --image $Image --region us-central1 --platform managed --allow-unauthenticated --set-env-vars `"$envStr`" --project $Project"
 if ($CloudSqlInstance -ne "") {
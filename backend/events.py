@@ -0,0 +1,222 @@
+"""
+events.py — Server-Sent Events feed of committed changes (/routes/events).
+
+storage calls publish() from its _notify_* hooks once a write has committed,
+and every changed row becomes one compact event:
+
+  id: <epoch>:<seq>
+  data: {"entity":"result","id":412,"values":{...},"version":57}
+
+entity is result, player or team; values is the row as storage returns it
+(null once it has been deleted); version is storage.data_version() after the
+write. Each event is encoded once into a bounded ring buffer (EVENTS_BUFFER)
+that every open stream reads from, so an idle subscriber costs a generator
+and a socket — no thread or queue per client.
+
+A client reconnecting with Last-Event-ID gets what it missed from the buffer.
+If that is no longer possible (evicted, or the id came from another worker)
+it gets {"entity":"resync","version":...} and should refetch. Writes made by
+other processes only show up as a data version change: while anyone listens,
+one poller per process reads storage.data_version() every EVENTS_POLL seconds
+and sends a resync when the version moved further than this process's own
+commits explain.
+
+Streams wait on a threading.Condition, which gevent's monkey-patching makes
+cooperative, so under `gunicorn -k gevent` one worker holds hundreds of idle
+streams. Where a stream would pin a whole worker process (the sync worker),
+the response carries only the pending events and closes, and the client's
+EventSource reconnects after the retry delay — polling, over the same
+protocol.
+"""
+
+import collections
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import storage
+
+BUFFER = int(os.environ.get('EVENTS_BUFFER', 1000))
+HEARTBEAT = float(os.environ.get('EVENTS_HEARTBEAT', 15))
+MAX_AGE = float(os.environ.get('EVENTS_MAX_AGE', 240))    # stay under proxy / gunicorn timeouts
+POLL = float(os.environ.get('EVENTS_POLL', 2))
+RETRY_MS = int(os.environ.get('EVENTS_RETRY_MS', 3000))
+POLLER_IDLE = 60      # seconds the poller outlives the last subscriber (covers reconnect loops)
+
+_log = logging.getLogger(__name__)
+
+# event ids are only meaningful to the process that issued them
+_EPOCH = os.urandom(4).hex()
+
+_cond = threading.Condition()
+_state = {
+    'seq': 0,                                       # id of the newest event
+    'buffer': collections.deque(maxlen=BUFFER),     # (seq, encoded frame)
+    'version': None,                                # newest data version seen
+    'subscribers': 0,
+    'last_seen': 0.0,                               # monotonic time a subscriber last left
+    'commits': 0,                                   # own commits since the poller last looked
+    'polled': None,                                 # data version at the poller's last look
+    'poller': None,
+    'app': None,                                    # for the poller's app context (SQL mode)
+}
+
+
+# ── Publishing ────────────────────────────────────────────────────────────────
+
+def _frame(seq, payload):
+    data = json.dumps(payload, separators=(',', ':'), default=str)
+    return f'id: {_EPOCH}:{seq}\ndata: {data}\n\n'
+
+
+def _append(payloads, version):
+    with _cond:
+        for payload in payloads:
+            _state['seq'] += 1
+            _state['buffer'].append((_state['seq'], _frame(_state['seq'], payload)))
+        _state['version'] = version
+        _cond.notify_all()
+
+
+def publish(entity, updated=(), deleted_ids=()):
+    """Queue one event per changed row. Called by storage after commit."""
+    if not updated and not deleted_ids:
+        return
+    try:
+        version = storage.data_version()
+        _append([{'entity': entity, 'id': row['id'], 'values': row, 'version': version}
+                 for row in updated] +
+                [{'entity': entity, 'id': row_id, 'values': None, 'version': version}
+                 for row_id in deleted_ids], version)
+    except Exception:
+        # the write itself has committed; listeners will resync on the version change
+        _log.exception("event publish failed")
+
+
+def committed():
+    """Count one of this process's commits (see _poll)."""
+    with _cond:
+        _state['commits'] += 1
+
+
+def _poll():
+    while True:
+        time.sleep(POLL)
+        with _cond:
+            if not _state['subscribers'] and time.monotonic() - _state['last_seen'] > POLLER_IDLE:
+                _state['poller'] = None
+                _state['polled'] = None
+                return
+            app = _state['app']
+        try:
+            if app is not None:
+                with app.app_context():
+                    version = storage.data_version()
+            else:
+                version = storage.data_version()
+        except Exception:
+            _log.exception("event poll failed")
+            continue
+        with _cond:
+            previous, own = _state['polled'], _state['commits']
+            _state['polled'], _state['commits'] = version, 0
+        if previous is not None and (version < previous or version - previous > own):
+            _append([{'entity': 'resync', 'version': version}], version)
+
+
+# ── Subscribing ───────────────────────────────────────────────────────────────
+
+def cooperative(environ):
+    """True if the WSGI server can keep a response open without pinning a worker process."""
+    if environ.get('wsgi.multithread'):
+        return True
+    monkey = sys.modules.get('gevent.monkey')
+    return bool(monkey and monkey.is_module_patched('threading'))
+
+
+def _since(seq):
+    """Frames newer than seq, or None if some of them were already evicted (under _cond)."""
+    buffer = _state['buffer']
+    if seq == _state['seq']:
+        return []
+    if not buffer or buffer[0][0] > seq + 1:
+        return None
+    frames = []
+    for s, frame in reversed(buffer):
+        if s <= seq:
+            break
+        frames.append(frame)
+    frames.reverse()
+    return frames
+
+
+def _resume(last_event_id):
+    """Starting seq for a subscriber and its backlog (None: resync needed), under _cond."""
+    if not last_event_id:
+        return _state['seq'], []
+    epoch, _, seq = last_event_id.partition(':')
+    if epoch != _EPOCH or not seq.isdigit() or int(seq) > _state['seq']:
+        return _state['seq'], None
+    return int(seq), _since(int(seq))
+
+
+def stream(last_event_id=None, cooperative=True, app=None):
+    """Yield the text/event-stream body for one subscriber.
+
+    last_event_id: the client's Last-Event-ID, to replay what it missed.
+    cooperative: hold the stream open (up to MAX_AGE seconds, with a comment
+    line every HEARTBEAT seconds) rather than returning after the backlog.
+    """
+    with _cond:
+        _state['subscribers'] += 1
+        if app is not None:
+            _state['app'] = app
+        if _state['poller'] is None:
+            _state['poller'] = threading.Thread(target=_poll, name='events-poller', daemon=True)
+            _state['poller'].start()
+        seq, backlog = _resume(last_event_id)
+        current, version = _state['seq'], _state['version']
+    try:
+        if backlog is None:
+            yield f'retry: {RETRY_MS}\n\n' + _frame(current, {'entity': 'resync', 'version': version})
+        else:
+            # the bare id sets the client's Last-Event-ID even when nothing is pending
+            yield f'retry: {RETRY_MS}\nid: {_EPOCH}:{seq}\n\n' + ''.join(backlog)
+        seq = current
+        if not cooperative:
+            return
+
+        deadline = time.monotonic() + MAX_AGE
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                return
+            with _cond:
+                frames = _since(seq)
+                if frames == []:
+                    _cond.wait(min(HEARTBEAT, deadline - now))
+                    frames = _since(seq)
+                current, version = _state['seq'], _state['version']
+            if frames is None:
+                seq = current
+                yield _frame(seq, {'entity': 'resync', 'version': version})
+            elif frames:
+                seq = current
+                yield ''.join(frames)
+            else:
+                yield ': keepalive\n\n'
+    finally:
+        with _cond:
+            _state['subscribers'] -= 1
+            _state['last_seen'] = time.monotonic()
+
+
+def status():
+    """Subscriber and buffer counts for this process (for admin tooling)."""
+    with _cond:
+        return {'subscribers': _state['subscribers'], 'seq': _state['seq'],
+                'buffered': len(_state['buffer']), 'version': _state['version'],
+                'polling': _state['poller'] is not None}
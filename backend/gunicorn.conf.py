@@ -0,0 +1,16 @@
+"""
+gunicorn.conf.py — worker hooks for the container's gevent workers (see Dockerfile).
+
+The gevent worker patches Python's sockets and threads, but psycopg2 talks to
+PostgreSQL from C. Without psycogreen every SQL query would block the worker's
+whole event loop, and with it every open /routes/events stream.
+"""
+
+
+def post_fork(server, worker):
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        server.log.warning("psycogreen not installed; SQL queries will block the gevent loop")
+        return
+    patch_psycopg()
@@ -0,0 +1,152 @@
+"""
+h2h.py — precomputed head-to-head records between every pair of teams.
+
+Results are aggregated per unordered pair, keyed by (low team id, high team id).
+Each pair keeps a date-ordered list of the nights the two teams met together
+with cumulative win/loss/game counts, so both the season-to-date record and
+the record as of any cutoff date are a dict lookup plus a bisect — no scan of
+the results table.
+
+storage.add_results folds new games in via apply_results(); rebuild() repairs
+the aggregate from the results table.
+"""
+
+import bisect
+import threading
+
+import storage
+
+_lock = threading.Lock()
+_state = {
+    'pairs': None,        # {(lo, hi): {'dates': [...], 'lo_wins': [...], 'hi_wins': [...], 'games': [...]}}
+    'season_id': None,    # season the state covers
+    'count': 0,
+    'max_id': None,
+}
+
+
+# ── Aggregation ───────────────────────────────────────────────────────────────
+
+def _fold(pairs, r):
+    t1, t2 = r['team1_id'], r['team2_id']
+    s1, s2 = r.get('team1_score') or 0, r.get('team2_score') or 0
+    lo, hi = (t1, t2) if t1 < t2 else (t2, t1)
+    lo_score, hi_score = (s1, s2) if t1 < t2 else (s2, s1)
+    lo_win = 1 if lo_score > hi_score else 0
+    hi_win = 1 if hi_score > lo_score else 0
+    date = r.get('date') or ''
+
+    p = pairs.setdefault((lo, hi), {'dates': [], 'lo_wins': [], 'hi_wins': [], 'games': []})
+    i = bisect.bisect_left(p['dates'], date)
+    if i == len(p['dates']) or p['dates'][i] != date:
+        # new night for this pair: start from the previous cumulative row
+        prev = i - 1
+        p['dates'].insert(i, date)
+        p['lo_wins'].insert(i, p['lo_wins'][prev] if prev >= 0 else 0)
+        p['hi_wins'].insert(i, p['hi_wins'][prev] if prev >= 0 else 0)
+        p['games'].insert(i, p['games'][prev] if prev >= 0 else 0)
+    # bump this night and every later one (only non-zero for back-dated makeups)
+    for j in range(i, len(p['dates'])):
+        p['lo_wins'][j] += lo_win
+        p['hi_wins'][j] += hi_win
+        p['games'][j] += 1
+
+
+def _build(results):
+    pairs = {}
+    max_id = None
+    for r in results:
+        _fold(pairs, r)
+        if max_id is None or r['id'] > max_id:
+            max_id = r['id']
+    return pairs, max_id
+
+
+def rebuild():
+    """Recompute every pair from the active season's results in storage.
+
+    The aggregate always mirrors storage (see _ensure_fresh); to repair an SQL
+    deployment from an exported results.json, import it with export_to_json.py
+    and rebuild. Returns the number of results folded in.
+    """
+    season_id = storage.active_season()['id']
+    results = storage.all_results(season_id)
+    pairs, max_id = _build(results)
+    with _lock:
+        _state['pairs'] = pairs
+        _state['season_id'] = season_id
+        _state['count'] = len(results)
+        _state['max_id'] = max_id
+    return len(results)
+
+
+def apply_results(created):
+    """Fold newly committed result dicts into the pair aggregate."""
+    with _lock:
+        pairs = _state['pairs']
+        if pairs is None:
+            return
+        if any(r.get('season_id') != _state['season_id'] for r in created):
+            _state['pairs'] = None   # a season was closed under us; rebuild on next read
+            return
+        for r in created:
+            _fold(pairs, r)
+            if _state['max_id'] is None or r['id'] > _state['max_id']:
+                _state['max_id'] = r['id']
+        _state['count'] += len(created)
+
+
+def _ensure_fresh():
+    fingerprint = storage.results_fingerprint()
+    with _lock:
+        current = ((_state['season_id'], _state['count'], _state['max_id'])
+                   if _state['pairs'] is not None else None)
+    if current != fingerprint:
+        rebuild()
+
+
+# ── Lookups ───────────────────────────────────────────────────────────────────
+
+def _record(p, as_of):
+    """Cumulative (lo_wins, hi_wins, games) for a pair entry, optionally cut off at as_of."""
+    if as_of is None:
+        i = len(p['dates']) - 1
+    else:
+        i = bisect.bisect_right(p['dates'], as_of) - 1
+    if i < 0:
+        return 0, 0, 0
+    return p['lo_wins'][i], p['hi_wins'][i], p['games'][i]
+
+
+def get_pair(team1_id, team2_id, as_of=None):
+    """Return team1's record against team2: {'wins', 'losses', 'games'}.
+
+    as_of: ISO date string; only games on or before that date count.
+    """
+    _ensure_fresh()
+    lo, hi = (team1_id, team2_id) if team1_id < team2_id else (team2_id, team1_id)
+    with _lock:
+        p = (_state['pairs'] or {}).get((lo, hi))
+        lo_wins, hi_wins, games = _record(p, as_of) if p else (0, 0, 0)
+    if team1_id == lo:
+        return {'wins': lo_wins, 'losses': hi_wins, 'games': games}
+    return {'wins': hi_wins, 'losses': lo_wins, 'games': games}
+
+
+def get_matrix(as_of=None, with_games=False):
+    """Return {team_id: {opponent_id: {'wins', 'losses'}}} for every pair that has met.
+
+    with_games=True adds each pair's games played (ties included) to the entries.
+    """
+    _ensure_fresh()
+    matrix = {}
+    with _lock:
+        for (lo, hi), p in (_state['pairs'] or {}).items():
+            lo_wins, hi_wins, games = _record(p, as_of)
+            if games == 0:
+                continue
+            matrix.setdefault(lo, {})[hi] = {'wins': lo_wins, 'losses': hi_wins}
+            matrix.setdefault(hi, {})[lo] = {'wins': hi_wins, 'losses': lo_wins}
+            if with_games:
+                matrix[lo][hi]['games'] = matrix[hi][lo]['games'] = games
+    return matrix
@@ -0,0 +1,143 @@
+"""
+httpcache.py — ETags and a server-side response cache for public GET endpoints.
+
+Every response from a @cached_get view carries a strong ETag derived from
+storage.data_version(), which every committed mutation bumps. A request whose
+If-None-Match matches gets a bodyless 304. Otherwise the rendered body is kept
+in a small LRU keyed by (endpoint, normalized query args, data version), so
+repeat requests between writes are served without touching storage at all.
+Entries for older versions can never be hit again and are dropped as soon as
+a newer version is seen.
+
+Bodies of COMPRESS_MIN_BYTES or more are sent gzip- or brotli-encoded when the
+request's Accept-Encoding allows it (brotli only if the Brotli package is
+installed). Each encoding is compressed once per cache entry and kept with it,
+and gets its own ETag (<tag>-gzip, <tag>-br), as a strong validator must.
+"""
+
+import gzip
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, make_response, request
+
+import storage
+
+MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_SIZE', 256))
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+_lock = threading.Lock()
+_entries = OrderedDict()   # (endpoint, args, version) -> (body, status, mimetype, {coding: body})
+_state = {'version': None, 'hits': 0, 'misses': 0}
+
+
+def _remember(key, resp):
+    with _lock:
+        entry = _entries[key] = (resp.get_data(), resp.status_code, resp.mimetype, {})
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return entry
+
+
+def _lookup(key, version):
+    with _lock:
+        if _state['version'] != version:
+            # data changed: nothing cached under an older version is reachable
+            _entries.clear()
+            _state['version'] = version
+        hit = _entries.get(key)
+        if hit is not None:
+            _entries.move_to_end(key)
+            _state['hits'] += 1
+        else:
+            _state['misses'] += 1
+        return hit
+
+
+# ── Compression ───────────────────────────────────────────────────────────────
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _codings():
+    return ('br', 'gzip') if _brotli() is not None else ('gzip',)
+
+
+def _compress(body, coding):
+    if coding == 'br':
+        return _brotli().compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _encode(resp, entry):
+    """Compress resp's body from the cache entry if the client accepts it; returns the coding."""
+    body, _, _, encoded = entry
+    if len(body) < COMPRESS_MIN_BYTES:
+        return None
+    resp.vary.add('Accept-Encoding')
+    coding = request.accept_encodings.best_match(_codings())
+    if coding is None:
+        return None
+    with _lock:
+        data = encoded.get(coding)
+    if data is None:
+        data = _compress(body, coding)
+        with _lock:
+            encoded[coding] = data
+    resp.set_data(data)
+    resp.headers['Content-Encoding'] = coding
+    return coding
+
+
+def _finish(resp, etag, coding=None):
+    resp.set_etag(etag if coding is None else f'{etag}-{coding}')
+    resp.headers['Cache-Control'] = 'no-cache'
+    return resp
+
+
+def cached_get(view):
+    """Decorate a read-only view: ETag/304 handling plus the versioned response cache."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method != 'GET':
+            return view(*args, **kwargs)
+
+        version = storage.data_version()
+        etag = f'{storage.STORAGE_BACKEND}-{version}'
+        for coding in (None, 'gzip', 'br'):
+            tag = etag if coding is None else f'{etag}-{coding}'
+            if request.if_none_match.contains(tag):
+                return _finish(Response(status=304), etag, coding)
+
+        key = (request.endpoint, tuple(sorted(kwargs.items())),
+               tuple(sorted(request.args.items(multi=True))), version)
+        hit = _lookup(key, version)
+        if hit is not None:
+            body, status, mimetype, _ = hit
+            resp = Response(body, status=status, mimetype=mimetype)
+            resp.headers['X-Cache'] = 'HIT'
+            return _finish(resp, etag, _encode(resp, hit))
+
+        resp = make_response(view(*args, **kwargs))
+        if resp.status_code != 200 or resp.is_streamed:
+            return resp
+        entry = _remember(key, resp)
+        resp.headers['X-Cache'] = 'MISS'
+        return _finish(resp, etag, _encode(resp, entry))
+    return wrapper
+
+
+def stats():
+    with _lock:
+        return {'entries': len(_entries), 'version': _state['version'],
+                'hits': _state['hits'], 'misses': _state['misses']}
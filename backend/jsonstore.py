@@ -0,0 +1,756 @@
+"""
+jsonstore.py — resident, indexed, journaled store for STORAGE_BACKEND=json.
+
+On-disk layout (backend/data/):
+    teams.json, players.json, results.json   snapshots (plain JSON lists)
+    matches.json                              idempotency keys of recorded matches
+    snapshot.json                             {"seq": N} — last journal entry folded into the snapshots
+    journal.jsonl                             append-only log, one committed change per line
+
+Every mutation is one journal line {"seq": n, "ops": [...]} where each op is
+{"op": "put", "entity": ..., "record": {...}} or {"op": "del", "entity": ..., "id": ...}.
+Ops carry the full record, so replaying them is idempotent. A line is appended
+and fsynced before the change is applied in memory, so write cost scales with
+the size of the change, not the dataset.
+
+A background compactor folds the journal into the snapshot files (written to a
+temp file, fsynced and renamed into place, so a crash never leaves a truncated
+players.json) and then empties the journal. Recovery loads the snapshots and
+replays the journal entries newer than snapshot.json; a torn final line from a
+crash mid-append is ignored and trimmed on the next write.
+
+Each entity lives in memory in a Table that keeps records by id plus secondary
+indexes (players by team and by name prefix / trigram). Results, by far the
+largest entity, are a ResultsTable instead: one int32 column per field, with
+filters evaluated over whole columns and dicts built only for the rows a
+read returns. Reads only stat() the journal and snapshot files to pick up
+changes written by another process or by hand.
+
+Several worker processes may share one data directory:
+  - writers serialize on file_lock() (an flock on data/.lock), catch up on the
+    journal, and only then read-modify-write — no lost increments
+  - snapshot files are only ever replaced by atomic rename
+  - readers never take the file lock; they replay complete journal lines under
+    a short in-memory lock and see each commit entirely or not at all
+
+Callers (storage_json.py) hold storage_json._lock while reading or refreshing the
+resident tables and must treat returned records as read-only — copy before
+handing them out.
+
+Under gunicorn's gevent worker, waiting for the file lock and fsync run in
+gevent's thread pool (see off_loop), so a slow disk or a long compaction in
+another process parks one greenlet rather than the whole worker.
+"""
+
+import bisect
+import contextlib
+import datetime
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines
+    fcntl = None
+    import msvcrt
+
+import metrics
+import namesearch
+
+ENTITIES = ('teams', 'players', 'results', 'matches', 'seasons')
+# entities whose snapshot must exist; the others start empty until first compaction
+REQUIRED_ENTITIES = ('teams', 'players', 'results')
+
+# results written before seasons existed carry no season_id; they belong to season 1
+DEFAULT_SEASON_ID = 1
+
+
+def season_of(r):
+    return r.get('season_id') or DEFAULT_SEASON_ID
+
+
+# entity -> {index name: function(record) -> iterable of keys}
+INDEXES = {
+    'teams': {},
+    'players': {
+        'team_id': lambda r: (r.get('team_id'),),
+        'name_trigram': lambda r: namesearch.trigrams(r.get('name')),
+    },
+    'matches': {
+        'key': lambda r: (r.get('key'),),
+    },
+    'seasons': {
+        'status': lambda r: (r.get('status'),),
+    },
+}
+
+# entity -> {index name: function(record) -> iterable of str keys}, kept as a
+# sorted list of (key, id) so prefix_scan() walks matches in key order
+SORTED_INDEXES = {
+    'players': {
+        'name': lambda r: (namesearch.normalize(r.get('name')),),
+        'name_words': lambda r: namesearch.word_suffixes(r.get('name')),
+    },
+}
+
+# compact once the journal grows past this many bytes, or after this many
+# seconds without a write
+COMPACT_BYTES = int(os.environ.get('JSON_COMPACT_BYTES', 256 * 1024))
+COMPACT_IDLE_SECONDS = float(os.environ.get('JSON_COMPACT_IDLE_SECONDS', 30))
+
+JOURNAL = 'journal.jsonl'
+SNAPSHOT_META = 'snapshot.json'
+LOCK_FILE = '.lock'
+
+_log = logging.getLogger(__name__)
+
+_stores = {}
+
+
+class Table:
+    """Records of one entity keyed by id, with secondary indexes."""
+
+    def __init__(self, entity, records):
+        self.entity = entity
+        self.by_id = {}
+        self.max_id = None
+        self.indexes = {name: {} for name in INDEXES[entity]}
+        self.sorted = {name: [] for name in SORTED_INDEXES.get(entity, ())}
+        self._ordered = {}
+        for r in records:
+            self._add(r, bulk=True)
+        for entries in self.sorted.values():
+            entries.sort()
+
+    # ── reads ──
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def get(self, record_id):
+        return self.by_id.get(record_id)
+
+    def all(self):
+        return self.by_id.values()
+
+    def lookup(self, index, key):
+        """Records whose index key equals key, in id order."""
+        ids = self.indexes[index].get(key, ())
+        return [self.by_id[i] for i in sorted(ids)]
+
+    def prefix_scan(self, index, prefix):
+        """Yield ids whose sorted-index key starts with prefix, in key order.
+
+        An id can appear more than once (one per matching key). Iterate with
+        the caller's lock held.
+        """
+        entries = self.sorted[index]
+        i = bisect.bisect_left(entries, (prefix,))
+        while i < len(entries) and entries[i][0].startswith(prefix):
+            yield entries[i][1]
+            i += 1
+
+    def ordered(self, key, reverse=False, index=None, value=None):
+        """All records (or those whose index key equals value) sorted by key.
+
+        Cached until the next mutation. key must be a stable module-level
+        function (the cache is keyed on it).
+        """
+        cache_key = (key, reverse, index, value)
+        rows = self._ordered.get(cache_key)
+        if rows is None:
+            source = self.lookup(index, value) if index is not None else self.by_id.values()
+            rows = sorted(source, key=key, reverse=reverse)
+            self._ordered[cache_key] = rows
+        return rows
+
+    def ids(self):
+        return self.by_id.keys()
+
+    def next_id(self):
+        return (self.max_id or 0) + 1
+
+    # ── writes (only via Store.commit / replay) ──
+
+    def _add(self, r, bulk=False):
+        self.by_id[r['id']] = r
+        if self.max_id is None or r['id'] > self.max_id:
+            self.max_id = r['id']
+        for name, keys in INDEXES[self.entity].items():
+            for k in keys(r):
+                self.indexes[name].setdefault(k, set()).add(r['id'])
+        for name, keys in SORTED_INDEXES.get(self.entity, {}).items():
+            entries = self.sorted[name]
+            for k in keys(r):
+                if bulk:
+                    entries.append((k, r['id']))   # sorted once by __init__
+                else:
+                    bisect.insort(entries, (k, r['id']))
+
+    def _unindex(self, r):
+        for name, keys in INDEXES[self.entity].items():
+            for k in keys(r):
+                bucket = self.indexes[name].get(k)
+                if bucket is not None:
+                    bucket.discard(r['id'])
+                    if not bucket:
+                        del self.indexes[name][k]
+        for name, keys in SORTED_INDEXES.get(self.entity, {}).items():
+            for k in keys(r):
+                self._sorted_discard(name, k, r['id'])
+
+    def _sorted_discard(self, name, key, record_id):
+        entries = self.sorted[name]
+        i = bisect.bisect_left(entries, (key, record_id))
+        if i < len(entries) and entries[i] == (key, record_id):
+            del entries[i]
+
+    def put(self, record):
+        self._ordered.clear()
+        old = self.by_id.get(record['id'])
+        if old is None:
+            self._add(record)
+            return
+        self.by_id[record['id']] = record
+        # re-key only the indexes whose keys changed (a stat update leaves the
+        # name and team indexes alone)
+        for name, keys in INDEXES[self.entity].items():
+            old_keys, new_keys = set(keys(old)), set(keys(record))
+            if old_keys == new_keys:
+                continue
+            index = self.indexes[name]
+            for k in old_keys - new_keys:
+                bucket = index.get(k)
+                if bucket is not None:
+                    bucket.discard(record['id'])
+                    if not bucket:
+                        del index[k]
+            for k in new_keys - old_keys:
+                index.setdefault(k, set()).add(record['id'])
+        for name, keys in SORTED_INDEXES.get(self.entity, {}).items():
+            old_keys, new_keys = set(keys(old)), set(keys(record))
+            for k in old_keys - new_keys:
+                self._sorted_discard(name, k, record['id'])
+            for k in new_keys - old_keys:
+                bisect.insort(self.sorted[name], (k, record['id']))
+
+    def delete(self, record_id):
+        r = self.by_id.pop(record_id, None)
+        if r is not None:
+            self._ordered.clear()
+            self._unindex(r)
+        return r
+
+
+class ResultsTable:
+    """Results held column-wise: one int32 NumPy array per field, rows in id order.
+
+    A result costs 32 bytes of column data instead of a dict, its strings and
+    its index entries. select() filters whole columns at once and builds dicts
+    only for the rows it returns. Dates are stored as ordinals. A value a
+    column cannot hold is kept, per id, in extras (rare: hand-edited files).
+    Offers the Table methods the generic code paths use: get, all, ids,
+    next_id, max_id, put, delete and len().
+    """
+
+    COLUMNS = ('id', 'season_id', 'date', 'game_number', 'team1_id', 'team2_id',
+               'team1_score', 'team2_score')
+    NULL = -2 ** 31     # None in the record
+
+    def __init__(self, entity, records):
+        import numpy as np
+        self._np = np
+        self.entity = entity
+        self.extras = {}        # id -> {field: value} the columns cannot represent
+        self.has_nulls = False
+        self._dates = {}        # date ordinal -> ISO string, for every stored date
+        by_id = {r['id']: r for r in records}
+        rows = [self._encode(by_id[i]) for i in sorted(by_id)]
+        self.n = len(rows)
+        data = np.array(rows, dtype=np.int32).reshape(self.n, len(self.COLUMNS))
+        capacity = max(64, self.n + self.n // 4)
+        self.cols = {}
+        for j, name in enumerate(self.COLUMNS):
+            col = np.empty(capacity, dtype=np.int32)
+            col[:self.n] = data[:, j]
+            self.cols[name] = col
+        self.max_id = int(self.cols['id'][self.n - 1]) if self.n else None
+
+    # ── encoding ──
+
+    def _encode(self, r):
+        values, extra = [], {}
+        for name in self.COLUMNS:
+            v = r.get(name)
+            if name == 'season_id' and v is None:
+                v = DEFAULT_SEASON_ID
+            elif name == 'date' and v is not None:
+                try:
+                    day = datetime.date.fromisoformat(v)
+                except (TypeError, ValueError):
+                    day = None
+                if day is None or day.isoformat() != v:
+                    extra[name], v = v, None
+                else:
+                    v = day.toordinal()
+                    self._dates.setdefault(v, day.isoformat())
+            if v is not None and (type(v) is not int or not self.NULL < v < 2 ** 31):
+                extra[name], v = v, None
+            if v is None:
+                self.has_nulls = True
+                v = self.NULL
+            values.append(v)
+        for name, v in r.items():
+            if name not in self.COLUMNS:
+                extra[name] = v
+        if extra:
+            self.extras[r['id']] = extra
+        else:
+            self.extras.pop(r['id'], None)
+        return values
+
+    def materialize(self, rows):
+        """Record dicts for the given row positions (fresh dicts, in that order)."""
+        columns = [self.cols[name][rows].tolist() for name in self.COLUMNS]
+        iso = self._dates
+        if self.has_nulls:
+            null = self.NULL
+            out = [{name: None if v == null else v for name, v in zip(self.COLUMNS, values)}
+                   for values in zip(*columns)]
+            for r in out:
+                if r['date'] is not None:
+                    r['date'] = iso[r['date']]
+        else:
+            # the common case, spelled out: a dict display is several times faster than dict(zip())
+            out = [{'id': i, 'season_id': season, 'date': iso[day], 'game_number': game,
+                    'team1_id': t1, 'team2_id': t2, 'team1_score': s1, 'team2_score': s2}
+                   for i, season, day, game, t1, t2, s1, s2 in zip(*columns)]
+        if self.extras:
+            for r in out:
+                extra = self.extras.get(r['id'])
+                if extra:
+                    r.update(extra)
+        return out
+
+    # ── reads ──
+
+    def __len__(self):
+        return self.n
+
+    def _row(self, record_id):
+        ids = self.cols['id'][:self.n]
+        i = int(self._np.searchsorted(ids, record_id))
+        return i, i < self.n and ids[i] == record_id
+
+    def get(self, record_id):
+        i, found = self._row(record_id)
+        return self.materialize([i])[0] if found else None
+
+    def all(self):
+        return self.materialize(self._np.arange(self.n))
+
+    def ids(self):
+        return self.cols['id'][:self.n].tolist()
+
+    def next_id(self):
+        return (self.max_id or 0) + 1
+
+    def count(self, season=None):
+        if season is None:
+            return self.n
+        return int(self._np.count_nonzero(self.cols['season_id'][:self.n] == season))
+
+    def select(self, season=None, date=None, team_id=None, after=None, limit=None, order='listing'):
+        """Matching records as dicts, sorted, materializing only the rows returned.
+
+        date: datetime.date. order='listing' is date descending (date-less
+        rows last), then game_number and id ascending; after is a keyset
+        cursor (ISO date, or None after a date-less row; game_number; id)
+        into it. order='chrono' is date, game_number, id ascending.
+        """
+        np, n = self._np, self.n
+        col = {name: c[:n] for name, c in self.cols.items()}
+        mask = np.ones(n, dtype=bool)
+        if season is not None:
+            mask &= col['season_id'] == season
+        if date is not None:
+            mask &= col['date'] == date.toordinal()
+        if team_id is not None:
+            mask &= (col['team1_id'] == team_id) | (col['team2_id'] == team_id)
+        rows = np.flatnonzero(mask)
+        dates, games = col['date'][rows].astype(np.int64), col['game_number'][rows]
+        if order == 'listing':
+            dates = -dates      # missing dates (NULL) sort last
+            if after is not None:
+                a_date, a_game, a_id = after
+                a_date = (-datetime.date.fromisoformat(a_date).toordinal() if a_date is not None
+                          else -self.NULL)
+                ids = col['id'][rows]
+                keep = (dates > a_date) | ((dates == a_date)
+                                           & ((games > a_game) | ((games == a_game) & (ids > a_id))))
+                rows, dates, games = rows[keep], dates[keep], games[keep]
+        # rows are in id order, so a stable sort on (date, game_number) finishes the key
+        rows = rows[np.lexsort((games, dates))]
+        if limit is not None:
+            rows = rows[:limit]
+        return self.materialize(rows)
+
+    # ── writes (only via Store.commit / replay) ──
+
+    def put(self, record):
+        values = self._encode(record)
+        i, found = self._row(record['id'])
+        if not found:
+            if self.n == len(self.cols['id']):
+                for name, c in self.cols.items():
+                    grown = self._np.empty(len(c) * 2, dtype=c.dtype)
+                    grown[:self.n] = c[:self.n]
+                    self.cols[name] = grown
+            for c in self.cols.values():
+                c[i + 1:self.n + 1] = c[i:self.n]
+            self.n += 1
+            if self.max_id is None or record['id'] > self.max_id:
+                self.max_id = record['id']
+        for name, v in zip(self.COLUMNS, values):
+            self.cols[name][i] = v
+
+    def delete(self, record_id):
+        i, found = self._row(record_id)
+        if not found:
+            return None
+        r = self.materialize([i])[0]
+        for c in self.cols.values():
+            c[i:self.n - 1] = c[i + 1:self.n]
+        self.n -= 1
+        self.extras.pop(record_id, None)
+        return r
+
+
+TABLE_TYPES = {'results': ResultsTable}
+
+
+# ── File helpers ──────────────────────────────────────────────────────────────
+
+def off_loop(fn, *args):
+    """Call a blocking function, in gevent's thread pool if gevent has patched this process."""
+    monkey = sys.modules.get('gevent.monkey')
+    if monkey is not None and monkey.is_module_patched('threading'):
+        import gevent
+        return gevent.get_hub().threadpool.apply(fn, args)
+    return fn(*args)
+
+
+def _fsync(f):
+    off_loop(os.fsync, f.fileno())
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _write_temp(path, text):
+    """Write text to a temp file beside path and fsync it; returns the temp path."""
+    tmp = f'{path}.tmp.{os.getpid()}'
+    with open(tmp, 'w') as f:
+        f.write(text)
+        f.flush()
+        _fsync(f)
+    return tmp
+
+
+def _atomic_write(path, text):
+    """Write text to path via temp file + fsync + rename."""
+    os.replace(_write_temp(path, text), path)
+
+
+def _read_snapshot(data_dir, entity):
+    try:
+        with open(os.path.join(data_dir, f'{entity}.json')) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        if entity in REQUIRED_ENTITIES:
+            raise
+        return []
+
+
+def _read_journal(path, offset):
+    """Yield (entry, end_offset) for each complete line from offset on.
+
+    Stops at the first torn or undecodable line — everything after a crash
+    mid-append is ignored.
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        f.seek(offset)
+        pos = offset
+        for line in f:
+            if not line.endswith(b'\n'):
+                return
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                return
+            pos += len(line)
+            yield entry, pos
+
+
+@contextlib.contextmanager
+def file_lock(data_dir):
+    """Exclusive cross-process lock on data_dir (blocks until acquired)."""
+    with open(os.path.join(data_dir, LOCK_FILE), 'a+') as f:
+        if fcntl is not None:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                off_loop(fcntl.flock, f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _apply(tables, ops):
+    for op in ops:
+        tbl = tables[op['entity']]
+        if op['op'] == 'put':
+            tbl.put(op['record'])
+        elif op['op'] == 'del':
+            tbl.delete(op['id'])
+
+
+def put(entity, record):
+    return {'op': 'put', 'entity': entity, 'record': record}
+
+
+def delete(entity, record_id):
+    return {'op': 'del', 'entity': entity, 'id': record_id}
+
+
+# ── Store ─────────────────────────────────────────────────────────────────────
+
+class Store:
+    """Snapshot + journal for one data directory, held resident in memory."""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.journal_path = os.path.join(data_dir, JOURNAL)
+        self.meta_path = os.path.join(data_dir, SNAPSHOT_META)
+        self.tables = None
+        self.seq = 0            # last journal seq applied in memory
+        self.journal_pos = 0    # bytes of journal.jsonl consumed
+        self.journal_sig = None
+        self.meta_sig = None
+        self.snapshot_sigs = None
+
+    def _snapshot_seq(self):
+        try:
+            with open(self.meta_path) as f:
+                return int(json.load(f).get('seq', 0))
+        except (OSError, ValueError):
+            return 0
+
+    def _snapshot_paths(self):
+        return [os.path.join(self.data_dir, f'{entity}.json') for entity in ENTITIES]
+
+    def load(self):
+        """Recovery: load the snapshots, then replay newer journal entries.
+
+        Lock-free with respect to writers: if another process compacts while we
+        read (any snapshot or the marker changes under us), start over.
+        """
+        with metrics.timed('json_store_seconds', op='load'):
+            self._load()
+
+    def _load(self):
+        while True:
+            meta_sig = _signature(self.meta_path)
+            snapshot_sigs = [_signature(p) for p in self._snapshot_paths()]
+            seq = self._snapshot_seq()
+            tables = {}
+            for entity in ENTITIES:
+                tables[entity] = TABLE_TYPES.get(entity, Table)(entity, _read_snapshot(self.data_dir, entity))
+            self.tables, self.seq, self.journal_pos = tables, seq, 0
+            self._replay_tail()
+            if (_signature(self.meta_path) == meta_sig
+                    and [_signature(p) for p in self._snapshot_paths()] == snapshot_sigs):
+                break
+        self.meta_sig = meta_sig
+        self.snapshot_sigs = snapshot_sigs
+
+    def _replay_tail(self):
+        for entry, pos in _read_journal(self.journal_path, self.journal_pos):
+            if entry['seq'] > self.seq:
+                _apply(self.tables, entry['ops'])
+                self.seq = entry['seq']
+            self.journal_pos = pos
+        self.journal_sig = _signature(self.journal_path)
+
+    def refresh(self):
+        """Pick up changes made on disk since our last look (cheap stat when idle)."""
+        if (self.tables is None or _signature(self.meta_path) != self.meta_sig
+                or [_signature(p) for p in self._snapshot_paths()] != self.snapshot_sigs):
+            # compacted by another process, or a snapshot file was edited by hand
+            self.load()
+            return
+        sig = _signature(self.journal_path)
+        if sig == self.journal_sig:
+            return
+        if sig is None or sig[2] < self.journal_pos or (self.journal_sig and sig[0] != self.journal_sig[0]):
+            # journal was compacted away underneath us
+            self.load()
+        else:
+            with metrics.timed('json_store_seconds', op='replay'):
+                self._replay_tail()
+
+    def commit(self, ops, lock):
+        """Durably append one journal entry, then apply it in memory.
+
+        The caller holds file_lock() and has refreshed since taking it. lock is
+        the in-memory lock readers use; it is only held for the apply step.
+
+        A reader in this process may refresh() between the fsync and the apply
+        and replay the new line itself; then the entry is already in memory
+        and only the journal position is brought up to the real end of file.
+        """
+        entry = {'seq': self.seq + 1, 'ops': ops}
+        line = (json.dumps(entry, default=str, separators=(',', ':')) + '\n').encode()
+        with metrics.timed('json_store_seconds', op='commit'), open(self.journal_path, 'ab') as f:
+            if f.tell() != self.journal_pos:
+                # drop a torn tail left behind by a crash mid-append
+                f.truncate(self.journal_pos)
+                f.seek(self.journal_pos)
+            f.write(line)
+            f.flush()
+            _fsync(f)
+            end = f.tell()
+        with lock:
+            self.journal_pos = end
+            self.journal_sig = _signature(self.journal_path)
+            if self.seq < entry['seq']:
+                _apply(self.tables, ops)
+                self.seq = entry['seq']
+
+    def compact(self, lock=None):
+        """Fold the journal into the snapshot files and empty it.
+
+        Caller holds file_lock(), so no journal entry can be appended and the
+        tables cannot change. lock is the in-memory lock readers use; the new
+        snapshots are written to temp files without it and it is held only
+        while they are renamed into place and the journal is emptied.
+        """
+        lock = lock if lock is not None else contextlib.nullcontext()
+        with lock:
+            self.refresh()
+            if self.journal_pos == 0:
+                return False
+        with metrics.timed('json_store_seconds', op='compact'):
+            temps = [(_write_temp(path, json.dumps(list(self.tables[entity].all()), indent=2, default=str)),
+                      path)
+                     for entity, path in zip(ENTITIES, self._snapshot_paths())]
+            temps.append((_write_temp(self.meta_path, json.dumps({'seq': self.seq})), self.meta_path))
+            with lock:
+                # snapshot files first, the marker last: a crash in between
+                # replays the still-complete journal over the new snapshots
+                for tmp, path in temps:
+                    os.replace(tmp, path)
+                with open(self.journal_path, 'wb') as f:
+                    _fsync(f)
+                self.meta_sig = _signature(self.meta_path)
+                self.snapshot_sigs = [_signature(p) for p in self._snapshot_paths()]
+                self.journal_pos = 0
+                self.journal_sig = _signature(self.journal_path)
+        return True
+
+    def needs_compaction(self):
+        if self.journal_pos == 0:
+            return False
+        if self.journal_pos >= COMPACT_BYTES:
+            return True
+        # journal mtime = last write by any process
+        return time.time() - self.journal_sig[1] / 1e9 >= COMPACT_IDLE_SECONDS
+
+    def status(self):
+        return {
+            'seq': self.seq,
+            'journal_bytes': self.journal_pos,
+            'counts': {e: len(t) for e, t in self.tables.items()},
+        }
+
+
+def store(data_dir):
+    """Return the refreshed resident Store for data_dir."""
+    s = _stores.get(data_dir)
+    if s is None:
+        s = _stores[data_dir] = Store(data_dir)
+    s.refresh()
+    return s
+
+
+def read_from_disk(data_dir, entity):
+    """Load one entity straight from snapshot + journal, bypassing the resident copy."""
+    s = Store(data_dir)
+    s.load()
+    return list(s.tables[entity].all())
+
+
+def reset():
+    """Drop every resident store (next access reloads from disk)."""
+    _stores.clear()
+
+
+# ── Background compaction ─────────────────────────────────────────────────────
+
+_compactor = {'thread': None, 'pid': None}
+
+
+def start_compactor(data_dir, writer, lock, interval=5.0):
+    """Start (once per process) a daemon thread that compacts data_dir's journal.
+
+    writer is the caller's exclusive-writer context manager (thread lock plus
+    file_lock), held throughout so no journal append can slip in between
+    writing the snapshots and truncating; lock is its in-memory lock, which
+    compaction takes only briefly (see Store.compact).
+    """
+    if _compactor['thread'] is not None and _compactor['pid'] == os.getpid():
+        return
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                with writer() as s:
+                    with lock:
+                        due = s.needs_compaction()
+                    if due:
+                        s.compact(lock)
+            except Exception:
+                # never let the compactor die; the journal stays authoritative
+                _log.exception("journal compaction failed")
+
+    t = threading.Thread(target=run, name='jsonstore-compactor', daemon=True)
+    _compactor['thread'] = t
+    _compactor['pid'] = os.getpid()
+    t.start()
@@ -0,0 +1,150 @@
+"""
+leaders.py — precomputed per-stat leaderboards for /routes/leaders.
+
+For every stat category a sorted index of (-value, -hits, -GP, id) keys is
+kept — the same order the Leaders page uses (stat desc, then hits, then games
+played). storage folds each player change into it (one bisect out, one bisect
+in per category), so serving the top N per category is a slice, and the
+response stays the same size no matter how many players accumulate.
+
+Batting average only ranks players with at least MIN_GP games (the
+qualifier for the average title).
+
+The index is tied to storage.data_version(): if another process changes data
+between our own writes, the next read rebuilds it from storage.get_players().
+"""
+
+import bisect
+import os
+import threading
+
+import storage
+
+CATEGORIES = ('hits', 'Singles', 'Doubles', 'Triples', 'HRs', 'Dimes', 'AtBats', 'Avg')
+MIN_GP = int(os.environ.get('LEADERS_MIN_GP', 20))
+MAX_N = 50
+
+_lock = threading.Lock()
+_state = {
+    'players': None,   # {player_id: player dict}
+    'index': None,     # {category: sorted list of keys}
+    'version': None,
+}
+
+
+def _value(p, category):
+    v = p.get(category) or 0
+    return float(v) if category == 'Avg' else int(v)
+
+
+def _key(p, category):
+    return (-_value(p, category), -(p.get('hits') or 0), -(p.get('GP') or 0), p['id'])
+
+
+def _ranked(p, category):
+    gp = p.get('GP') or 0
+    # players with no games yet (e.g. right after a season is closed) are not ranked
+    return gp > 0 and (category != 'Avg' or gp >= MIN_GP)
+
+
+def _insert(index, p):
+    for c in CATEGORIES:
+        if _ranked(p, c):
+            bisect.insort(index[c], _key(p, c))
+
+
+def _remove(index, p):
+    for c in CATEGORIES:
+        if _ranked(p, c):
+            keys = index[c]
+            i = bisect.bisect_left(keys, _key(p, c))
+            if i < len(keys) and keys[i] == _key(p, c):
+                del keys[i]
+
+
+# ── Maintenance ───────────────────────────────────────────────────────────────
+
+def rebuild():
+    version = storage.data_version()
+    players = {p['id']: p for p in storage.get_players(limit=None)}
+    index = {c: [] for c in CATEGORIES}
+    for p in players.values():
+        _insert(index, p)
+    with _lock:
+        _state['players'] = players
+        _state['index'] = index
+        _state['version'] = version
+
+
+def apply_players(updated=(), deleted_ids=()):
+    """Fold players added/changed/removed by one committed write into the index.
+
+    Called by storage after commit, outside its locks. If any other write
+    landed alongside ours (the data version moved by more than one), the
+    index is marked stale and rebuilt on the next read.
+    """
+    with _lock:
+        if _state['players'] is None or _state['version'] is None:
+            return
+        expected = _state['version'] + 1
+        players, index = _state['players'], _state['index']
+        for pid in deleted_ids:
+            old = players.pop(pid, None)
+            if old is not None:
+                _remove(index, old)
+        for p in updated:
+            old = players.get(p['id'])
+            if old is not None:
+                _remove(index, old)
+            players[p['id']] = dict(p)
+            _insert(index, players[p['id']])
+    version = storage.data_version()
+    with _lock:
+        if _state['players'] is not None:
+            _state['version'] = version if version == expected else None
+
+
+def _ensure_fresh():
+    version = storage.data_version()
+    with _lock:
+        fresh = _state['players'] is not None and _state['version'] == version
+    if not fresh:
+        rebuild()
+
+
+# ── Leaderboards ──────────────────────────────────────────────────────────────
+
+def get_leaders(n=5):
+    """Return {category: [entry, ...]} with the top n per category.
+
+    Players tied with the n-th value are included, so a list can run longer
+    than n. Entries carry a competition rank (1, 2, 2, 4) and a tied flag.
+    """
+    n = max(1, min(int(n), MAX_N))
+    _ensure_fresh()
+    out = {}
+    with _lock:
+        players = _state['players']
+        for c in CATEGORIES:
+            keys = _state['index'][c]
+            rows = []
+            cutoff = None
+            for i, key in enumerate(keys):
+                value = -key[0]
+                if i >= n and value != cutoff:
+                    break
+                cutoff = value
+                p = players[key[3]]
+                rank = rows[-1]['rank'] if rows and rows[-1]['value'] == value else i + 1
+                rows.append({
+                    'rank': rank, 'id': p['id'], 'name': p.get('name'),
+                    'team_id': p.get('team_id'), 'value': value,
+                    'GP': p.get('GP') or 0, 'hits': p.get('hits') or 0,
+                })
+            counts = {}
+            for row in rows:
+                counts[row['value']] = counts.get(row['value'], 0) + 1
+            for row in rows:
+                row['tied'] = counts[row['value']] > 1
+            out[c] = rows
+    return out
@@ -0,0 +1,211 @@
+"""
+metrics.py — in-process latency metrics, exposed in Prometheus text format.
+
+Records fixed-bucket histograms (a bisect and a few additions under one lock
+per observation, cheap enough to leave on in production) for:
+
+  http_request_duration_seconds     per endpoint / method / status
+  sql_statement_duration_seconds    per statement kind, via SQLAlchemy engine events
+  json_store_seconds                JSON store load / replay / commit / compact
+  storage_lock_wait_seconds         time spent waiting for storage_json._lock
+
+Work done on behalf of the current request is also summed per request and
+returned in a Server-Timing header (app, db, store, lock), so a browser's
+network panel shows where a slow response spent its time.
+
+Metrics are per process: under gunicorn each worker reports its own numbers,
+tagged with a pid label on metrics_worker_info.
+"""
+
+import bisect
+import os
+import threading
+import time
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    'http_request_duration_seconds': 'Time from request start until the view returned a response.',
+    'sql_statement_duration_seconds': 'SQL statement execution time (cursor execute to result).',
+    'json_store_seconds': 'JSON store operation time.',
+    'storage_lock_wait_seconds': 'Time spent waiting to acquire storage_json._lock.',
+}
+
+# where each family's per-request time goes in Server-Timing
+_TIMING_KEY = {
+    'sql_statement_duration_seconds': 'db',
+    'json_store_seconds': 'store',
+    'storage_lock_wait_seconds': 'lock',
+}
+
+_lock = threading.Lock()
+_series = {}          # (family, labels) -> [bucket counts..., +Inf count, sum]
+_current = threading.local()
+
+
+# ── Recording ─────────────────────────────────────────────────────────────────
+
+def observe(family, labels, seconds):
+    """Record one observation. labels is a tuple of (name, value) pairs."""
+    i = bisect.bisect_left(BUCKETS, seconds)
+    key = (family, labels)
+    with _lock:
+        row = _series.get(key)
+        if row is None:
+            row = _series[key] = [0] * (len(BUCKETS) + 1) + [0.0]
+        row[i] += 1
+        row[-1] += seconds
+    timings = getattr(_current, 'timings', None)
+    if timings is not None:
+        name = _TIMING_KEY.get(family)
+        if name is not None:
+            t = timings.setdefault(name, [0.0, 0])
+            t[0] += seconds
+            t[1] += 1
+
+
+class timed:
+    """Context manager: observe(family, labels, elapsed) on exit."""
+
+    __slots__ = ('family', 'labels', 'start')
+
+    def __init__(self, family, **labels):
+        self.family = family
+        self.labels = tuple(sorted(labels.items()))
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.family, self.labels, time.perf_counter() - self.start)
+        return False
+
+
+class TimedLock:
+    """threading.Lock drop-in that records how long acquire() waited."""
+
+    def __init__(self, name):
+        self._lock = threading.Lock()
+        self._labels = (('lock', name),)
+
+    def acquire(self, blocking=True, timeout=-1):
+        start = time.perf_counter()
+        ok = self._lock.acquire(blocking, timeout)
+        observe('storage_lock_wait_seconds', self._labels, time.perf_counter() - start)
+        return ok
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc):
+        self._lock.release()
+        return False
+
+
+# ── Flask / SQLAlchemy wiring ─────────────────────────────────────────────────
+
+def init_app(app):
+    """Time every request and add the Server-Timing header."""
+    from flask import request
+
+    @app.before_request
+    def _start_timer():
+        _current.start = time.perf_counter()
+        _current.timings = {}
+
+    @app.after_request
+    def _stop_timer(resp):
+        start = getattr(_current, 'start', None)
+        if start is None:
+            return resp
+        elapsed = time.perf_counter() - start
+        timings = _current.timings
+        _current.start = _current.timings = None
+        observe('http_request_duration_seconds',
+                (('endpoint', request.endpoint or 'unmatched'),
+                 ('method', request.method), ('status', str(resp.status_code))),
+                elapsed)
+        parts = [f'app;dur={elapsed * 1000.0:.2f}']
+        for name in ('db', 'store', 'lock'):
+            if name in timings:
+                total, count = timings[name]
+                parts.append(f'{name};desc="{count}";dur={total * 1000.0:.2f}')
+        resp.headers['Server-Timing'] = ', '.join(parts)
+        return resp
+
+
+def install_sqlalchemy():
+    """Time every SQL statement on every engine (idempotent)."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    if event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('metrics_start')
+    if not starts:
+        return
+    kind = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'OTHER'
+    observe('sql_statement_duration_seconds', (('statement', kind),), time.perf_counter() - starts.pop())
+
+
+# ── Exposition ────────────────────────────────────────────────────────────────
+
+def _fmt_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    body = ','.join('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in pairs)
+    return '{' + body + '}'
+
+
+def render(extra=None):
+    """Prometheus text exposition of every histogram.
+
+    extra: optional {name: (type, help, [(labels, value), ...])} for gauges /
+    counters owned by other modules (e.g. the response cache).
+    """
+    with _lock:
+        snapshot = {k: list(v) for k, v in _series.items()}
+    lines = [
+        '# HELP metrics_worker_info Worker process serving this scrape.',
+        '# TYPE metrics_worker_info gauge',
+        f'metrics_worker_info{{pid="{os.getpid()}"}} 1',
+    ]
+    for family in HELP:
+        rows = sorted((labels, row) for (fam, labels), row in snapshot.items() if fam == family)
+        lines.append(f'# HELP {family} {HELP[family]}')
+        lines.append(f'# TYPE {family} histogram')
+        for labels, row in rows:
+            cumulative = 0
+            for bound, count in zip(BUCKETS, row):
+                cumulative += count
+                lines.append(f'{family}_bucket{_fmt_labels(labels, [("le", repr(bound))])} {cumulative}')
+            cumulative += row[len(BUCKETS)]
+            lines.append(f'{family}_bucket{_fmt_labels(labels, [("le", "+Inf")])} {cumulative}')
+            lines.append(f'{family}_sum{_fmt_labels(labels)} {row[-1]:.6f}')
+            lines.append(f'{family}_count{_fmt_labels(labels)} {cumulative}')
+    for name, (kind, help_text, samples) in (extra or {}).items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            lines.append(f'{name}{_fmt_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    with _lock:
+        _series.clear()
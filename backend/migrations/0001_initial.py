@@ -0,0 +1,67 @@
+"""Baseline schema: the tables db.create_all() used to create on boot.
+
+The definitions are frozen here rather than taken from models.py, so later
+migrations can change the models without this step changing with them.
+Existing databases already have these tables; checkfirst leaves them alone.
+"""
+
+from sqlalchemy import (BigInteger, Column, Date, DateTime, Float, ForeignKey, Integer,
+                        MetaData, String, Table, Text, func)
+
+metadata = MetaData()
+
+Table(
+    'teams', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('name', String, nullable=False),
+    Column('wins', Integer),
+    Column('losses', Integer),
+    Column('win_pct', Float),
+    Column('games_behind', Float),
+    Column('games_played', Integer),
+)
+
+Table(
+    'players', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('name', String, nullable=False),
+    Column('team_id', Integer, ForeignKey('teams.id')),
+    Column('Singles', Integer),
+    Column('Doubles', Integer),
+    Column('Triples', Integer),
+    Column('Dimes', Integer),
+    Column('HRs', Integer),
+    Column('Avg', Float),
+    Column('GP', Integer),
+    Column('AtBats', Integer),
+    Column('hits', Integer, nullable=False),
+)
+
+Table(
+    'results', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('date', Date, nullable=False),
+    Column('game_number', Integer, nullable=False),
+    Column('team1_id', Integer, ForeignKey('teams.id'), nullable=False),
+    Column('team2_id', Integer, ForeignKey('teams.id'), nullable=False),
+    Column('team1_score', Integer, nullable=False),
+    Column('team2_score', Integer, nullable=False),
+)
+
+Table(
+    'match_submissions', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('key', String(100), nullable=False, unique=True),
+    Column('created_at', DateTime, nullable=False, server_default=func.now()),
+    Column('response', Text, nullable=False),
+)
+
+Table(
+    'data_version', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('version', BigInteger, nullable=False),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,25 @@
+"""Composite indexes matching the queries storage.py actually issues.
+
+  ix_results_date_game    get_results(date=...), and the default listing's
+                          ORDER BY date DESC, game_number (read backwards)
+  ix_results_team1_date   get_results(team_id=...): team1_id = X OR team2_id = X
+  ix_results_team2_date   becomes a BitmapOr / MULTI-INDEX OR of these two
+  ix_players_team_id      get_players(team_id=...), rosters, delete_team
+
+Names match the Index entries in models.py __table_args__.
+"""
+
+from sqlalchemy import text
+
+INDEXES = (
+    ('ix_results_date_game', 'results', ('date', 'game_number')),
+    ('ix_results_team1_date', 'results', ('team1_id', 'date')),
+    ('ix_results_team2_date', 'results', ('team2_id', 'date')),
+    ('ix_players_team_id', 'players', ('team_id',)),
+)
+
+
+def upgrade(conn):
+    for name, table, columns in INDEXES:
+        cols = ', '.join(conn.dialect.identifier_preparer.quote(c) for c in columns)
+        conn.execute(text(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({cols})'))
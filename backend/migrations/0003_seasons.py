@@ -0,0 +1,45 @@
+"""Season dimension: a seasons table and results.season_id.
+
+Every existing result is assigned to season 1, which is created as the
+active season (started on the earliest result date). Season-leading indexes
+keep active-season reads flat as closed seasons accumulate.
+"""
+
+from sqlalchemy import (Column, Date, Integer, MetaData, String, Table, Text, inspect,
+                        text)
+
+metadata = MetaData()
+
+Table(
+    'seasons', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('status', String(10), nullable=False),
+    Column('started_on', Date),
+    Column('closed_on', Date),
+    Column('snapshot', Text),
+)
+
+INDEXES = (
+    ('ix_results_season_date', ('season_id', 'date', 'game_number')),
+    ('ix_results_season_team1', ('season_id', 'team1_id', 'date')),
+    ('ix_results_season_team2', ('season_id', 'team2_id', 'date')),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
+    if conn.execute(text('SELECT COUNT(*) FROM seasons')).scalar() == 0:
+        started = conn.execute(text('SELECT MIN(date) FROM results')).scalar()
+        conn.execute(text("INSERT INTO seasons (id, name, status, started_on) "
+                          "VALUES (1, 'Season 1', 'active', :started)"), {'started': started})
+        if conn.dialect.name == 'postgresql':
+            conn.execute(text("SELECT setval(pg_get_serial_sequence('seasons', 'id'), 1)"))
+
+    columns = {c['name'] for c in inspect(conn).get_columns('results')}
+    if 'season_id' not in columns:
+        conn.execute(text('ALTER TABLE results ADD COLUMN season_id INTEGER REFERENCES seasons(id)'))
+    conn.execute(text('UPDATE results SET season_id = 1 WHERE season_id IS NULL'))
+
+    for name, columns in INDEXES:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON results ({', '.join(columns)})"))
@@ -0,0 +1,21 @@
+"""Trigram index on player names for /routes/players/search (PostgreSQL only).
+
+  ix_players_name_trgm    GIN (lower(name) gin_trgm_ops): serves the search's
+                          LIKE '%q%' substring filter and the pg_trgm `%`
+                          similarity operator without a sequential scan
+
+The expression must stay lower(name) to match storage.search_players. Needs
+the pg_trgm extension (available on Cloud SQL; creating it needs a role that
+may create extensions). Other databases get no index — the search there is
+prefix / substring only.
+"""
+
+from sqlalchemy import text
+
+
+def upgrade(conn):
+    if conn.dialect.name != 'postgresql':
+        return
+    conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_players_name_trgm '
+                      'ON players USING gin (lower(name) gin_trgm_ops)'))
@@ -0,0 +1,24 @@
+"""Row change timestamps: updated_at on teams, players, results and seasons.
+
+Set on insert and on every update (models.py), and indexed so an incremental
+export (export_to_json.py export --since) reads only the rows changed after its
+watermark. Existing rows are stamped with the migration time.
+"""
+
+from sqlalchemy import inspect, text
+
+TABLES = ('teams', 'players', 'results', 'seasons')
+
+
+def upgrade(conn):
+    timestamp = 'TIMESTAMP WITH TIME ZONE' if conn.dialect.name == 'postgresql' else 'TIMESTAMP'
+    for table in TABLES:
+        columns = {c['name'] for c in inspect(conn).get_columns(table)}
+        if 'updated_at' not in columns:
+            # the default is added separately: SQLite cannot add a column with a
+            # non-constant default, so there only models.py fills it in
+            conn.execute(text(f'ALTER TABLE {table} ADD COLUMN updated_at {timestamp}'))
+        if conn.dialect.name == 'postgresql':
+            conn.execute(text(f'ALTER TABLE {table} ALTER COLUMN updated_at SET DEFAULT CURRENT_TIMESTAMP'))
+        conn.execute(text(f'UPDATE {table} SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL'))
+        conn.execute(text(f'CREATE INDEX IF NOT EXISTS ix_{table}_updated_at ON {table} (updated_at)'))
@@ -0,0 +1,97 @@
+"""
+migrations — versioned schema changes for the SQL backend.
+
+Each migration is a module in this package named NNNN_description.py that
+defines upgrade(conn). Applied versions are recorded in the schema_migrations
+table, and each migration runs in its own transaction together with its
+bookkeeping row, so a failed step leaves the schema at the previous version.
+
+Run from backend/ (uses the same SQLALCHEMY_DATABASE_URI / Cloud SQL settings
+as the app):
+
+    python -m migrations upgrade      # apply everything pending
+    python -m migrations status       # list applied / pending versions
+    python -m migrations check        # exit 1 if any migration is pending
+
+Schema changes are no longer made on worker boot. Set AUTO_MIGRATE=1 to have
+app.py apply pending migrations at startup (handy for local development and
+single-instance deployments).
+"""
+
+import importlib
+import os
+import re
+
+from sqlalchemy import inspect, text
+
+_NAME = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+# arbitrary constant; serializes concurrent runners on Postgres
+_PG_LOCK_ID = 0x6461727473
+
+
+def discover():
+    """Return [(version, name, module)] for every migration file, in version order."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    found = []
+    for fname in sorted(os.listdir(here)):
+        m = _NAME.match(fname)
+        if m:
+            module = importlib.import_module(f'{__name__}.{fname[:-3]}')
+            found.append((int(m.group(1)), m.group(2), module))
+    return found
+
+
+def _ensure_table(conn):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version INTEGER PRIMARY KEY,"
+        " name VARCHAR(200) NOT NULL,"
+        " applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    ))
+
+
+def _lock(conn):
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text('SELECT pg_advisory_xact_lock(:id)'), {'id': _PG_LOCK_ID})
+
+
+def applied_versions(engine):
+    """Versions recorded in schema_migrations (read-only; empty if the table is missing)."""
+    with engine.connect() as conn:
+        if not inspect(conn).has_table('schema_migrations'):
+            return set()
+        return {v for (v,) in conn.execute(text('SELECT version FROM schema_migrations'))}
+
+
+def pending(engine):
+    done = applied_versions(engine)
+    return [(v, name) for v, name, _ in discover() if v not in done]
+
+
+def upgrade(engine, target=None, log=print):
+    """Apply pending migrations up to target (default: latest). Returns the versions applied."""
+    ran = []
+    for version, name, module in discover():
+        if target is not None and version > target:
+            break
+        with engine.begin() as conn:
+            _ensure_table(conn)
+            _lock(conn)
+            # re-check under the lock: another instance may have just applied it
+            exists = conn.execute(text('SELECT 1 FROM schema_migrations WHERE version = :v'),
+                                  {'v': version}).first()
+            if exists:
+                continue
+            log(f'applying {version:04d}_{name}')
+            module.upgrade(conn)
+            conn.execute(text('INSERT INTO schema_migrations (version, name) VALUES (:v, :n)'),
+                         {'v': version, 'n': name})
+        ran.append(version)
+    return ran
+
+
+def status(engine):
+    """Return [(version, name, applied)] for every known migration."""
+    done = applied_versions(engine)
+    return [(v, name, v in done) for v, name, _ in discover()]
@@ -0,0 +1,53 @@
+"""python -m migrations [upgrade [VERSION] | status | check]"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('STORAGE_BACKEND', 'sql')
+os.environ['SCHEMA_CHECK'] = '0'   # importing app must not refuse a schema this CLI is about to upgrade
+
+import migrations  # noqa: E402
+
+
+def main(argv):
+    cmd = argv[0] if argv else 'upgrade'
+    if cmd not in ('upgrade', 'status', 'check'):
+        print(__doc__)
+        return 2
+
+    if os.environ['STORAGE_BACKEND'] == 'sqlite':
+        # the embedded file: no app or Flask-SQLAlchemy needed
+        from sqlalchemy import create_engine
+        import storage_sqlite
+        engine = create_engine(storage_sqlite.uri())
+        try:
+            return run(cmd, argv, engine)
+        finally:
+            engine.dispose()
+
+    from app import app
+    from models import db
+    with app.app_context():
+        return run(cmd, argv, db.engine)
+
+
+def run(cmd, argv, engine):
+    if cmd == 'status':
+        for version, name, applied in migrations.status(engine):
+            print(f"{version:04d}_{name}: {'applied' if applied else 'pending'}")
+        return 0
+    if cmd == 'check':
+        # one-shot schema check for deploy pipelines: exit 1 if anything is pending
+        todo = migrations.pending(engine)
+        for version, name in todo:
+            print(f'pending: {version:04d}_{name}')
+        return 1 if todo else 0
+    target = int(argv[1]) if len(argv) > 1 else None
+    ran = migrations.upgrade(engine, target=target)
+    print(f'{len(ran)} migration(s) applied' if ran else 'schema is up to date')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
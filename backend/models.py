@@ -12,6 +12,8 @@ class Team(db.Model):
     win_pct = db.Column(db.Float, default=0.0)
     games_behind = db.Column(db.Float, default=0.0)
     games_played = db.Column(db.Integer, default=0)
+    updated_at = db.Column(db.DateTime(timezone=True), default=db.func.current_timestamp(),
+                           onupdate=db.func.current_timestamp(), index=True)
 
     def __repr__(self):
         return f"<Team {self.name}: W-{self.wins} L-{self.losses} GB-{self.games_behind}> GP-{self.games_played}"
@@ -30,25 +32,80 @@ class Player(db.Model):
     GP = db.Column(db.Integer, default=0)
     AtBats = db.Column(db.Integer, default=0)
     hits = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime(timezone=True), default=db.func.current_timestamp(),
+                           onupdate=db.func.current_timestamp(), index=True)
 
     team = db.relationship('Team', backref=db.backref('players', lazy=True))
 
+    # schema changes go through migrations/ — keep these in step with 0002_query_indexes
+    # (PostgreSQL also has ix_players_name_trgm, a GIN trigram index from 0004)
+    __table_args__ = (
+        db.Index('ix_players_team_id', 'team_id'),
+    )
+
     def __repr__(self):
         return f"<Player {self.name}: T-{self.team_id} S-{self.Singles} D-{self.Doubles} T-{self.Triples} HR-{self.HRs} Hits-{self.hits} Avg-{self.Avg:.3f}>"
 
+class Season(db.Model):
+    """A season; closed seasons carry a frozen JSON snapshot (standings, leaders, h2h, totals)."""
+    __tablename__ = "seasons"
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.String(10), nullable=False, default='active')   # 'active' | 'closed'
+    started_on = db.Column(db.Date)
+    closed_on = db.Column(db.Date)
+    snapshot = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime(timezone=True), default=db.func.current_timestamp(),
+                           onupdate=db.func.current_timestamp(), index=True)
+
+    def __repr__(self):
+        return f"<Season {self.id} {self.name} {self.status}>"
+
 class Result(db.Model):
     __tablename__ = "results"
     id = db.Column(db.Integer, primary_key=True)
+    season_id = db.Column(db.Integer, db.ForeignKey('seasons.id'))
     date = db.Column(db.Date, nullable=False)
     game_number = db.Column(db.Integer, nullable=False)
     team1_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
     team2_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
     team1_score = db.Column(db.Integer, nullable=False, default=0)
     team2_score = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime(timezone=True), default=db.func.current_timestamp(),
+                           onupdate=db.func.current_timestamp(), index=True)
 
     # optional convenient relationships to Team
     team1 = db.relationship('Team', foreign_keys=[team1_id])
     team2 = db.relationship('Team', foreign_keys=[team2_id])
 
+    __table_args__ = (
+        db.Index('ix_results_date_game', 'date', 'game_number'),
+        db.Index('ix_results_team1_date', 'team1_id', 'date'),
+        db.Index('ix_results_team2_date', 'team2_id', 'date'),
+        db.Index('ix_results_season_date', 'season_id', 'date', 'game_number'),
+        db.Index('ix_results_season_team1', 'season_id', 'team1_id', 'date'),
+        db.Index('ix_results_season_team2', 'season_id', 'team2_id', 'date'),
+    )
+
+    def __repr__(self):
+        return f"<Result {self.date} G#{self.game_number}: {self.team1_id} {self.team1_score} - {self.team2_id} {self.team2_score}>"
+
+class MatchSubmission(db.Model):
+    """Idempotency record for /routes/admin/matches — one row per client key."""
+    __tablename__ = "match_submissions"
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(100), nullable=False, unique=True)
+    created_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
+    response = db.Column(db.Text, nullable=False)
+
+    def __repr__(self):
+        return f"<MatchSubmission {self.key}>"
+
+class DataVersion(db.Model):
+    """Single-row counter bumped in the same transaction as every data change."""
+    __tablename__ = "data_version"
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
     def __repr__(self):
-        return f"<Result {self.date} G#{self.game_number}: {self.team1_id} {self.team1_score} - {self.team2_id} {self.team2_score}>"
\ No newline at end of file
+        return f"<DataVersion {self.version}>"
@@ -0,0 +1,97 @@
+"""
+namesearch.py — text analysis and ranking for player name search.
+
+Names are indexed three ways (see the players indexes in jsonstore.py):
+
+  name           sorted (normalized name, id) pairs
+  name_words     sorted (name from its 2nd/3rd/... word on, id) pairs
+  name_trigram   pg_trgm-style trigrams (each word padded with two leading
+                 blanks and one trailing) -> ids
+
+The two sorted lists act as a trie: a prefix is one bisect, and the matches
+follow it in order, so a keystroke reads only the rows it returns. Matches
+are ranked in tiers:
+
+  0  the name starts with the query          "ca"    -> "Casey E."
+  1  a later word starts with the query      "e."    -> "Casey E."
+  2  the query occurs inside the name        "ase"   -> "Casey E."
+  3  trigram similarity >= SIMILARITY to     "cacey" -> "Casey"
+     the name or one of its words
+
+Within a tier matches are ordered by the matched text — the name, or for
+tier 1 the name from the matching word on (SQL mode uses the whole name) —
+except tier 3, which goes by similarity, best first; then by id.
+Tiers 2 and 3 come from the trigram postings and are only consulted when the
+prefix tiers leave room under the limit; tier 3 only when nothing matches
+literally (a "did you mean"). Queries shorter than MIN_FUZZY characters only
+match prefixes: one or two letters inside a name are noise.
+"""
+
+import re
+
+MIN_FUZZY = 3
+# pg_trgm's default pg_trgm.similarity_threshold, so both backends agree on "close enough"
+SIMILARITY = 0.3
+
+_WORD = re.compile(r'[^\W_]+')
+
+
+def normalize(text):
+    """Lowercase and collapse whitespace."""
+    return ' '.join((text or '').lower().split())
+
+
+def word_suffixes(name):
+    """Sorted-index keys for word-prefix matching: the name from each later word on."""
+    n = normalize(name)
+    return {n[i + 1:] for i, ch in enumerate(n) if ch == ' '}
+
+
+def trigrams(text):
+    """pg_trgm's trigram set: per alphanumeric word, padded '  word '."""
+    grams = set()
+    for word in _WORD.findall((text or '').lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a, b):
+    """Shared trigrams over all trigrams (pg_trgm similarity()) of two trigram sets."""
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def substring_grams(query):
+    """Trigrams every name containing query must have (unpadded, from words of 3+ chars)."""
+    return {w[i:i + 3] for w in _WORD.findall(query) for i in range(len(w) - 2)}
+
+
+def word_similarity(grams, name):
+    """Best similarity of a query's trigrams to the whole name or any one word of it,
+    so a typo in a surname is not diluted by the first name."""
+    best = similarity(grams, trigrams(name))
+    for word in _WORD.findall(name):
+        best = max(best, similarity(grams, trigrams(word)))
+    return best
+
+
+def rank(query, name, grams=None):
+    """Sort key (tier, -similarity, name) for a tier 2/3 candidate, or None if it does
+    not match. query must already be normalize()d; grams is trigrams(query), or
+    None to test for a substring match only.
+    """
+    n = normalize(name)
+    if query in n:
+        return (2, 0.0, n)
+    if grams is None:
+        return None
+    sim = word_similarity(grams, n)
+    return (3, -sim, n) if sim >= SIMILARITY else None
+
+
+def like_escape(text):
+    """Escape LIKE wildcards (used with escape='\\\\')."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
@@ -0,0 +1,309 @@
+"""
+playoffs.py — playoff odds for /routes/playoff_odds.
+
+The rest of the active season is played out many times over (Monte Carlo) and
+each team's final seed is counted:
+
+  - what is left comes from the schedule CSV: every "A vs B" slot is
+    GAMES_PER_MATCHUP games, less the games A and B have already played
+    against each other this season (so it does not depend on the CSV's dates)
+  - each team's strength is its win rate so far, smoothed towards .500
+    ((wins + 1) / (decisions + 2)), and a single game between two teams goes
+    to A with the log5 probability pA(1 - pB) / (pA(1 - pB) + pB(1 - pA))
+  - final seeds follow standings.py: wins desc, then team id (every team ends
+    on SEASON_GAMES, so win% and wins give the same order)
+
+Simulations run in chunks of CHUNK seasons as NumPy arrays (one row per
+season, one column per remaining game), in-process: a full run takes well
+under a second, and a pool of forked processes per (gevent) web worker costs
+more memory than it saves. PLAYOFF_PROCESSES > 1 opts in to a process pool for
+the run, each chunk with its own independent random stream, shut down when the
+run is done. The answer is cached per storage.data_version(), so it is
+recomputed once per recorded result, not per request.
+
+Next to the probabilities, clinch/elimination flags are exact — they hold
+whatever happens in the remaining games:
+
+  first    eliminated by the classic max-flow test (can the other teams'
+           remaining games be split so nobody passes this team's best
+           finish?); clinched when every other team is eliminated
+  top2,    clinched when fewer than k teams can still pass this team's
+  round1   current wins; eliminated when k teams already have more wins than
+           this team can reach. These bounds do not see that two chasers
+           also play each other, so a team may be mathematically in/out a
+           little before the flag turns on — never the other way round.
+
+round1 is seeds 1-DIRECT_SEEDS (no 8 vs 9 play-in).
+"""
+
+import csv
+import os
+import re
+import threading
+from collections import Counter, deque
+
+import standings
+import storage
+
+SCHEDULE_CSV = os.environ.get('SCHEDULE_CSV', os.path.join(storage.DATA_DIR, 'schedule.csv'))
+GAMES_PER_MATCHUP = int(os.environ.get('GAMES_PER_MATCHUP', 3))
+DEFAULT_SIMS = int(os.environ.get('PLAYOFF_SIMS', 200_000))
+PROCESSES = int(os.environ.get('PLAYOFF_PROCESSES', 1))
+CHUNK = 10_000
+DIRECT_SEEDS = 7
+CUTOFFS = (('first', 1), ('top2', 2), ('round1', DIRECT_SEEDS))
+
+_MATCHUP = re.compile(r'^\s*(.+?)\s+vs\.?\s+(.+?)\s*$', re.IGNORECASE)
+
+_lock = threading.Lock()          # guards _state
+_compute_lock = threading.Lock()  # one simulation at a time per process
+_state = {
+    'key': None,       # data_version the cached odds are for
+    'odds': None,
+    'schedule': None,  # (mtime, Counter of scheduled meetings by team-name pair)
+}
+
+
+# ── Schedule ──────────────────────────────────────────────────────────────────
+
+def _name_key(name):
+    return ' '.join((name or '').lower().split())
+
+
+def _meetings():
+    """Counter {frozenset of two normalized team names: scheduled meetings}."""
+    try:
+        mtime = os.path.getmtime(SCHEDULE_CSV)
+    except OSError:
+        return Counter()
+    with _lock:
+        cached = _state['schedule']
+    if cached and cached[0] == mtime:
+        return cached[1]
+    meetings = Counter()
+    with open(SCHEDULE_CSV, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            for column, cell in row.items():
+                if not column or 'board' not in column.lower():
+                    continue
+                m = _MATCHUP.match(cell or '')
+                if m:
+                    meetings[frozenset((_name_key(m.group(1)), _name_key(m.group(2))))] += 1
+    with _lock:
+        _state['schedule'] = (mtime, meetings)
+    return meetings
+
+
+def remaining_games(teams=None, results=None):
+    """{(team1_id, team2_id): games left} for the active season, team1_id < team2_id."""
+    teams = storage.get_teams() if teams is None else teams
+    results = storage.all_results() if results is None else results
+    ids = {_name_key(t.get('name')): t['id'] for t in teams}
+    played = Counter(frozenset((r['team1_id'], r['team2_id'])) for r in results)
+    remaining = {}
+    for pair, count in _meetings().items():
+        if len(pair) != 2 or not all(name in ids for name in pair):
+            continue   # a team not in the league (or a typo in the CSV)
+        a, b = sorted(ids[name] for name in pair)
+        left = count * GAMES_PER_MATCHUP - played[frozenset((a, b))]
+        if left > 0:
+            remaining[(a, b)] = left
+    return remaining
+
+
+# ── Simulation ────────────────────────────────────────────────────────────────
+
+def _simulate(base, home, away, probs, sims, seed):
+    """Play out the remaining games sims times; returns a (teams x teams) array of
+    seed counts, row = team index, column = seed - 1.
+
+    Teams are indexed in id order, so the lower index wins a tie. Runs in pool
+    workers: only NumPy and plain arguments.
+    """
+    import numpy as np
+
+    n = len(base)
+    rng = np.random.default_rng(seed)
+    base = np.asarray(base, dtype=np.int32)
+    home, away = np.asarray(home, dtype=np.intp), np.asarray(away, dtype=np.intp)
+    probs = np.asarray(probs, dtype=np.float32)
+    # columns each team wins when the home side wins / loses
+    home_cols = [np.flatnonzero(home == t) for t in range(n)]
+    away_cols = [np.flatnonzero(away == t) for t in range(n)]
+    tiebreak = np.arange(n - 1, -1, -1, dtype=np.int64)
+    counts = np.zeros((n, n), dtype=np.int64)
+    for start in range(0, sims, CHUNK):
+        size = min(CHUNK, sims - start)
+        home_won = rng.random((size, len(probs)), dtype=np.float32) < probs
+        wins = np.broadcast_to(base, (size, n)).astype(np.int64)
+        for t in range(n):
+            if home_cols[t].size:
+                wins[:, t] += home_won[:, home_cols[t]].sum(axis=1)
+            if away_cols[t].size:
+                wins[:, t] += away_cols[t].size - home_won[:, away_cols[t]].sum(axis=1)
+        order = np.argsort(-(wins * n + tiebreak), axis=1, kind='stable')
+        for seed_index in range(n):
+            counts[:, seed_index] += np.bincount(order[:, seed_index], minlength=n)
+    return counts
+
+
+def _run(base, home, away, probs, sims):
+    import numpy as np
+
+    chunks = max(1, min(PROCESSES, sims // CHUNK))
+    seeds = np.random.SeedSequence().spawn(chunks)
+    sizes = [sims // chunks + (1 if i < sims % chunks else 0) for i in range(chunks)]
+    if chunks == 1 or not home:
+        return _simulate(base, home, away, probs, sims, seeds[0])
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    # fork: the workers only run _simulate, never touch storage or its locks
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    with ProcessPoolExecutor(max_workers=chunks, mp_context=ctx) as pool:
+        futures = [pool.submit(_simulate, base, home, away, probs, size, seq)
+                   for size, seq in zip(sizes, seeds)]
+        return sum(f.result() for f in futures)
+
+
+def _win_probability(rates, a, b):
+    pa, pb = rates[a], rates[b]
+    return pa * (1 - pb) / (pa * (1 - pb) + pb * (1 - pa))
+
+
+# ── Exact clinch / elimination ────────────────────────────────────────────────
+
+def _max_flow(capacity, source, sink):
+    """Edmonds-Karp on a dict-of-dicts residual graph (mutated)."""
+    flow = 0
+    while True:
+        parent = {source: None}
+        queue = deque([source])
+        while queue and sink not in parent:
+            u = queue.popleft()
+            for v, c in capacity[u].items():
+                if c > 0 and v not in parent:
+                    parent[v] = u
+                    queue.append(v)
+        if sink not in parent:
+            return flow
+        bottleneck, v = float('inf'), sink
+        while parent[v] is not None:
+            bottleneck = min(bottleneck, capacity[parent[v]][v])
+            v = parent[v]
+        v = sink
+        while parent[v] is not None:
+            u = parent[v]
+            capacity[u][v] -= bottleneck
+            capacity[v].setdefault(u, 0)
+            capacity[v][u] += bottleneck
+            v = u
+        flow += bottleneck
+
+
+def _eliminated_from_first(t, wins, left, remaining):
+    """True if team index t cannot finish first in any outcome of the remaining games."""
+    best = wins[t] + left[t]
+    caps = {}
+    for s in range(len(wins)):
+        if s != t:
+            # s may tie t's best only if it loses the tiebreak (higher index)
+            caps[s] = best - wins[s] - (0 if s > t else 1)
+            if caps[s] < 0:
+                return True
+    capacity = {'src': {}, 'sink': {}}
+    total = 0
+    for (a, b), games in remaining.items():
+        if t in (a, b):
+            continue
+        node = ('g', a, b)
+        capacity['src'][node] = games
+        capacity[node] = {a: games, b: games}
+        total += games
+    for s, cap in caps.items():
+        capacity.setdefault(s, {})['sink'] = cap
+    return _max_flow(capacity, 'src', 'sink') < total
+
+
+def _flags(wins, left, remaining):
+    n = len(wins)
+    first_out = [_eliminated_from_first(t, wins, left, remaining) for t in range(n)]
+    flags = []
+    for t in range(n):
+        # teams that finish ahead of t in t's worst / best case
+        can_pass = sum(1 for s in range(n) if s != t and
+                       (wins[s] + left[s], -s) > (wins[t], -t))
+        already_ahead = sum(1 for s in range(n) if s != t and
+                            (wins[s], -s) > (wins[t] + left[t], -t))
+        clinched = {name: can_pass < k for name, k in CUTOFFS}
+        eliminated = {name: already_ahead >= k for name, k in CUTOFFS}
+        clinched['first'] = all(first_out[s] for s in range(n) if s != t)
+        eliminated['first'] = first_out[t]
+        flags.append((clinched, eliminated))
+    return flags
+
+
+# ── Odds ──────────────────────────────────────────────────────────────────────
+
+def compute(sims=DEFAULT_SIMS):
+    """Simulate the rest of the active season sims times (uncached)."""
+    table = sorted(standings.get_standings(), key=lambda row: row['id'])
+    index = {row['id']: i for i, row in enumerate(table)}
+    remaining = {(index[a], index[b]): games
+                 for (a, b), games in remaining_games().items() if a in index and b in index}
+
+    wins = [row['wins'] for row in table]
+    rates = [(row['wins'] + 1) / (row['wins'] + row['losses'] + 2) for row in table]
+    left = [0] * len(table)
+    home, away, probs = [], [], []
+    for (a, b), games in remaining.items():
+        left[a] += games
+        left[b] += games
+        home += [a] * games
+        away += [b] * games
+        probs += [_win_probability(rates, a, b)] * games
+
+    counts = _run(wins, home, away, probs, sims) if table else []
+    flags = _flags(wins, left, remaining)
+
+    teams = []
+    for i, row in enumerate(table):
+        seeds = [round(int(c) / sims, 4) for c in counts[i]]
+        clinched, eliminated = flags[i]
+        teams.append({
+            'id': row['id'],
+            'name': row['name'],
+            'wins': row['wins'],
+            'losses': row['losses'],
+            'games_left': left[i],
+            'win_rate': round(rates[i], 4),
+            'seed_odds': seeds,
+            'expected_seed': round(sum((k + 1) * int(c) for k, c in enumerate(counts[i])) / sims, 3),
+            **{name: round(int(sum(counts[i][:k])) / sims, 4) for name, k in CUTOFFS},
+            'clinched': clinched,
+            'eliminated': eliminated,
+        })
+    teams.sort(key=lambda t: (t['expected_seed'], t['id']))
+    return {
+        'sims': sims,
+        'games_left': sum(remaining.values()),
+        'direct_seeds': DIRECT_SEEDS,
+        'teams': teams,
+    }
+
+
+def get_odds():
+    """Playoff odds for the active season (DEFAULT_SIMS runs), cached per data version."""
+    key = storage.data_version()
+    with _lock:
+        if _state['key'] == key:
+            return _state['odds']
+    with _compute_lock:
+        with _lock:
+            if _state['key'] == key:   # computed while we waited
+                return _state['odds']
+        odds = compute()
+        with _lock:
+            _state['key'] = key
+            _state['odds'] = odds
+    return odds
@@ -0,0 +1,247 @@
+"""
+publisher.py — pre-rendered static copies of the public read endpoints.
+
+Anonymous page views only read data that changes when an admin posts results,
+so after every committed mutation (debounced) the public payloads are rendered
+once into PUBLISH_DIR, ready to be synced to a static host / CDN:
+
+  teams.<hash>.json                     /routes/teams (export_to_json.transform_team)
+  rosters.<hash>.json                   /routes/rosters
+  standings.<hash>.json                 /routes/standings
+  standings-history.<hash>.json         /routes/standings/history
+  leaders.<hash>.json                   /routes/leaders
+  h2h.<hash>.json                       /routes/h2h
+  results/<YYYY-MM-DD>.<hash>.json      /routes/results?date=... (active season)
+  manifest.json                         data version plus every file above
+
+Each payload is written twice: plain, and as a .gz next to it (gzip_static
+style; deterministic, so an unchanged payload gives byte-identical files).
+<hash> is the start of the payload's SHA-256, so the files are immutable and
+can be cached forever; only manifest.json is rewritten in place (atomically,
+last) and must be served with a short max-age. A payload that did not change
+keeps its name and is not rewritten. Files referenced by neither the new nor
+the previous manifest are deleted, so clients holding the previous manifest
+can still fetch what it points to.
+
+Publishing is off unless PUBLISH_DIR is set. `python publisher.py [--out DIR]`
+renders once from the command line.
+"""
+
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import export_to_json
+import jsonstore
+import storage
+
+PUBLISH_DIR = os.environ.get('PUBLISH_DIR')
+# wait this long after the last write before publishing, but no longer than
+# PUBLISH_MAX_DELAY after the first, so a busy match night still goes out
+PUBLISH_DELAY = float(os.environ.get('PUBLISH_DELAY', 2.0))
+PUBLISH_MAX_DELAY = float(os.environ.get('PUBLISH_MAX_DELAY', 30.0))
+HASH_LEN = 12
+MANIFEST = 'manifest.json'
+
+_log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_state = {
+    'timer': None,        # pending threading.Timer
+    'first_at': None,     # monotonic time of the first write since the last publish
+    'app': None,          # Flask app to publish under (SQL mode needs an app context)
+    'published': None,    # data version last published by this process
+}
+
+
+# ── Payloads ──────────────────────────────────────────────────────────────────
+
+def payloads():
+    """{name: JSON-able payload} for every published file (names without hash)."""
+    import h2h
+    import leaders
+    import standings
+
+    teams = [export_to_json.transform_team(t) for t in storage.get_teams()]
+    teams.sort(key=lambda t: t['id'])
+    rosters = [{**export_to_json.transform_team(t),
+                'players': [export_to_json.transform_player(p) for p in t['players']]}
+               for t in storage.get_rosters()]
+    out = {
+        'teams': teams,
+        'rosters': rosters,
+        'standings': {
+            'season_id': storage.active_season()['id'],
+            'season_games': standings.SEASON_GAMES,
+            'teams': standings.get_standings(),
+        },
+        'standings-history': {
+            'season_id': storage.active_season()['id'],
+            'season_games': standings.SEASON_GAMES,
+            **standings.get_history(),
+        },
+        'leaders': {'n': 5, 'min_gp': leaders.MIN_GP, 'categories': leaders.get_leaders(5)},
+        'h2h': {'as_of': None, 'matrix': h2h.get_matrix()},
+    }
+    by_date = {}
+    for r in storage.iter_results():
+        row = export_to_json.transform_result(r)
+        row['team1_name'], row['team2_name'] = r.get('team1_name'), r.get('team2_name')
+        by_date.setdefault(row['date'], []).append(row)
+    for date, rows in by_date.items():
+        out[f'results/{date}'] = rows
+    return out
+
+
+# ── Writing ───────────────────────────────────────────────────────────────────
+
+def _encode(payload):
+    return json.dumps(payload, separators=(',', ':'), sort_keys=True, default=str).encode('utf-8')
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _write_file(out_dir, name, body):
+    """Write name.<hash>.json(.gz) unless already there; returns its manifest entry."""
+    digest = hashlib.sha256(body).hexdigest()
+    rel = f'{name}.{digest[:HASH_LEN]}.json'
+    path = os.path.join(out_dir, rel)
+    gz = gzip.compress(body, compresslevel=9, mtime=0)
+    if not (os.path.exists(path) and os.path.exists(path + '.gz')):
+        _write_atomic(path, body)
+        _write_atomic(path + '.gz', gz)
+    return {'path': rel, 'sha256': digest, 'bytes': len(body), 'gzip_bytes': len(gz)}
+
+
+def _read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _referenced(manifest):
+    if not manifest:
+        return set()
+    return {rel for entry in manifest.get('files', {}).values()
+            for rel in (entry['path'], entry['path'] + '.gz')}
+
+
+def _prune(out_dir, keep):
+    for root, _dirs, files in os.walk(out_dir):
+        for fn in files:
+            rel = os.path.relpath(os.path.join(root, fn), out_dir).replace(os.sep, '/')
+            if rel.endswith('.json') or rel.endswith('.json.gz'):
+                if rel not in keep and not rel.startswith(MANIFEST):
+                    os.unlink(os.path.join(root, fn))
+
+
+def publish(out_dir=None):
+    """Render every payload into out_dir (default PUBLISH_DIR); returns the manifest.
+
+    Serialized across processes with a lock file in out_dir, and a no-op if the
+    manifest there is already at the current data version.
+    """
+    out_dir = out_dir or PUBLISH_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    with jsonstore.file_lock(out_dir):
+        version = storage.data_version()
+        previous = _read_manifest(out_dir)
+        if previous and previous.get('version') == version:
+            return previous
+        start = time.perf_counter()
+        files = {name: _write_file(out_dir, name, _encode(payload))
+                 for name, payload in payloads().items()}
+        manifest = {
+            'version': version,
+            'generated_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'files': files,
+        }
+        body = json.dumps(manifest, indent=1, sort_keys=True).encode('utf-8')
+        _write_atomic(os.path.join(out_dir, MANIFEST + '.gz'), gzip.compress(body, mtime=0))
+        _write_atomic(os.path.join(out_dir, MANIFEST), body)
+        _prune(out_dir, _referenced(manifest) | _referenced(previous))
+    _log.info("published %d files for data version %s in %.0f ms",
+              len(files), version, (time.perf_counter() - start) * 1000.0)
+    return manifest
+
+
+# ── Debounced trigger ─────────────────────────────────────────────────────────
+
+def _run():
+    with _lock:
+        _state['timer'] = None
+        _state['first_at'] = None
+        app = _state['app']
+    try:
+        if app is not None:
+            with app.app_context():
+                manifest = publish()
+        else:
+            manifest = publish()
+        with _lock:
+            _state['published'] = manifest['version']
+    except Exception:
+        # the live endpoints are unaffected; the next write tries again
+        _log.exception("static publish failed")
+
+
+def schedule():
+    """Publish PUBLISH_DELAY seconds after the last of a burst of writes.
+
+    Called by storage after every committed mutation; cheap when publishing is off.
+    """
+    if not PUBLISH_DIR:
+        return
+    from flask import current_app, has_app_context
+
+    now = time.monotonic()
+    with _lock:
+        if has_app_context():
+            _state['app'] = current_app._get_current_object()
+        if _state['first_at'] is None:
+            _state['first_at'] = now
+        delay = min(PUBLISH_DELAY, max(0.0, _state['first_at'] + PUBLISH_MAX_DELAY - now))
+        if _state['timer'] is not None:
+            _state['timer'].cancel()
+        timer = threading.Timer(delay, _run)
+        timer.daemon = True
+        _state['timer'] = timer
+    timer.start()
+
+
+def status():
+    """Pending/last publish state of this process (for admin tooling)."""
+    with _lock:
+        return {'enabled': bool(PUBLISH_DIR), 'dir': PUBLISH_DIR,
+                'pending': _state['timer'] is not None, 'published_version': _state['published']}
+
+
+if __name__ == '__main__':
+    import argparse
+
+    ap = argparse.ArgumentParser(description='Render the public read payloads to static files.')
+    ap.add_argument('--out', default=PUBLISH_DIR, help='output directory (default: $PUBLISH_DIR)')
+    args = ap.parse_args()
+    if not args.out:
+        raise SystemExit('Set PUBLISH_DIR or pass --out')
+    logging.basicConfig(level=logging.INFO)
+    if storage.STORAGE_BACKEND != 'sql':
+        manifest = publish(args.out)
+    else:
+        from app import app
+        with app.app_context():
+            manifest = publish(args.out)
+    print(f"{len(manifest['files'])} files, data version {manifest['version']} -> {args.out}")
@@ -1,7 +1,19 @@
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, Response, jsonify, request, current_app, stream_with_context
 from flask_cors import cross_origin
-import os, re, time
+import base64, itertools, json, os, re, time
+from datetime import datetime
 import storage
+import standings
+import events
+import h2h
+import leaders
+import playoffs
+import publisher
+import seasons
+import wire
+import httpcache
+import metrics
+from httpcache import cached_get
 
 routes = Blueprint("routes", __name__)
 
@@ -10,10 +22,11 @@ routes = Blueprint("routes", __name__)
 @routes.before_app_request
 def _log_request():
     try:
+        body = request.get_json(silent=True) if request.is_json else None
         current_app.logger.info("Incoming request: %s %s from %s args=%s json_keys=%s",
                                 request.method, request.path, request.remote_addr,
                                 dict(request.args),
-                                list(request.get_json(silent=True).keys()) if request.get_json(silent=True) else None)
+                                list(body.keys()) if isinstance(body, dict) else None)
     except Exception:
         current_app.logger.exception("request logging failed")
 
@@ -25,6 +38,7 @@ def allow_preflight():
 
 
 @routes.route("/routes/teams", methods=["GET"])
+@cached_get
 def get_teams():
     try:
         teams = storage.get_teams()
@@ -44,6 +58,277 @@ def get_teams():
         return jsonify({"error": "internal"}), 500
 
 
+@routes.route("/routes/standings", methods=["GET"])
+@cached_get
+def get_standings():
+    season, error = _requested_season()
+    if error:
+        return error
+    as_of = request.args.get('as_of')
+    if as_of:
+        parsed = _parse_date(as_of)
+        if parsed is None:
+            return jsonify({'message': 'invalid date format', 'value': as_of}), 400
+        as_of = parsed.isoformat()
+    try:
+        if as_of:
+            # a closed season's snapshot only has final standings; rebuild from its results
+            return jsonify({
+                **_season_header(season),
+                "as_of": as_of,
+                "teams": standings.get_standings(as_of=as_of,
+                                                 season_id=season['id'] if season else None),
+            })
+        if season and season['status'] == 'closed':
+            snapshot = seasons.get_snapshot(season['id'])
+            return jsonify({
+                "season_id": season['id'],
+                "season_games": snapshot['season_games'],
+                "teams": snapshot['standings'],
+            })
+        return jsonify({
+            "season_id": storage.active_season()['id'],
+            "season_games": standings.SEASON_GAMES,
+            "teams": standings.get_standings(),
+        })
+    except Exception:
+        current_app.logger.exception("get_standings failed")
+        return jsonify({"error": "internal"}), 500
+
+
+@routes.route("/routes/standings/history", methods=["GET"])
+@cached_get
+def get_standings_history():
+    """The season's standings curve in one columnar payload (see standings.get_history)."""
+    season, error = _requested_season()
+    if error:
+        return error
+    try:
+        return jsonify({
+            **_season_header(season),
+            **standings.get_history(season_id=season['id'] if season else None),
+        })
+    except Exception:
+        current_app.logger.exception("get_standings_history failed")
+        return jsonify({"error": "internal"}), 500
+
+
+def _season_header(season):
+    """season_id / season_games for a ?season= request (None: the active season)."""
+    if season and season['status'] == 'closed':
+        return {"season_id": season['id'],
+                "season_games": seasons.get_snapshot(season['id'])['season_games']}
+    return {"season_id": season['id'] if season else storage.active_season()['id'],
+            "season_games": standings.SEASON_GAMES}
+
+
+def _parse_date(value):
+    """Parse the date formats the admin forms send. Returns a date or None."""
+    value = (value or '').strip()
+    for fmt in ('%Y-%m-%d', '%m/%d/%Y', '%m-%d-%Y'):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        return None
+
+
+# ── Paging / streaming ────────────────────────────────────────────────────────
+#
+# Listing endpoints keep their original bare-array response. Opt-in modes:
+#   ?page_size=N[&cursor=TOKEN]  ->  {"items": [...], "next": TOKEN or null}
+#   ?stream=1                    ->  the same bare array, streamed row by row
+#   ?format=columnar             ->  column arrays instead of row objects (see
+#                                    wire.py); combines with paging, not stream
+
+PAGE_SIZE_DEFAULT = 100
+PAGE_SIZE_MAX = 1000
+
+
+def _requested_season():
+    """Resolve ?season=<id>. Returns (season or None, error response or None).
+
+    A closed season is returned only if its snapshot can be served.
+    """
+    value = request.args.get('season')
+    if not value:
+        return None, None
+    try:
+        season_id = int(value)
+    except ValueError:
+        return None, (jsonify({'message': 'invalid season', 'value': value}), 400)
+    season = storage.get_season(season_id)
+    if season is None:
+        return None, (jsonify({'message': 'season not found', 'season': season_id}), 404)
+    if season['status'] == 'closed' and seasons.get_snapshot(season_id) is None:
+        return None, (jsonify({'message': 'season snapshot unavailable', 'season': season_id}), 404)
+    return season, None
+
+
+def _encode_cursor(key):
+    raw = json.dumps(list(key), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(token, arity):
+    """Decode a next token into a list of arity values. Returns None if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        key = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(key, list) or len(key) != arity:
+        return None
+    return key
+
+
+def _page_request():
+    """(paged, page_size) from the query string; paged is False for the legacy shape."""
+    if 'cursor' not in request.args and 'page_size' not in request.args:
+        return False, None
+    try:
+        size = int(request.args.get('page_size') or PAGE_SIZE_DEFAULT)
+    except ValueError:
+        size = PAGE_SIZE_DEFAULT
+    return True, max(1, min(size, PAGE_SIZE_MAX))
+
+
+def _wants_stream():
+    return (request.args.get('stream') or '').lower() in ('1', 'true', 'yes')
+
+
+def _requested_format():
+    """(columnar, error response or None) from ?format=rows|columnar."""
+    value = (request.args.get('format') or 'rows').lower()
+    if value not in ('rows', 'columnar'):
+        return False, (jsonify({'message': 'invalid format', 'value': value}), 400)
+    if value == 'columnar' and _wants_stream():
+        return True, (jsonify({'message': 'format=columnar cannot be combined with stream'}), 400)
+    return value == 'columnar', None
+
+
+def _stream_json_array(rows):
+    """Stream an iterable of dicts as one JSON array without building it in memory."""
+    def generate():
+        yield '['
+        for i, row in enumerate(rows):
+            yield (',' if i else '') + current_app.json.dumps(row)
+        yield ']'
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
+@routes.route("/routes/h2h", methods=["GET"])
+@cached_get
+def get_h2h():
+    season, error = _requested_season()
+    if error:
+        return error
+    snapshot = seasons.get_snapshot(season['id']) if season and season['status'] == 'closed' else None
+    as_of = request.args.get('as_of')
+    if as_of and snapshot is not None:
+        return jsonify({'message': 'as_of is not available for closed seasons'}), 400
+    if as_of:
+        parsed = _parse_date(as_of)
+        if parsed is None:
+            return jsonify({'message': 'invalid date format', 'value': as_of}), 400
+        as_of = parsed.isoformat()
+
+    team1_id = request.args.get('team1_id')
+    team2_id = request.args.get('team2_id')
+    try:
+        if team1_id and team2_id:
+            try:
+                team1_id, team2_id = int(team1_id), int(team2_id)
+            except ValueError:
+                return jsonify({'message': 'invalid team ids'}), 400
+            if snapshot is not None:
+                record = seasons.get_pair(snapshot, team1_id, team2_id)
+            else:
+                record = h2h.get_pair(team1_id, team2_id, as_of=as_of)
+            return jsonify({
+                "as_of": as_of,
+                "team1_id": team1_id,
+                "team2_id": team2_id,
+                "record": record,
+            })
+        if snapshot is not None:
+            return jsonify({"as_of": None, "matrix": snapshot['h2h']})
+        return jsonify({"as_of": as_of, "matrix": h2h.get_matrix(as_of=as_of)})
+    except Exception:
+        current_app.logger.exception("get_h2h failed")
+        return jsonify({"error": "internal"}), 500
+
+
+@routes.route("/routes/events", methods=["GET"])
+def get_events():
+    """Server-Sent Events feed of committed result / player / team changes (see events.py)."""
+    body = events.stream(request.headers.get('Last-Event-ID'),
+                         cooperative=events.cooperative(request.environ),
+                         app=current_app._get_current_object())
+    return Response(body, mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@routes.route("/routes/admin/h2h/rebuild", methods=["POST"])
+def rebuild_h2h():
+    token = os.environ.get("DOWNLOAD_TOKEN")
+    header = request.headers.get("X-Download-Token")
+    if token and header != token:
+        return ("", 403)
+
+    try:
+        count = h2h.rebuild()
+        current_app.logger.info("rebuild_h2h results=%s", count)
+        return jsonify({'message': 'H2H rebuilt', 'results': count}), 200
+    except Exception as ex:
+        current_app.logger.exception("rebuild_h2h failed: %s", ex)
+        return jsonify({'message': 'Internal server error', 'error': str(ex)}), 500
+
+
+@routes.route("/routes/leaders", methods=["GET"])
+@cached_get
+def get_leaders():
+    try:
+        n = int(request.args.get('n') or 5)
+    except ValueError:
+        return jsonify({'message': 'invalid n'}), 400
+    season, error = _requested_season()
+    if error:
+        return error
+    try:
+        if season and season['status'] == 'closed':
+            snapshot = seasons.get_snapshot(season['id'])
+            return jsonify({
+                "n": max(1, min(n, leaders.MAX_N)),
+                "min_gp": snapshot['leaders']['min_gp'],
+                "categories": seasons.get_leaders(snapshot, n),
+            })
+        return jsonify({
+            "n": max(1, min(n, leaders.MAX_N)),
+            "min_gp": leaders.MIN_GP,
+            "categories": leaders.get_leaders(n),
+        })
+    except Exception:
+        current_app.logger.exception("get_leaders failed")
+        return jsonify({"error": "internal"}), 500
+
+
+@routes.route("/routes/playoff_odds", methods=["GET"])
+@cached_get
+def get_playoff_odds():
+    try:
+        return jsonify({
+            "season_id": storage.active_season()['id'],
+            **playoffs.get_odds(),
+        })
+    except Exception:
+        current_app.logger.exception("get_playoff_odds failed")
+        return jsonify({"error": "internal"}), 500
+
+
 @routes.route('/routes/admin/add_team', methods=['POST', 'OPTIONS'])
 @cross_origin(headers=['Content-Type', 'X-Download-Token'])
 def add_team():
@@ -97,12 +382,17 @@ def admin_db_status():
 
     backend = storage.STORAGE_BACKEND
 
-    if backend == 'json':
-        file_status = storage.json_status()
+    if backend != 'sql':
+        # json: data_dir and files; sqlite: path, journal_mode, counts
+        try:
+            engine_status = storage.status()
+        except Exception as ex:
+            engine_status = {"last_error": str(ex)[:1000]}
         return jsonify({
-            "storage_backend": "json",
-            "data_dir": storage.DATA_DIR,
-            "files": file_status,
+            "storage_backend": backend,
+            **engine_status,
+            "publisher": publisher.status(),
+            "events": events.status(),
             "timestamp": time.time(),
         })
 
@@ -137,10 +427,31 @@ def admin_db_status():
         "cloudsql_socket_exists": bool(socket_exists),
         "db_connect_ok": bool(db_ok),
         "last_error": error,
+        "publisher": publisher.status(),
+        "events": events.status(),
         "timestamp": time.time(),
     })
 
 
+@routes.route("/routes/admin/metrics", methods=["GET"])
+def admin_metrics():
+    token = os.environ.get("DOWNLOAD_TOKEN")
+    header = request.headers.get("X-Download-Token")
+    if token and header != token:
+        return ("", 403)
+
+    cache = httpcache.stats()
+    extra = {
+        'response_cache_hits_total': ('counter', 'Responses served from the versioned response cache.',
+                                      [((), cache['hits'])]),
+        'response_cache_misses_total': ('counter', 'Cacheable responses that had to be rendered.',
+                                        [((), cache['misses'])]),
+        'response_cache_entries': ('gauge', 'Entries held in the response cache.',
+                                   [((), cache['entries'])]),
+    }
+    return Response(metrics.render(extra), mimetype='text/plain; version=0.0.4')
+
+
 @routes.route('/routes/admin/delete_team', methods=['DELETE', 'OPTIONS'])
 @cross_origin(headers=['Content-Type', 'X-Download-Token'])
 def delete_team():
@@ -203,6 +514,62 @@ def update_player():
         return jsonify({'message': 'Internal server error', 'error': str(ex)}), 500
 
 
+def _validate_player_updates(entries, allow_empty=False):
+    """Validate a list of per-player stat lines.
+
+    Returns ([(player_id, increments), ...], None) or (None, error_response).
+    """
+    if not isinstance(entries, list) or (len(entries) == 0 and not allow_empty):
+        return None, (jsonify({'message': 'players must be a non-empty array'}), 400)
+    if len(entries) > 100:
+        return None, (jsonify({'message': 'too many players in batch'}), 400)
+
+    updates = []
+    seen = set()
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict) or 'player_id' not in entry:
+            return None, (jsonify({'message': 'each entry must be an object with player_id', 'index': i}), 400)
+        try:
+            player_id = int(entry['player_id'])
+            increments = {f: int(entry.get(f, 0) or 0) for f in storage.STAT_FIELDS}
+        except (TypeError, ValueError) as ex:
+            return None, (jsonify({'message': 'invalid numeric fields', 'index': i, 'error': str(ex)}), 400)
+        if player_id in seen:
+            return None, (jsonify({'message': 'duplicate player_id in batch', 'player_id': player_id}), 400)
+        seen.add(player_id)
+        if 'name' in entry:
+            if not isinstance(entry['name'], str) or not entry['name'].strip():
+                return None, (jsonify({'message': 'invalid name', 'index': i}), 400)
+            increments['name'] = entry['name']
+        updates.append((player_id, increments))
+    return updates, None
+
+
+@routes.route('/routes/admin/update_players/batch', methods=['POST', 'OPTIONS'])
+@cross_origin(headers=['Content-Type', 'X-Download-Token'])
+def update_players_batch():
+    if request.method == 'OPTIONS':
+        return ('', 200)
+
+    data = request.get_json(silent=True) or {}
+    updates, error = _validate_player_updates(data.get('players'))
+    if error:
+        return error
+
+    try:
+        players = storage.update_players(updates)
+    except LookupError as ex:
+        missing = ex.args[0] if ex.args else []
+        current_app.logger.warning("update_players_batch players not found ids=%s", missing)
+        return jsonify({'message': 'players not found', 'player_ids': missing}), 404
+    except Exception as ex:
+        current_app.logger.exception("update_players_batch failed: %s", ex)
+        return jsonify({'message': 'Internal server error', 'error': str(ex)}), 500
+
+    current_app.logger.info("update_players_batch updated ids=%s", [p['id'] for p in players])
+    return jsonify({'message': 'Players updated', 'players': players}), 200
+
+
 @routes.route('/routes/admin/update_team_record', methods=['POST', 'OPTIONS'])
 @cross_origin(headers=['Content-Type', 'X-Download-Token'])
 def update_team_record():
@@ -250,6 +617,7 @@ def update_team_record():
 
 @routes.route('/routes/players', methods=['GET', 'OPTIONS'])
 @cross_origin(headers=['Content-Type', 'X-Download-Token'])
+@cached_get
 def get_players():
     if request.method == 'OPTIONS':
         return ('', 200)
@@ -262,15 +630,59 @@ def get_players():
             except ValueError:
                 return jsonify({'message': 'invalid team_id'}), 400
 
+        columnar, error = _requested_format()
+        if error:
+            return error
+
+        if _wants_stream():
+            return _stream_json_array(storage.iter_players(team_id=team_id))
+
+        paged, page_size = _page_request()
+        if paged:
+            after = 0
+            token = request.args.get('cursor')
+            if token:
+                key = _decode_cursor(token, 1)
+                if key is None or not isinstance(key[0], int):
+                    return jsonify({'message': 'invalid cursor'}), 400
+                after = key[0]
+            items = storage.get_players(team_id=team_id, limit=page_size, after=after)
+            nxt = _encode_cursor([items[-1]['id']]) if len(items) == page_size else None
+            if columnar:
+                items = _columnar_players(items)
+            return jsonify({'items': items, 'next': nxt}), 200
+
         players = storage.get_players(team_id=team_id)
+        if columnar:
+            players = _columnar_players(players)
         return jsonify(players), 200
     except Exception as ex:
         current_app.logger.exception("get_players failed: %s", ex)
         return jsonify({'message': 'Internal server error', 'error': str(ex)}), 500
 
 
+def _columnar_players(rows):
+    return wire.players(rows, {t['id']: t['name'] for t in storage.get_teams()})
+
+
+@routes.route('/routes/rosters', methods=['GET', 'OPTIONS'])
+@cross_origin(headers=['Content-Type', 'X-Download-Token'])
+@cached_get
+def get_rosters():
+    """Every team with its players nested — one request for the Players tab."""
+    if request.method == 'OPTIONS':
+        return ('', 200)
+
+    try:
+        return jsonify(storage.get_rosters()), 200
+    except Exception as ex:
+        current_app.logger.exception("get_rosters failed: %s", ex)
+        return jsonify({'message': 'Internal server error', 'error': str(ex)}), 500
+
+
 @routes.route('/routes/players/search', methods=['GET', 'OPTIONS'])
 @cross_origin(headers=['Content-Type', 'X-Download-Token'])
+@cached_get
 def search_players():
     if request.method == 'OPTIONS':
         return ('', 200)
@@ -295,6 +707,30 @@ def search_players():
         return jsonify({'message': 'Internal server error', 'error': str(ex)}), 500
 
 
+def _validate_games(games):
+    """Validate a matchup's game list. Returns (games, None) or (None, error_response)."""
+    if not isinstance(games, list) or len(games) == 0:
+        return None, (jsonify({'message': 'games must be a non-empty array'}), 400)
+    if len(games) > 20:
+        return None, (jsonify({'message': 'too many games in batch'}), 400)
+
+    validated_games = []
+    for g in games:
+        if not isinstance(g, dict):
+            return None, (jsonify({'message': 'each game must be an object'}), 400)
+        if 'game_number' not in g or 'team1_score' not in g or 'team2_score' not in g:
+            return None, (jsonify({'message': 'game objects must include game_number, team1_score, team2_score', 'game': g}), 400)
+        try:
+            validated_games.append({
+                'game_number': int(g['game_number']),
+                'team1_score': int(g['team1_score']),
+                'team2_score': int(g['team2_score']),
+            })
+        except Exception as ex:
+            return None, (jsonify({'message': 'invalid numeric fields in game', 'error': str(ex), 'game': g}), 400)
+    return validated_games, None
+
+
 @routes.route('/routes/results/batch', methods=['POST', 'OPTIONS'])
 @cross_origin(headers=['Content-Type', 'X-Download-Token'])
 def create_results_batch():
@@ -311,19 +747,9 @@ def create_results_batch():
 
     # parse date
     date_raw = str(data.get('date', '')).strip()
-    parsed_date = None
-    for fmt in ('%Y-%m-%d', '%m/%d/%Y', '%m-%d-%Y'):
-        try:
-            from datetime import datetime
-            parsed_date = datetime.strptime(date_raw, fmt).date()
-            break
-        except Exception:
-            continue
+    parsed_date = _parse_date(date_raw)
     if parsed_date is None:
-        try:
-            parsed_date = __import__('datetime').datetime.fromisoformat(date_raw).date()
-        except Exception:
-            return jsonify({'message': 'invalid date format', 'value': date_raw}), 400
+        return jsonify({'message': 'invalid date format', 'value': date_raw}), 400
 
     try:
         team1_id = int(data['team1_id'])
@@ -340,26 +766,9 @@ def create_results_batch():
     if not t1 or not t2:
         return jsonify({'message': 'one or both teams not found'}), 400
 
-    games = data.get('games')
-    if not isinstance(games, list) or len(games) == 0:
-        return jsonify({'message': 'games must be a non-empty array'}), 400
-    if len(games) > 20:
-        return jsonify({'message': 'too many games in batch'}), 400
-
-    validated_games = []
-    for g in games:
-        if not isinstance(g, dict):
-            return jsonify({'message': 'each game must be an object'}), 400
-        if 'game_number' not in g or 'team1_score' not in g or 'team2_score' not in g:
-            return jsonify({'message': 'game objects must include game_number, team1_score, team2_score', 'game': g}), 400
-        try:
-            validated_games.append({
-                'game_number': int(g['game_number']),
-                'team1_score': int(g['team1_score']),
-                'team2_score': int(g['team2_score']),
-            })
-        except Exception as ex:
-            return jsonify({'message': 'invalid numeric fields in game', 'error': str(ex), 'game': g}), 400
+    validated_games, error = _validate_games(data.get('games'))
+    if error:
+        return error
 
     try:
         created = storage.add_results(parsed_date, team1_id, team2_id, validated_games)
@@ -371,6 +780,7 @@ def create_results_batch():
 
 @routes.route('/routes/results', methods=['GET', 'OPTIONS'])
 @cross_origin(headers=['Content-Type', 'X-Download-Token'])
+@cached_get
 def get_results():
     if request.method == 'OPTIONS':
         return ('', 200)
@@ -385,18 +795,9 @@ def get_results():
 
         parsed_date = None
         if date_q:
-            for fmt in ('%Y-%m-%d', '%m/%d/%Y', '%m-%d-%Y'):
-                try:
-                    from datetime import datetime
-                    parsed_date = datetime.strptime(date_q.strip(), fmt).date()
-                    break
-                except Exception:
-                    continue
+            parsed_date = _parse_date(date_q)
             if parsed_date is None:
-                try:
-                    parsed_date = __import__('datetime').datetime.fromisoformat(date_q.strip()).date()
-                except Exception:
-                    return jsonify({'message': 'invalid date format', 'value': date_q}), 400
+                return jsonify({'message': 'invalid date format', 'value': date_q}), 400
 
         if team_id:
             try:
@@ -404,8 +805,166 @@ def get_results():
             except Exception:
                 return jsonify({'message': 'invalid team_id'}), 400
 
-        results = storage.get_results(date=parsed_date, team_id=team_id, limit=limit)
+        season, error = _requested_season()
+        if error:
+            return error
+        season_id = season['id'] if season else None
+
+        columnar, error = _requested_format()
+        if error:
+            return error
+        if columnar and season_id is None:
+            season_id = storage.active_season()['id']
+
+        if _wants_stream():
+            rows = storage.iter_results(date=parsed_date, team_id=team_id, season_id=season_id)
+            if request.args.get('limit'):
+                rows = itertools.islice(rows, limit)
+            return _stream_json_array(rows)
+
+        paged, page_size = _page_request()
+        if paged:
+            after = None
+            token = request.args.get('cursor')
+            if token:
+                after = _decode_cursor(token, 3)
+                # a null date is the cursor of a date-less row (they sort last)
+                cursor_date = _parse_date(str(after[0])) if after and after[0] is not None else None
+                if (not after or (after[0] is not None and cursor_date is None)
+                        or not all(isinstance(v, int) for v in after[1:])):
+                    return jsonify({'message': 'invalid cursor'}), 400
+                if cursor_date is not None:
+                    after[0] = cursor_date.isoformat()
+            items = storage.get_results(date=parsed_date, team_id=team_id,
+                                        limit=page_size, after=after, season_id=season_id)
+            nxt = _encode_cursor(storage.results_cursor(items[-1])) if len(items) == page_size else None
+            if columnar:
+                items = wire.results(items, season_id)
+            return jsonify({'items': items, 'next': nxt}), 200
+
+        results = storage.get_results(date=parsed_date, team_id=team_id, limit=limit,
+                                      season_id=season_id)
+        if columnar:
+            results = wire.results(results, season_id)
         return jsonify(results), 200
     except Exception as ex:
         current_app.logger.exception("get_results failed: %s", ex)
         return jsonify({'message': 'Internal server error', 'error': str(ex)}), 500
+
+
+@routes.route('/routes/admin/matches', methods=['POST', 'OPTIONS'])
+@cross_origin(headers=['Content-Type', 'X-Download-Token', 'Idempotency-Key'])
+def record_match():
+    if request.method == 'OPTIONS':
+        return ('', 200)
+
+    data = request.get_json(silent=True) or {}
+    current_app.logger.info("record_match payload=%s remote=%s", data, request.remote_addr)
+
+    key = (request.headers.get('Idempotency-Key') or data.get('idempotency_key') or '').strip()
+    if not key:
+        return jsonify({'message': 'idempotency_key (or Idempotency-Key header) is required'}), 400
+    if len(key) > 100:
+        return jsonify({'message': 'idempotency_key too long'}), 400
+
+    required = ['date', 'team1_id', 'team2_id', 'games']
+    missing = [k for k in required if k not in data]
+    if missing:
+        return jsonify({'message': 'missing fields', 'fields': missing}), 400
+
+    parsed_date = _parse_date(str(data.get('date', '')))
+    if parsed_date is None:
+        return jsonify({'message': 'invalid date format', 'value': data.get('date')}), 400
+
+    try:
+        team1_id = int(data['team1_id'])
+        team2_id = int(data['team2_id'])
+    except Exception as ex:
+        return jsonify({'message': 'invalid team ids', 'error': str(ex)}), 400
+    if team1_id == team2_id:
+        return jsonify({'message': 'team1_id and team2_id must be different'}), 400
+
+    games, error = _validate_games(data.get('games'))
+    if error:
+        return error
+    player_updates, error = _validate_player_updates(data.get('players', []), allow_empty=True)
+    if error:
+        return error
+
+    try:
+        match, replayed = storage.record_match(key, parsed_date, team1_id, team2_id, games, player_updates)
+    except LookupError as ex:
+        kind, ids = ex.args[0]
+        return jsonify({'message': f'{kind} not found', 'ids': ids}), 404
+    except Exception as ex:
+        current_app.logger.exception("record_match failed")
+        return jsonify({'message': 'Internal server error', 'error': str(ex)}), 500
+
+    current_app.logger.info("record_match key=%s replayed=%s results=%s",
+                            key, replayed, [r['id'] for r in match['results']])
+    return jsonify({**match, 'replayed': replayed}), (200 if replayed else 201)
+
+
+# ── Seasons ───────────────────────────────────────────────────────────────────
+
+@routes.route('/routes/seasons', methods=['GET'])
+@cached_get
+def get_seasons():
+    try:
+        return jsonify(storage.get_seasons()), 200
+    except Exception as ex:
+        current_app.logger.exception("get_seasons failed: %s", ex)
+        return jsonify({'message': 'Internal server error', 'error': str(ex)}), 500
+
+
+@routes.route('/routes/seasons/<int:season_id>', methods=['GET'])
+@cached_get
+def get_season(season_id):
+    try:
+        season = storage.get_season(season_id)
+        if season is None:
+            return jsonify({'message': 'season not found', 'season': season_id}), 404
+        if season['status'] == 'closed':
+            snapshot = seasons.get_snapshot(season_id)
+            if snapshot is not None:
+                season['snapshot'] = {k: v for k, v in snapshot.items() if k != 'players_by_id'}
+        return jsonify(season), 200
+    except Exception as ex:
+        current_app.logger.exception("get_season failed: %s", ex)
+        return jsonify({'message': 'Internal server error', 'error': str(ex)}), 500
+
+
+@routes.route('/routes/players/<int:player_id>/career', methods=['GET'])
+@cached_get
+def get_player_career(player_id):
+    try:
+        career = seasons.career(player_id)
+        if career is None:
+            return jsonify({'message': 'player not found', 'id': player_id}), 404
+        return jsonify(career), 200
+    except Exception as ex:
+        current_app.logger.exception("get_player_career failed: %s", ex)
+        return jsonify({'message': 'Internal server error', 'error': str(ex)}), 500
+
+
+@routes.route('/routes/admin/seasons/close', methods=['POST', 'OPTIONS'])
+@cross_origin(headers=['Content-Type', 'X-Download-Token'])
+def close_season():
+    if request.method == 'OPTIONS':
+        return ('', 200)
+    token = os.environ.get("DOWNLOAD_TOKEN")
+    header = request.headers.get("X-Download-Token")
+    if token and header != token:
+        return ("", 403)
+
+    data = request.get_json(silent=True) or {}
+    name = (data.get('next_name') or '').strip() or None
+    if name and len(name) > 100:
+        return jsonify({'message': 'next_name too long'}), 400
+    try:
+        closed, opened = seasons.close_season(next_name=name)
+    except Exception as ex:
+        current_app.logger.exception("close_season failed")
+        return jsonify({'message': 'Internal server error', 'error': str(ex)}), 500
+    current_app.logger.info("close_season closed=%s opened=%s", closed['id'], opened['id'])
+    return jsonify({'message': 'Season closed', 'closed': closed, 'opened': opened}), 200
@@ -0,0 +1,117 @@
+"""
+seasons.py — closing seasons and serving the archived ones.
+
+Only the active season is live: standings, h2h and leaders aggregate it, and
+new results are recorded into it. Closing a season (storage.close_season)
+freezes a snapshot of everything the site shows for it — standings, leaders,
+the head-to-head matrix, final team records and player lines — onto the season
+row, then zeroes the counters for the next season. Past seasons are therefore
+read-only and cost one JSON decode per process to serve, however many accumulate;
+their results stay in the results table and are listed with ?season=.
+"""
+
+import threading
+
+import h2h
+import leaders
+import standings
+import storage
+
+_lock = threading.Lock()
+_snapshots = {}      # season_id -> snapshot; closed seasons never change
+
+
+# ── Closing ───────────────────────────────────────────────────────────────────
+
+def build_snapshot():
+    """Freeze the active season's aggregates (called by storage.close_season)."""
+    results = storage.all_results()
+    return {
+        'season_games': standings.SEASON_GAMES,
+        'standings': standings.get_standings(),
+        'leaders': {'min_gp': leaders.MIN_GP, 'categories': leaders.get_leaders(leaders.MAX_N)},
+        'h2h': {str(tid): {str(opp): rec for opp, rec in row.items()}
+                for tid, row in h2h.get_matrix(with_games=True).items()},
+        'teams': storage.get_teams(),
+        'players': storage.get_players(limit=None),
+        'results': {
+            'count': len(results),
+            'first_date': results[0]['date'] if results else None,
+            'last_date': results[-1]['date'] if results else None,
+        },
+    }
+
+
+def close_season(next_name=None):
+    """Close the active season; returns (closed, opened) season dicts."""
+    return storage.close_season(build_snapshot, next_name=next_name)
+
+
+# ── Archived seasons ──────────────────────────────────────────────────────────
+
+def get_snapshot(season_id):
+    """Snapshot of a closed season (shared; do not mutate), or None."""
+    with _lock:
+        snapshot = _snapshots.get(season_id)
+    if snapshot is None:
+        snapshot = storage.get_season_snapshot(season_id)
+        if snapshot is None:
+            return None
+        snapshot['players_by_id'] = {p['id']: p for p in snapshot.get('players', [])}
+        with _lock:
+            _snapshots[season_id] = snapshot
+    return snapshot
+
+
+def get_leaders(snapshot, n=5):
+    """Top n per category from a snapshot, with ties, as leaders.get_leaders returns them."""
+    n = max(1, min(int(n), leaders.MAX_N))
+    out = {}
+    for category, rows in snapshot['leaders']['categories'].items():
+        # ranks are competition ranks, so rank <= n is exactly "top n plus ties"
+        out[category] = [row for row in rows if row['rank'] <= n]
+    return out
+
+
+def get_pair(snapshot, team1_id, team2_id):
+    """team1's record against team2 in a closed season: {'wins', 'losses', 'games'}."""
+    rec = snapshot['h2h'].get(str(team1_id), {}).get(str(team2_id))
+    if rec is None:
+        return {'wins': 0, 'losses': 0, 'games': 0}
+    return {'wins': rec['wins'], 'losses': rec['losses'], 'games': rec['games']}
+
+
+# ── Careers ───────────────────────────────────────────────────────────────────
+
+def _line(p):
+    return {field: p.get(field) or 0 for field in (*storage.STAT_FIELDS, 'hits', 'GP')}
+
+
+def career(player_id):
+    """A player's per-season lines (closed seasons, then the active one) and totals.
+
+    Returns None if the player appears in no season.
+    """
+    seasons = []
+    for season in storage.get_seasons():
+        if season['status'] == 'closed':
+            snapshot = get_snapshot(season['id'])
+            p = snapshot['players_by_id'].get(player_id) if snapshot else None
+        else:
+            p = storage.get_player_by_id(player_id)
+        if p is None or not p.get('GP'):
+            continue
+        seasons.append({'season_id': season['id'], 'season_name': season['name'],
+                        'name': p.get('name'), 'team_id': p.get('team_id'), **_line(p)})
+    if not seasons:
+        player = storage.get_player_by_id(player_id)
+        if player is None:
+            return None
+        return {'id': player_id, 'name': player.get('name'), 'seasons': [],
+                'totals': {**_line({}), 'Avg': 0.0}}
+
+    totals = {field: sum(s[field] for s in seasons) for field in _line({})}
+    totals['Avg'] = round(totals['hits'] / totals['AtBats'], 3) if totals['AtBats'] else 0.0
+    for s in seasons:
+        s['Avg'] = round(s['hits'] / s['AtBats'], 3) if s['AtBats'] else 0.0
+    return {'id': player_id, 'name': seasons[-1]['name'], 'seasons': seasons, 'totals': totals}
@@ -0,0 +1,234 @@
+"""
+standings.py — server-side standings built from the results table.
+
+Keeps per-team cumulative totals (wins, losses, games played) for every date
+of the active season — prefix sums over the results grouped by date, one
+array per team and counter, aligned with a sorted list of dates. Current
+standings read the last entry; standings as of any date are a bisect into the
+dates plus one array read per team; the season's standings curve reads them
+all. storage.add_results folds new games in (apply_results), so a request
+never has to re-reduce the season. The arrays are rebuilt from storage only
+on first use or when another process has added results behind our back
+(detected via storage.results_fingerprint()). Only the active season is kept;
+closed seasons are served from their frozen snapshots (see seasons.py), or
+rebuilt from their results on request for a past date or the curve.
+
+Rules match the standings the frontend used to compute itself:
+  - every result counts as one game played for both teams
+  - a tie counts as a game played but neither a win nor a loss
+  - win_pct is a percentage (65.4), games behind is measured from the leader
+"""
+
+import bisect
+import os
+import threading
+
+import storage
+
+SEASON_GAMES = int(os.environ.get('SEASON_GAMES', 96))
+COUNTERS = ('wins', 'losses', 'games_played')
+
+_lock = threading.Lock()
+_state = {
+    'dates': None,        # sorted ISO dates with at least one result
+    'series': None,       # {team_id: {counter: [cumulative value on each date]}}
+    'season_id': None,    # season the arrays cover (only the active season is kept)
+    'count': 0,           # number of results folded in
+    'max_id': None,       # highest result id folded in
+}
+
+
+# ── Aggregation ───────────────────────────────────────────────────────────────
+
+def _fold(dates, series, r):
+    t1, t2 = r['team1_id'], r['team2_id']
+    s1, s2 = r.get('team1_score') or 0, r.get('team2_score') or 0
+    date = r.get('date') or ''
+
+    i = bisect.bisect_left(dates, date)
+    if i == len(dates) or dates[i] != date:
+        # new date: every team starts from its previous cumulative entry
+        dates.insert(i, date)
+        for columns in series.values():
+            for column in columns.values():
+                column.insert(i, column[i - 1] if i > 0 else 0)
+    for tid, won, lost in ((t1, s1 > s2, s2 > s1), (t2, s2 > s1, s1 > s2)):
+        columns = series.get(tid)
+        if columns is None:
+            columns = series[tid] = {c: [0] * len(dates) for c in COUNTERS}
+        # bump this date and every later one (only non-zero for back-dated makeups)
+        wins, losses, played = columns['wins'], columns['losses'], columns['games_played']
+        for j in range(i, len(dates)):
+            played[j] += 1
+            if won:
+                wins[j] += 1
+            elif lost:
+                losses[j] += 1
+
+
+def _build(results):
+    dates, series = [], {}
+    max_id = None
+    for r in results:
+        _fold(dates, series, r)
+        if max_id is None or r['id'] > max_id:
+            max_id = r['id']
+    return dates, series, max_id
+
+
+def rebuild():
+    """Recompute the per-date totals from every result of the active season."""
+    season_id = storage.active_season()['id']
+    results = storage.all_results(season_id)
+    dates, series, max_id = _build(results)
+    with _lock:
+        _state['dates'] = dates
+        _state['series'] = series
+        _state['season_id'] = season_id
+        _state['count'] = len(results)
+        _state['max_id'] = max_id
+
+
+def apply_results(created):
+    """Fold newly committed result dicts into the per-date totals.
+
+    Called by storage.add_results after commit. If the totals have not been
+    built yet there is nothing to update — the next read builds them.
+    """
+    with _lock:
+        if _state['series'] is None:
+            return
+        if any(r.get('season_id') != _state['season_id'] for r in created):
+            _state['series'] = None   # a season was closed under us; rebuild on next read
+            return
+        for r in created:
+            _fold(_state['dates'], _state['series'], r)
+            if _state['max_id'] is None or r['id'] > _state['max_id']:
+                _state['max_id'] = r['id']
+        _state['count'] += len(created)
+
+
+def _ensure_fresh():
+    fingerprint = storage.results_fingerprint()
+    with _lock:
+        current = ((_state['season_id'], _state['count'], _state['max_id'])
+                   if _state['series'] is not None else None)
+    if current != fingerprint:
+        rebuild()
+
+
+def _at(series, i):
+    """{team_id: {counter: value}} as of date index i (-1: before the first date)."""
+    if i < 0:
+        return {tid: dict.fromkeys(COUNTERS, 0) for tid in series}
+    return {tid: {c: columns[c][i] for c in COUNTERS} for tid, columns in series.items()}
+
+
+def _snapshot(season_id):
+    """(dates, series) for season_id (None: active), copied out of the lock."""
+    active = storage.active_season()['id']
+    if season_id is not None and season_id != active:
+        dates, series, _ = _build(storage.all_results(season_id))
+        return dates, series
+    _ensure_fresh()
+    with _lock:
+        series = {tid: {c: list(column) for c, column in columns.items()}
+                  for tid, columns in (_state['series'] or {}).items()}
+        return list(_state['dates'] or ()), series
+
+
+# ── Standings ─────────────────────────────────────────────────────────────────
+
+def get_standings(as_of=None, season_id=None):
+    """Return the ordered standings table.
+
+    as_of: ISO date string; only games on or before that date count.
+    season_id: season to read (default: active; a closed season is rebuilt
+    from its results).
+
+    Each row: id, name, wins, losses, games_played, games_left, win_pct,
+    games_behind, magic_number (wins by this team plus losses by the team
+    directly below needed to lock in the current position; None for last
+    place), clinched (True once magic_number hits 0), and the clinched1st /
+    clinched2nd flags shown on the standings page.
+    """
+    if season_id is None:
+        _ensure_fresh()
+        with _lock:
+            dates = _state['dates'] or []
+            i = len(dates) - 1 if as_of is None else bisect.bisect_right(dates, as_of) - 1
+            totals = _at(_state['series'] or {}, i)
+    else:
+        dates, series = _snapshot(season_id)
+        i = len(dates) - 1 if as_of is None else bisect.bisect_right(dates, as_of) - 1
+        totals = _at(series, i)
+    return _table(totals, _names())
+
+
+def get_history(season_id=None):
+    """The season's standings curve, columnar: {'dates': [...], 'teams': [...]}.
+
+    Each team entry has id, name and, aligned with dates (every date with a
+    result, oldest first), its cumulative wins, losses, games_played, plus
+    games_behind and rank in the standings after that date's games.
+    """
+    dates, series = _snapshot(season_id)
+    names = _names()
+    teams = {tid: {'id': tid, 'name': names.get(tid, f'Team {tid}'),
+                   'wins': [], 'losses': [], 'games_played': [], 'games_behind': [], 'rank': []}
+             for tid in sorted(set(names) | set(series))}
+    for i in range(len(dates)):
+        for rank, row in enumerate(_ranked(_at(series, i), names), 1):
+            entry = teams[row['id']]
+            for field in ('wins', 'losses', 'games_played', 'games_behind'):
+                entry[field].append(row[field])
+            entry['rank'].append(rank)
+    return {'dates': dates, 'teams': list(teams.values())}
+
+
+def _names():
+    return {t['id']: t.get('name') or f"Team {t['id']}" for t in storage.get_teams()}
+
+
+def _ranked(totals, names):
+    """Standings rows (without the clinch fields) ordered best first."""
+    totals = dict(totals)
+    for tid in names:
+        totals.setdefault(tid, dict.fromkeys(COUNTERS, 0))
+
+    rows = []
+    for tid, s in totals.items():
+        gp = s['games_played']
+        rows.append({
+            'id': tid,
+            'name': names.get(tid, f'Team {tid}'),
+            'wins': s['wins'],
+            'losses': s['losses'],
+            'games_played': gp,
+            'games_left': max(SEASON_GAMES - gp, 0),
+            'win_pct': round(s['wins'] / gp * 100.0, 3) if gp > 0 else 0.0,
+        })
+
+    # win_pct desc, then wins desc; id keeps the order stable between requests
+    rows.sort(key=lambda t: (-t['win_pct'], -t['wins'], t['id']))
+
+    leader = rows[0] if rows else None
+    for t in rows:
+        t['games_behind'] = ((leader['wins'] - t['wins']) + (t['losses'] - leader['losses'])) / 2
+    return rows
+
+
+def _table(totals, names):
+    rows = _ranked(totals, names)
+    for i, t in enumerate(rows):
+        below = rows[i + 1] if i + 1 < len(rows) else None
+        if below is None:
+            t['magic_number'] = None
+            t['clinched'] = False
+        else:
+            # final win% = wins / SEASON_GAMES for everyone, so compare wins directly
+            t['magic_number'] = max(below['wins'] + below['games_left'] - t['wins'] + 1, 0)
+            t['clinched'] = t['magic_number'] == 0
+        t['clinched1st'] = i == 0 and t['clinched']
+        t['clinched2nd'] = i == 1 and t['clinched']
+    return rows
@@ -1,195 +1,169 @@
 """
 storage.py — unified CRUD abstraction for teams, players, and results.
 
-Set STORAGE_BACKEND=json  to use JSON files in backend/data/*.json.
-Set STORAGE_BACKEND=sql   (or omit) to use SQLAlchemy / PostgreSQL.
+Set STORAGE_BACKEND=json    to use JSON files in backend/data/*.json (storage_json.py).
+Set STORAGE_BACKEND=sql     (or omit) to use SQLAlchemy / PostgreSQL (storage_sql.py).
+Set STORAGE_BACKEND=sqlite  to use an embedded SQLite file, SQLITE_PATH (storage_sqlite.py).
+
+Everything else calls the functions below; each engine is a module that
+implements BACKEND_API with the signatures and behaviour documented on the
+wrappers here. A mutation is one transaction in every engine (one journal
+entry / one SQL transaction), including the bulk ones: update_players,
+add_results, record_match and close_season write all of their rows or none.
+Each engine bumps data_version() in the same transaction and, once it has
+committed, calls _notify_committed() and the _notify_* hooks below (results,
+players and teams).
 """
 
+import datetime
+import importlib
 import os
-import json
-import threading
+
+import namesearch
 
 STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'sql')
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
 
-# single in-process lock; protects all JSON file reads+writes
-_lock = threading.Lock()
-
 
-# ── JSON helpers ──────────────────────────────────────────────────────────────
+# ── Backend protocol ──────────────────────────────────────────────────────────
 
-def _load(entity):
-    with open(os.path.join(DATA_DIR, f'{entity}.json')) as f:
-        return json.load(f)
+BACKENDS = {'json': 'storage_json', 'sql': 'storage_sql', 'sqlite': 'storage_sqlite'}
 
+BACKEND_API = (
+    # teams
+    'get_teams', 'get_team_by_id', 'add_team', 'update_team_record', 'delete_team',
+    # players
+    'get_players', 'get_player_by_id', 'search_players', 'add_player', 'update_players',
+    'get_rosters',
+    # results
+    'get_results', 'add_results', 'all_results', 'results_fingerprint',
+    # matches and seasons (multi-table transactions)
+    'record_match', 'active_season', 'get_seasons', 'get_season', 'get_season_snapshot',
+    'close_season',
+    # bookkeeping
+    'transaction', 'data_version', 'status',
+)
 
-def _save(entity, data):
-    with open(os.path.join(DATA_DIR, f'{entity}.json'), 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+_engines = {}
 
 
-def _next_id(records):
-    return max((r['id'] for r in records), default=0) + 1
+def backend(name=None):
+    """The engine module for name (default: STORAGE_BACKEND), checked against BACKEND_API."""
+    name = name or STORAGE_BACKEND
+    engine = _engines.get(name)
+    if engine is None:
+        if name not in BACKENDS:
+            raise ValueError(f'unknown STORAGE_BACKEND {name!r}; expected one of {sorted(BACKENDS)}')
+        engine = importlib.import_module(BACKENDS[name])
+        missing = [fn for fn in BACKEND_API if not callable(getattr(engine, fn, None))]
+        if missing:
+            raise TypeError(f'{BACKENDS[name]} does not implement {missing}')
+        _engines[name] = engine
+    return engine
 
 
 # ── Teams ─────────────────────────────────────────────────────────────────────
 
 def get_teams():
-    if STORAGE_BACKEND == 'json':
-        with _lock:
-            return list(_load('teams'))
-    from models import Team
-    return [_team_dict(t) for t in Team.query.all()]
+    return backend().get_teams()
 
 
 def get_team_by_id(team_id):
-    if STORAGE_BACKEND == 'json':
-        with _lock:
-            teams = _load('teams')
-        return next((t for t in teams if t['id'] == team_id), None)
-    from models import Team
-    t = Team.query.get(team_id)
-    return _team_dict(t) if t else None
+    return backend().get_team_by_id(team_id)
 
 
 def add_team(name):
-    if STORAGE_BACKEND == 'json':
-        with _lock:
-            teams = _load('teams')
-            new_team = {
-                'id': _next_id(teams), 'name': name,
-                'wins': 0, 'losses': 0,
-                'win_pct': 0.0, 'games_behind': 0.0, 'games_played': 0,
-            }
-            teams.append(new_team)
-            _save('teams', teams)
-        return new_team
-    from models import db, Team
-    t = Team(name=name, wins=0, losses=0, games_behind=0)
-    db.session.add(t)
-    db.session.commit()
-    return {'id': t.id, 'name': t.name}
+    """Create a team with an empty record. Returns a dict with at least id and name."""
+    return backend().add_team(name)
+
+
+def _team_record_changes(current, wins_inc, losses_inc, games_behind=None):
+    """Field values after adding wins/losses to current (a team dict); win_pct unrounded."""
+    changes = {
+        'wins': (current.get('wins') or 0) + wins_inc,
+        'losses': (current.get('losses') or 0) + losses_inc,
+        'games_played': (current.get('games_played') or 0) + wins_inc + losses_inc,
+    }
+    gp = changes['games_played']
+    changes['win_pct'] = float(changes['wins']) / gp * 100.0 if gp > 0 else 0.0
+    if games_behind is not None:
+        changes['games_behind'] = float(games_behind)
+    return changes
 
 
 def update_team_record(team_id, wins_inc, losses_inc, games_behind=None):
     """Increment wins/losses and recompute win_pct/games_played. Returns updated team dict or None."""
-    if STORAGE_BACKEND == 'json':
-        with _lock:
-            teams = _load('teams')
-            team = next((t for t in teams if t['id'] == team_id), None)
-            if team is None:
-                return None
-            team['wins'] = (team.get('wins') or 0) + wins_inc
-            team['losses'] = (team.get('losses') or 0) + losses_inc
-            team['games_played'] = (team.get('games_played') or 0) + wins_inc + losses_inc
-            gp = team['games_played']
-            team['win_pct'] = round(float(team['wins']) / gp * 100.0, 3) if gp > 0 else 0.0
-            if games_behind is not None:
-                team['games_behind'] = float(games_behind)
-            _save('teams', teams)
-        return team
-    from models import db, Team
-    team = Team.query.get(team_id)
-    if team is None:
-        return None
-    team.wins = (team.wins or 0) + wins_inc
-    team.losses = (team.losses or 0) + losses_inc
-    team.games_played = (team.games_played or 0) + wins_inc + losses_inc
-    gp = team.games_played or 0
-    team.win_pct = float(team.wins) / gp * 100.0 if gp > 0 else 0.0
-    if games_behind is not None:
-        team.games_behind = float(games_behind)
-    db.session.add(team)
-    db.session.commit()
-    return _team_dict(team)
+    return backend().update_team_record(team_id, wins_inc, losses_inc, games_behind)
 
 
 def delete_team(team_id):
     """Remove team and cascade-delete its players. Returns deleted team dict or None."""
-    if STORAGE_BACKEND == 'json':
-        with _lock:
-            teams = _load('teams')
-            team = next((t for t in teams if t['id'] == team_id), None)
-            if team is None:
-                return None
-            _save('teams', [t for t in teams if t['id'] != team_id])
-            players = _load('players')
-            _save('players', [p for p in players if p.get('team_id') != team_id])
-        return team
-    from models import db, Team, Player
-    team = Team.query.get(team_id)
-    if team is None:
-        return None
-    Player.query.filter_by(team_id=team.id).delete()
-    db.session.delete(team)
-    db.session.commit()
-    return {'id': team_id}
+    return backend().delete_team(team_id)
 
 
-def _team_dict(t):
-    return {
-        'id': t.id, 'name': t.name,
-        'wins': t.wins or 0, 'losses': t.losses or 0,
-        'win_pct': t.win_pct or 0.0,
-        'games_behind': t.games_behind or 0.0,
-        'games_played': t.games_played or 0,
-    }
+# ── Players ───────────────────────────────────────────────────────────────────
 
+def get_players(team_id=None, limit=500, after=None):
+    """Players in id order.
+
+    after: keyset cursor — only players with id > after are returned (pass 0 for
+    the first page). Without it the SQL listing is unbounded, as it always was.
+    """
+    return backend().get_players(team_id=team_id, limit=limit, after=after)
 
-# ── Players ───────────────────────────────────────────────────────────────────
 
-def get_players(team_id=None, limit=500):
-    if STORAGE_BACKEND == 'json':
-        with _lock:
-            players = _load('players')
-        if team_id is not None:
-            players = [p for p in players if p.get('team_id') == team_id]
-        players.sort(key=lambda p: p['id'])
-        return players[:limit]
-    from models import Player
-    q = Player.query
-    if team_id is not None:
-        q = q.filter_by(team_id=team_id)
-    return [_player_dict(p) for p in q.order_by(Player.id).all()]
+def get_player_by_id(player_id):
+    return backend().get_player_by_id(player_id)
+
+
+def iter_players(team_id=None, batch=500):
+    """Yield every matching player in id order, fetching batch rows at a time."""
+    after = 0
+    while True:
+        rows = get_players(team_id=team_id, limit=batch, after=after)
+        yield from rows
+        if len(rows) < batch:
+            return
+        after = rows[-1]['id']
 
 
 def search_players(q_str, team_id=None, limit=200):
-    if STORAGE_BACKEND == 'json':
-        with _lock:
-            players = _load('players')
-        if team_id is not None:
-            players = [p for p in players if p.get('team_id') == team_id]
-        if q_str:
-            players = [p for p in players if q_str.lower() in (p.get('name') or '').lower()]
-        players.sort(key=lambda p: p['id'])
-        return players[:limit]
-    from models import Player
-    q = Player.query
-    if team_id is not None:
-        q = q.filter_by(team_id=int(team_id))
-    if q_str:
-        q = q.filter(Player.name.ilike(f'%{q_str}%'))
-    return [_player_dict(p) for p in q.order_by(Player.id).limit(limit).all()]
+    """Players whose name matches q_str, best match first (see namesearch.py).
+
+    Without a query, players in id order. JSON mode looks candidates up in the
+    name indexes; SQL mode ranks with pg_trgm on PostgreSQL (GIN index from
+    migration 0004) and falls back to prefix / substring matches elsewhere;
+    SQLite mode matches prefixes / substrings in SQL and ranks fuzzy matches
+    with namesearch.
+    """
+    return backend().search_players(namesearch.normalize(q_str), team_id=team_id, limit=limit)
 
 
 def add_player(name, team_id):
-    if STORAGE_BACKEND == 'json':
-        with _lock:
-            players = _load('players')
-            new_player = {
-                'id': _next_id(players), 'name': name, 'team_id': team_id,
-                'Singles': 0, 'Doubles': 0, 'Triples': 0, 'Dimes': 0, 'HRs': 0,
-                'Avg': 0.0, 'GP': 0, 'AtBats': 0, 'hits': 0,
-            }
-            players.append(new_player)
-            _save('players', players)
-        return new_player
-    from models import db, Player
-    p = Player(name=name, team_id=team_id, Singles=0, Doubles=0, Triples=0,
-               Dimes=0, HRs=0, Avg=0.0, GP=0, AtBats=0)
-    db.session.add(p)
-    db.session.commit()
-    return {'id': p.id, 'name': p.name, 'team_id': p.team_id}
+    """Create a player with zeroed stats. Returns a dict with at least id, name and team_id."""
+    return backend().add_player(name, team_id)
+
+
+STAT_FIELDS = ('Singles', 'Doubles', 'Triples', 'Dimes', 'HRs', 'AtBats')
+HIT_FIELDS = ('Singles', 'Doubles', 'Triples', 'HRs')
+
+
+def _player_changes(current, increments):
+    """Field values after applying one game's increments to current (a player dict).
+
+    Increments GP by 1, recomputes hits and Avg (unrounded), applies 'name' if given.
+    """
+    changes = {}
+    for field in STAT_FIELDS:
+        changes[field] = (current.get(field) or 0) + increments.get(field, 0)
+    hits_inc = sum(increments.get(f, 0) for f in HIT_FIELDS)
+    changes['hits'] = (current.get('hits') or 0) + hits_inc
+    changes['GP'] = (current.get('GP') or 0) + 1
+    ab = changes['AtBats']
+    changes['Avg'] = float(changes['hits']) / ab if ab > 0 else 0.0
+    if 'name' in increments:
+        changes['name'] = increments['name']
+    return changes
 
 
 def update_player(player_id, increments):
@@ -200,99 +174,65 @@ def update_player(player_id, increments):
     Increments GP by 1 per call. Recomputes hits and Avg.
     Returns updated player dict or None if not found.
     """
-    if STORAGE_BACKEND == 'json':
-        with _lock:
-            players = _load('players')
-            player = next((p for p in players if p['id'] == player_id), None)
-            if player is None:
-                return None
-            for field in ('Singles', 'Doubles', 'Triples', 'Dimes', 'HRs', 'AtBats'):
-                player[field] = (player.get(field) or 0) + increments.get(field, 0)
-            hits_inc = sum(increments.get(f, 0) for f in ('Singles', 'Doubles', 'Triples', 'HRs'))
-            player['hits'] = (player.get('hits') or 0) + hits_inc
-            player['GP'] = (player.get('GP') or 0) + 1
-            ab = player.get('AtBats') or 0
-            player['Avg'] = round(float(player['hits']) / ab, 3) if ab > 0 else 0.0
-            if 'name' in increments:
-                player['name'] = increments['name']
-            _save('players', players)
-        return player
-    from models import db, Player
-    player = Player.query.get(player_id)
-    if player is None:
+    try:
+        return update_players([(player_id, increments)])[0]
+    except LookupError:
         return None
-    for field in ('Singles', 'Doubles', 'Triples', 'Dimes', 'HRs', 'AtBats'):
-        setattr(player, field, (getattr(player, field, 0) or 0) + increments.get(field, 0))
-    hits_inc = sum(increments.get(f, 0) for f in ('Singles', 'Doubles', 'Triples', 'HRs'))
-    player.hits = (player.hits or 0) + hits_inc
-    player.GP = (player.GP or 0) + 1
-    ab = player.AtBats or 0
-    player.Avg = float(player.hits) / ab if ab > 0 else 0.0
-    if 'name' in increments:
-        player.name = increments['name']
-    db.session.add(player)
-    db.session.commit()
-    return _player_dict(player)
 
 
-def _player_dict(p):
-    return {
-        'id': p.id, 'name': p.name, 'team_id': p.team_id,
-        'Singles': p.Singles, 'Doubles': p.Doubles, 'Triples': p.Triples,
-        'Dimes': p.Dimes, 'HRs': p.HRs, 'GP': p.GP,
-        'AtBats': p.AtBats, 'Avg': p.Avg, 'hits': p.hits or 0,
-    }
+def update_players(updates):
+    """Apply several players' increments as one atomic change.
+
+    updates: list of (player_id, increments) pairs, increments as for update_player.
+    Either every update is applied (one SQL transaction / one journal entry) or
+    none is: raises LookupError(missing_ids) if any player does not exist.
+    Returns the updated player dicts in input order.
+    """
+    return backend().update_players(updates)
+
+
+def get_rosters():
+    """Return every team (ordered by id) with its players nested under 'players'.
+
+    One pass over the store in JSON mode; one teams LEFT JOIN players query in
+    the SQL engines, grouped in Python.
+    """
+    return backend().get_rosters()
 
 
 # ── Results ───────────────────────────────────────────────────────────────────
 
-def get_results(date=None, team_id=None, limit=500):
+def get_results(date=None, team_id=None, limit=500, after=None, season_id=None):
     """Return enriched result dicts including team1_name and team2_name.
 
+    Ordered by date descending, then game_number and id ascending.
     date: Python date object or None (routes.py handles parsing / error responses).
+    after: keyset cursor — the (date, game_number, id) of the last row already
+    seen (date as an ISO string); only rows that sort after it are returned.
+    season_id: season to read; None means the active season.
     """
-    if STORAGE_BACKEND == 'json':
-        date_str = date.isoformat() if date else None
-        with _lock:
-            results = list(_load('results'))
-            teams = _load('teams')
-        teams_map = {t['id']: t.get('name', f"Team {t['id']}") for t in teams}
-        if date_str:
-            results = [r for r in results if r.get('date') == date_str]
-        if team_id is not None:
-            results = [r for r in results
-                       if r.get('team1_id') == team_id or r.get('team2_id') == team_id]
-        # date descending, game_number ascending
-        results.sort(key=lambda r: (r.get('date', ''), -r.get('game_number', 0)), reverse=True)
-        results = results[:limit]
-        return [
-            {**r,
-             'team1_name': teams_map.get(r.get('team1_id')),
-             'team2_name': teams_map.get(r.get('team2_id'))}
-            for r in results
-        ]
-    from models import Team, Result
-    q = Result.query
-    if date is not None:
-        q = q.filter(Result.date == date)
-    if team_id is not None:
-        q = q.filter((Result.team1_id == team_id) | (Result.team2_id == team_id))
-    rows = q.order_by(Result.date.desc(), Result.game_number.asc()).limit(limit).all()
-    teams_map = {t.id: (t.name or f"Team {t.id}") for t in Team.query.all()}
-    return [
-        {
-            'id': r.id,
-            'date': r.date.isoformat() if r.date else None,
-            'game_number': r.game_number,
-            'team1_id': r.team1_id,
-            'team1_name': teams_map.get(r.team1_id),
-            'team2_id': r.team2_id,
-            'team2_name': teams_map.get(r.team2_id),
-            'team1_score': r.team1_score,
-            'team2_score': r.team2_score,
-        }
-        for r in rows
-    ]
+    return backend().get_results(date=date, team_id=team_id, limit=limit, after=after,
+                                 season_id=season_id)
+
+
+def results_cursor(r):
+    """Keyset cursor (date, game_number, id) for a row returned by get_results."""
+    return (r.get('date'), r.get('game_number'), r['id'])
+
+
+def iter_results(date=None, team_id=None, batch=500, season_id=None):
+    """Yield every matching result in get_results order, batch rows per query.
+
+    Each batch is its own short keyset range read, so a long stream holds
+    neither the store lock nor an open transaction between batches.
+    """
+    after = None
+    while True:
+        rows = get_results(date=date, team_id=team_id, limit=batch, after=after, season_id=season_id)
+        yield from rows
+        if len(rows) < batch:
+            return
+        after = results_cursor(rows[-1])
 
 
 def add_results(date, team1_id, team2_id, games):
@@ -302,64 +242,153 @@ def add_results(date, team1_id, team2_id, games):
     games:  list of dicts with game_number, team1_score, team2_score.
     Returns list of created record dicts.
     """
-    date_str = date.isoformat()
-    if STORAGE_BACKEND == 'json':
-        with _lock:
-            results = _load('results')
-            created = []
-            for g in games:
-                new_result = {
-                    'id': _next_id(results),
-                    'date': date_str,
-                    'game_number': g['game_number'],
-                    'team1_id': team1_id,
-                    'team2_id': team2_id,
-                    'team1_score': g['team1_score'],
-                    'team2_score': g['team2_score'],
-                }
-                results.append(new_result)
-                created.append(dict(new_result))
-            _save('results', results)
-        return created
-    from models import db, Result
-    to_create = [
-        Result(
-            date=date,
-            game_number=g['game_number'],
-            team1_id=team1_id,
-            team2_id=team2_id,
-            team1_score=g['team1_score'],
-            team2_score=g['team2_score'],
-        )
-        for g in games
-    ]
-    db.session.add_all(to_create)
-    db.session.commit()
-    return [
-        {
-            'id': r.id,
-            'date': r.date.isoformat(),
-            'game_number': r.game_number,
-            'team1_id': r.team1_id,
-            'team2_id': r.team2_id,
-            'team1_score': r.team1_score,
-            'team2_score': r.team2_score,
-        }
-        for r in to_create
-    ]
+    return backend().add_results(date, team1_id, team2_id, games)
+
+
+def all_results(season_id=None):
+    """Return every result of a season (default: active) as a plain dict, oldest first.
+
+    Used by the server-side aggregates to (re)build their running totals.
+    """
+    return backend().all_results(season_id=season_id)
+
+
+def results_fingerprint():
+    """Return (season_id, count, max_id) for the active season's results.
+
+    Changes whenever any process adds results or a season is closed.
+    """
+    return backend().results_fingerprint()
+
+
+def _notify_results(created):
+    """Fold freshly committed results into the in-process aggregates and the live feed."""
+    import standings, h2h, events
+    standings.apply_results(created)
+    h2h.apply_results(created)
+    events.publish('result', created)
+
+
+def _notify_players(updated=(), deleted_ids=()):
+    """Fold committed player changes into the in-process aggregates and the live feed."""
+    import leaders, events
+    leaders.apply_players(updated=updated, deleted_ids=deleted_ids)
+    events.publish('player', updated, deleted_ids)
+
+
+def _notify_teams(updated=(), deleted_ids=()):
+    """Push committed team changes to the live feed."""
+    import events
+    events.publish('team', updated, deleted_ids)
+
+
+def _notify_committed():
+    """Schedule a static publish (debounced; a no-op unless PUBLISH_DIR is set)
+    and count the commit for the live feed."""
+    import publisher, events
+    publisher.schedule()
+    events.committed()
+
+
+# ── Matches ───────────────────────────────────────────────────────────────────
+
+def match_record(team1_id, team2_id, games):
+    """Derive {team_id: (wins, losses)} for both teams from game scores (ties count for neither)."""
+    t1_wins = sum(1 for g in games if g['team1_score'] > g['team2_score'])
+    t2_wins = sum(1 for g in games if g['team2_score'] > g['team1_score'])
+    return {team1_id: (t1_wins, t2_wins), team2_id: (t2_wins, t1_wins)}
+
+
+def record_match(key, date, team1_id, team2_id, games, player_updates):
+    """Record a whole match atomically: result rows, both team records and player lines.
+
+    key:            client-supplied idempotency key. If a match was already
+                    recorded under it, nothing is written and the original
+                    outcome is returned.
+    date, games:    as for add_results.
+    player_updates: list of (player_id, increments) pairs, as for update_players.
+
+    Returns (match, replayed) where match is
+    {'key', 'results': [...], 'teams': [...], 'players': [...]}.
+    Raises LookupError(('teams'|'players', missing_ids)) before writing anything
+    if a team or player does not exist.
+    """
+    return backend().record_match(key, date, team1_id, team2_id, games, player_updates)
+
+
+# ── Seasons ───────────────────────────────────────────────────────────────────
+
+TEAM_COUNTERS = {'wins': 0, 'losses': 0, 'win_pct': 0.0, 'games_behind': 0.0, 'games_played': 0}
+PLAYER_COUNTERS = {**{f: 0 for f in STAT_FIELDS}, 'hits': 0, 'GP': 0, 'Avg': 0.0}
+
+
+def active_season():
+    """The season new results are recorded in, as a dict (no snapshot).
+
+    SQL mode re-reads it only when data_version() moves.
+    """
+    return backend().active_season()
+
+
+def get_seasons():
+    """Every season in id order, without snapshots."""
+    return backend().get_seasons()
+
+
+def get_season(season_id):
+    """Season dict (no snapshot) or None."""
+    return backend().get_season(season_id)
+
+
+def get_season_snapshot(season_id):
+    """Frozen snapshot dict of a closed season, or None (unknown or still active)."""
+    return backend().get_season_snapshot(season_id)
+
+
+def close_season(build_snapshot, next_name=None, closed_on=None, retries=3):
+    """Close the active season and open the next one, atomically.
+
+    build_snapshot: callable returning the closed season's snapshot (a JSON-able
+                    dict); it runs against the data being closed.
+    In one change the active season is marked closed with the snapshot
+    attached, a new active season is created, and every team's record and
+    player's counters are reset to zero (rosters carry over). Returns
+    (closed, opened) season dicts.
+
+    JSON and SQLite build the snapshot while holding the write lock. SQL mode
+    is optimistic: if any other write commits while the snapshot is being
+    built, the close is retried (RuntimeError after `retries` attempts).
+    """
+    return backend().close_season(build_snapshot, next_name=next_name,
+                                  closed_on=closed_on or datetime.date.today(), retries=retries)
+
+
+def _season_dict(s):
+    if isinstance(s, dict):
+        return {k: s.get(k) for k in ('id', 'name', 'status', 'started_on', 'closed_on')}
+    return {
+        'id': s.id, 'name': s.name, 'status': s.status,
+        'started_on': s.started_on.isoformat() if s.started_on else None,
+        'closed_on': s.closed_on.isoformat() if s.closed_on else None,
+    }
+
+
+# ── Data version ──────────────────────────────────────────────────────────────
+
+def data_version():
+    """Monotonic counter bumped by every committed mutation, in any process.
+
+    JSON mode: the journal sequence number. SQL mode: the data_version row,
+    re-read at most every DATA_VERSION_TTL seconds per worker (immediately
+    after this worker's own writes). SQLite mode: the data_version row, read
+    every time (a local read).
+    """
+    return backend().data_version()
 
 
 # ── Admin / health ────────────────────────────────────────────────────────────
 
-def json_status():
-    """Return file existence and record counts for each JSON data file."""
-    status = {}
-    for entity in ('teams', 'players', 'results'):
-        path = os.path.join(DATA_DIR, f'{entity}.json')
-        try:
-            with open(path) as f:
-                data = json.load(f)
-            status[entity] = {'exists': True, 'count': len(data)}
-        except Exception as e:
-            status[entity] = {'exists': False, 'error': str(e)}
-    return status
+def status():
+    """Engine-specific health details for /routes/admin/db_status."""
+    return backend().status()
+
@@ -0,0 +1,440 @@
+"""
+storage_json.py — STORAGE_BACKEND=json engine: JSON files in storage.DATA_DIR.
+
+Implements the storage.py backend protocol on the resident, journaled tables
+of jsonstore.py. Use it through storage.py, not directly.
+"""
+
+import bisect
+import contextlib
+import copy
+import math
+import os
+import threading
+
+import jsonstore
+import metrics
+import namesearch
+import storage
+
+# locking:
+#   _lock        short in-process lock around the resident tables; readers take
+#                only this, so they never wait on disk I/O or other processes
+#   _write_lock  serializes writers in this process; jsonstore.file_lock then
+#                serializes them across gunicorn workers
+_lock = metrics.TimedLock('storage')   # readers' in-memory lock; wait time is exported
+_write_lock = threading.Lock()
+
+# a league that has never closed a season is implicitly in season 1
+_DEFAULT_SEASON = {'id': jsonstore.DEFAULT_SEASON_ID, 'name': 'Season 1', 'status': 'active',
+                   'started_on': None, 'closed_on': None}
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _table(entity):
+    """Resident indexed table for entity (see jsonstore.py). Call with _lock held."""
+    return jsonstore.store(storage.DATA_DIR).tables[entity]
+
+
+@contextlib.contextmanager
+def transaction():
+    """Exclusive writer section across threads and processes.
+
+    Yields the Store caught up with every other worker's journal, so a
+    read-modify-write inside the block cannot lose a concurrent update.
+    """
+    with _write_lock, jsonstore.file_lock(storage.DATA_DIR):
+        with _lock:
+            store = jsonstore.store(storage.DATA_DIR)
+        yield store
+
+
+def _commit(store, *ops):
+    """Journal one atomic change (jsonstore.put / jsonstore.delete ops) inside transaction()."""
+    store.commit(list(ops), _lock)
+    jsonstore.start_compactor(storage.DATA_DIR, transaction, _lock)
+    storage._notify_committed()
+
+
+def _by_id(r):
+    return r['id']
+
+
+def _active_season(store=None):
+    """Active season record. Call with _lock held, or pass the writer's store."""
+    table = (store or jsonstore.store(storage.DATA_DIR)).tables['seasons']
+    active = table.lookup('status', 'active')
+    return active[-1] if active else _DEFAULT_SEASON
+
+
+# ── Teams ─────────────────────────────────────────────────────────────────────
+
+def get_teams():
+    with _lock:
+        return [dict(t) for t in _table('teams').all()]
+
+
+def get_team_by_id(team_id):
+    with _lock:
+        team = _table('teams').get(team_id)
+        return dict(team) if team else None
+
+
+def add_team(name):
+    with transaction() as store:
+        new_team = {
+            'id': store.tables['teams'].next_id(), 'name': name,
+            'wins': 0, 'losses': 0,
+            'win_pct': 0.0, 'games_behind': 0.0, 'games_played': 0,
+        }
+        _commit(store, jsonstore.put('teams', new_team))
+    storage._notify_teams(updated=[new_team])
+    return dict(new_team)
+
+
+def update_team_record(team_id, wins_inc, losses_inc, games_behind=None):
+    with transaction() as store:
+        team = store.tables['teams'].get(team_id)
+        if team is None:
+            return None
+        changes = storage._team_record_changes(team, wins_inc, losses_inc, games_behind)
+        changes['win_pct'] = round(changes['win_pct'], 3)
+        team = {**team, **changes}
+        _commit(store, jsonstore.put('teams', team))
+    storage._notify_teams(updated=[team])
+    return dict(team)
+
+
+def delete_team(team_id):
+    with transaction() as store:
+        team = store.tables['teams'].get(team_id)
+        if team is None:
+            return None
+        player_ids = [p['id'] for p in store.tables['players'].lookup('team_id', team_id)]
+        _commit(store, jsonstore.delete('teams', team_id),
+                *[jsonstore.delete('players', pid) for pid in player_ids])
+    storage._notify_teams(deleted_ids=[team_id])
+    storage._notify_players(deleted_ids=player_ids)
+    return dict(team)
+
+
+# ── Players ───────────────────────────────────────────────────────────────────
+
+def get_players(team_id=None, limit=500, after=None):
+    with _lock:
+        players = _table('players')
+        if team_id is not None:
+            rows = players.lookup('team_id', team_id)
+        else:
+            rows = players.ordered(_by_id)
+        start = bisect.bisect_right(rows, after, key=_by_id) if after is not None else 0
+        end = start + limit if limit is not None else None
+        return [dict(p) for p in rows[start:end]]
+
+
+def get_player_by_id(player_id):
+    with _lock:
+        player = _table('players').get(player_id)
+        return dict(player) if player else None
+
+
+def search_players(query, team_id=None, limit=200):
+    """Candidates come from the name indexes (query already normalized)."""
+    with _lock:
+        players = _table('players')
+        if not query:
+            if team_id is not None:
+                rows = players.lookup('team_id', team_id)
+            else:
+                rows = players.ordered(_by_id)
+            return [dict(p) for p in rows[:limit]]
+        found, seen = [], set()
+        for index in ('name', 'name_words'):
+            for pid in players.prefix_scan(index, query):
+                if len(found) >= limit:
+                    break
+                p = players.get(pid)
+                if pid not in seen and (team_id is None or p.get('team_id') == team_id):
+                    seen.add(pid)
+                    found.append(p)
+        if len(found) < limit and len(query) >= namesearch.MIN_FUZZY:
+            found.extend(_name_matches(players, query, team_id, seen)[:limit - len(found)])
+        return [dict(p) for p in found]
+
+
+def _name_matches(players, query, team_id, seen):
+    """Tier 2 (substring) search matches from the trigram postings or, if there are
+    none, tier 3 (fuzzy) ones. Ranked, excluding ids in seen."""
+    postings = players.indexes['name_trigram']
+    grams = namesearch.trigrams(query)
+    required = sorted((postings.get(g, set()) for g in namesearch.substring_grams(query)), key=len)
+    candidates = required[0].intersection(*required[1:]) - seen if required else set()
+    ranked = _rank_names(players, query, None, team_id, candidates)
+    if ranked or seen:
+        return ranked
+    # nothing matches literally: fall back to typo-tolerant matches. A name at
+    # the similarity threshold shares at least `need` of the query's trigrams,
+    # so it shares one of the len(grams) - need + 1 rarest; probe only those
+    # postings, then drop candidates with too few shared trigrams before the
+    # exact similarity.
+    need = math.ceil(namesearch.SIMILARITY * len(grams))
+    by_size = sorted(grams, key=lambda g: len(postings.get(g, ())))
+    candidates = set()
+    for gram in by_size[:len(grams) - need + 1]:
+        candidates.update(postings.get(gram, ()))
+    sets = [postings.get(g, set()) for g in grams]
+    candidates = {pid for pid in candidates if sum(pid in ids for ids in sets) >= need}
+    return _rank_names(players, query, grams, team_id, candidates)
+
+
+def _rank_names(players, query, grams, team_id, candidates):
+    ranked = []
+    for pid in candidates:
+        p = players.get(pid)
+        if team_id is not None and p.get('team_id') != team_id:
+            continue
+        key = namesearch.rank(query, p.get('name'), grams)
+        if key is not None:
+            ranked.append((key, pid, p))
+    ranked.sort(key=lambda e: e[:2])
+    return [p for _, _, p in ranked]
+
+
+def add_player(name, team_id):
+    with transaction() as store:
+        new_player = {
+            'id': store.tables['players'].next_id(), 'name': name, 'team_id': team_id,
+            'Singles': 0, 'Doubles': 0, 'Triples': 0, 'Dimes': 0, 'HRs': 0,
+            'Avg': 0.0, 'GP': 0, 'AtBats': 0, 'hits': 0,
+        }
+        _commit(store, jsonstore.put('players', new_player))
+        new_player = dict(new_player)
+    storage._notify_players(updated=[new_player])
+    return new_player
+
+
+def update_players(updates):
+    ids = [pid for pid, _ in updates]
+    with transaction() as store:
+        table = store.tables['players']
+        missing = [pid for pid in ids if table.get(pid) is None]
+        if missing:
+            raise LookupError(missing)
+        pending = {}
+        for pid, increments in updates:
+            current = pending.get(pid) or table.get(pid)
+            changes = storage._player_changes(current, increments)
+            changes['Avg'] = round(changes['Avg'], 3)
+            pending[pid] = {**current, **changes}
+        _commit(store, *(jsonstore.put('players', p) for p in pending.values()))
+        updated = [dict(pending[pid]) for pid in ids]
+    storage._notify_players(updated=updated)
+    return updated
+
+
+def get_rosters():
+    """One pass over the store."""
+    with _lock:
+        players = _table('players')
+        return [
+            {**t, 'players': [dict(p) for p in players.lookup('team_id', t['id'])]}
+            for t in sorted(_table('teams').all(), key=lambda t: t['id'])
+        ]
+
+
+# ── Results ───────────────────────────────────────────────────────────────────
+
+def get_results(date=None, team_id=None, limit=500, after=None, season_id=None):
+    with _lock:
+        teams = _table('teams')
+        sid = season_id if season_id is not None else _active_season()['id']
+        # filtered column-wise; only the page's rows are built as dicts
+        results = _table('results').select(season=sid, date=date, team_id=team_id,
+                                           after=after, limit=limit)
+
+        def name(tid):
+            t = teams.get(tid)
+            return t.get('name', f"Team {tid}") if t else None
+
+        for r in results:
+            r['team1_name'] = name(r.get('team1_id'))
+            r['team2_name'] = name(r.get('team2_id'))
+        return results
+
+
+def add_results(date, team1_id, team2_id, games):
+    with transaction() as store:
+        created = _new_results(store, date.isoformat(), team1_id, team2_id, games)
+        _commit(store, *(jsonstore.put('results', r) for r in created))
+        created = [dict(r) for r in created]
+    storage._notify_results(created)
+    return created
+
+
+def _new_results(store, date_str, team1_id, team2_id, games):
+    """Build result records with fresh ids in the active season (inside transaction())."""
+    next_id = store.tables['results'].next_id()
+    season_id = _active_season(store)['id']
+    return [
+        {
+            'id': next_id + i,
+            'season_id': season_id,
+            'date': date_str,
+            'game_number': g['game_number'],
+            'team1_id': team1_id,
+            'team2_id': team2_id,
+            'team1_score': g['team1_score'],
+            'team2_score': g['team2_score'],
+        }
+        for i, g in enumerate(games)
+    ]
+
+
+def all_results(season_id=None):
+    with _lock:
+        sid = season_id if season_id is not None else _active_season()['id']
+        return _table('results').select(season=sid, order='chrono')
+
+
+def results_fingerprint():
+    with _lock:
+        results = _table('results')
+        sid = _active_season()['id']
+        count = results.count(season=sid)
+        # new results only ever go into the active season, so its newest
+        # result is the newest overall
+        return (sid, count, results.max_id if count else None)
+
+
+# ── Matches ───────────────────────────────────────────────────────────────────
+
+def record_match(key, date, team1_id, team2_id, games, player_updates):
+    record = storage.match_record(team1_id, team2_id, games)
+    with transaction() as store:
+        prior = store.tables['matches'].lookup('key', key)
+        if prior:
+            return copy.deepcopy(prior[0]['response']), True
+        teams_tbl, players_tbl = store.tables['teams'], store.tables['players']
+        missing = [tid for tid in (team1_id, team2_id) if teams_tbl.get(tid) is None]
+        if missing:
+            raise LookupError(('teams', missing))
+        missing = [pid for pid, _ in player_updates if players_tbl.get(pid) is None]
+        if missing:
+            raise LookupError(('players', missing))
+
+        created = _new_results(store, date.isoformat(), team1_id, team2_id, games)
+        teams = []
+        for tid in (team1_id, team2_id):
+            changes = storage._team_record_changes(teams_tbl.get(tid), *record[tid])
+            changes['win_pct'] = round(changes['win_pct'], 3)
+            teams.append({**teams_tbl.get(tid), **changes})
+        players = {}
+        for pid, increments in player_updates:
+            current = players.get(pid) or players_tbl.get(pid)
+            changes = storage._player_changes(current, increments)
+            changes['Avg'] = round(changes['Avg'], 3)
+            players[pid] = {**current, **changes}
+        match = {
+            'key': key,
+            'results': created,
+            'teams': teams,
+            'players': [players[pid] for pid, _ in player_updates],
+        }
+        _commit(store,
+                *(jsonstore.put('results', r) for r in created),
+                *(jsonstore.put('teams', t) for t in teams),
+                *(jsonstore.put('players', p) for p in players.values()),
+                jsonstore.put('matches', {'id': store.tables['matches'].next_id(),
+                                          'key': key, 'response': match}))
+        match = copy.deepcopy(match)
+    storage._notify_results(match['results'])
+    storage._notify_teams(updated=match['teams'])
+    storage._notify_players(updated=match['players'])
+    return match, False
+
+
+# ── Seasons ───────────────────────────────────────────────────────────────────
+
+def active_season():
+    with _lock:
+        return storage._season_dict(_active_season())
+
+
+def get_seasons():
+    with _lock:
+        seasons = _table('seasons').ordered(_by_id)
+        return [storage._season_dict(s) for s in seasons] or [dict(_DEFAULT_SEASON)]
+
+
+def get_season(season_id):
+    with _lock:
+        season = _table('seasons').get(season_id)
+        if season is None and season_id == _DEFAULT_SEASON['id'] and not len(_table('seasons')):
+            season = _DEFAULT_SEASON
+        return storage._season_dict(season) if season else None
+
+
+def get_season_snapshot(season_id):
+    with _lock:
+        season = _table('seasons').get(season_id)
+        snapshot = season.get('snapshot') if season else None
+        return copy.deepcopy(snapshot) if snapshot is not None else None
+
+
+def close_season(build_snapshot, next_name=None, closed_on=None, retries=3):
+    """Runs inside the writer section, so nothing can change under the snapshot."""
+    with transaction() as store:
+        seasons = store.tables['seasons']
+        current = dict(_active_season(store))
+        if current.get('started_on') is None:
+            first = store.tables['results'].select(season=current['id'], order='chrono', limit=1)
+            current['started_on'] = first[0]['date'] if first else None
+        snapshot = build_snapshot()
+        closed = {**current, 'status': 'closed', 'closed_on': closed_on.isoformat(),
+                  'snapshot': snapshot}
+        new_id = max(seasons.next_id(), current['id'] + 1)
+        opened = {'id': new_id, 'name': next_name or f'Season {new_id}', 'status': 'active',
+                  'started_on': closed_on.isoformat(), 'closed_on': None}
+        _commit(store,
+                jsonstore.put('seasons', closed),
+                jsonstore.put('seasons', opened),
+                *(jsonstore.put('teams', {**t, **storage.TEAM_COUNTERS}) for t in store.tables['teams'].all()),
+                *(jsonstore.put('players', {**p, **storage.PLAYER_COUNTERS})
+                  for p in store.tables['players'].all()))
+    return storage._season_dict(closed), storage._season_dict(opened)
+
+
+# ── Data version / status ─────────────────────────────────────────────────────
+
+def data_version():
+    """The journal sequence number."""
+    with _lock:
+        return jsonstore.store(storage.DATA_DIR).seq
+
+
+def status():
+    """Snapshot file status, journal state and live record counts.
+
+    A missing snapshot is an error only for jsonstore.REQUIRED_ENTITIES; the
+    optional ones (matches, seasons) have none until the first compaction.
+    """
+    files = {}
+    for entity in jsonstore.ENTITIES:
+        path = os.path.join(storage.DATA_DIR, f'{entity}.json')
+        try:
+            files[entity] = {'exists': True, 'snapshot_bytes': os.path.getsize(path)}
+        except FileNotFoundError as e:
+            files[entity] = ({'exists': False, 'error': str(e)} if entity in jsonstore.REQUIRED_ENTITIES
+                             else {'exists': False, 'optional': True})
+        except Exception as e:
+            files[entity] = {'exists': False, 'error': str(e)}
+    try:
+        with _lock:
+            store = jsonstore.store(storage.DATA_DIR).status()
+        for entity, count in store.pop('counts').items():
+            files[entity]['count'] = count
+        files['journal'] = store
+    except Exception as e:
+        files['journal'] = {'error': str(e)}
+    return {'data_dir': storage.DATA_DIR, 'files': files}
@@ -0,0 +1,483 @@
+"""
+storage_sql.py — STORAGE_BACKEND=sql engine: SQLAlchemy (Cloud SQL PostgreSQL).
+
+Implements the storage.py backend protocol on the models.py tables, inside
+the Flask-SQLAlchemy session app.py sets up. Use it through storage.py, not
+directly.
+"""
+
+import contextlib
+import datetime
+import json
+import os
+import time
+
+import namesearch
+import storage
+
+# how long a worker trusts its last read of the data version before asking again
+DATA_VERSION_TTL = float(os.environ.get('DATA_VERSION_TTL', 1.0))
+_version_cache = {'value': None, 'at': 0.0}
+_season_cache = {'version': None, 'value': None}
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+@contextlib.contextmanager
+def transaction():
+    """Commit the session on success (bumping the data version), roll back on error."""
+    from models import db
+    try:
+        yield db.session
+        _bump_version()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def _team_dict(t):
+    return {
+        'id': t.id, 'name': t.name,
+        'wins': t.wins or 0, 'losses': t.losses or 0,
+        'win_pct': t.win_pct or 0.0,
+        'games_behind': t.games_behind or 0.0,
+        'games_played': t.games_played or 0,
+    }
+
+
+def _player_dict(p):
+    return {
+        'id': p.id, 'name': p.name, 'team_id': p.team_id,
+        'Singles': p.Singles, 'Doubles': p.Doubles, 'Triples': p.Triples,
+        'Dimes': p.Dimes, 'HRs': p.HRs, 'GP': p.GP,
+        'AtBats': p.AtBats, 'Avg': p.Avg, 'hits': p.hits or 0,
+    }
+
+
+def _result_dict(r):
+    return {
+        'id': r.id,
+        'season_id': r.season_id,
+        'date': r.date.isoformat() if r.date else None,
+        'game_number': r.game_number,
+        'team1_id': r.team1_id,
+        'team2_id': r.team2_id,
+        'team1_score': r.team1_score,
+        'team2_score': r.team2_score,
+    }
+
+
+def _active_season(fresh=False):
+    """Active Season row; fresh=True locks it so a concurrent close waits for this write."""
+    from models import Season
+    q = Season.query.filter_by(status='active').order_by(Season.id.desc())
+    if fresh:
+        q = q.with_for_update()
+    season = q.first()
+    if season is None:
+        raise RuntimeError('no active season; run `python -m migrations upgrade`')
+    return season
+
+
+# ── Teams ─────────────────────────────────────────────────────────────────────
+
+def get_teams():
+    from models import Team
+    return [_team_dict(t) for t in Team.query.all()]
+
+
+def get_team_by_id(team_id):
+    from models import Team
+    t = Team.query.get(team_id)
+    return _team_dict(t) if t else None
+
+
+def add_team(name):
+    from models import db, Team
+    with transaction():
+        t = Team(name=name, wins=0, losses=0, games_behind=0)
+        db.session.add(t)
+    storage._notify_teams(updated=[_team_dict(t)])
+    return {'id': t.id, 'name': t.name}
+
+
+def update_team_record(team_id, wins_inc, losses_inc, games_behind=None):
+    from models import Team
+    team = Team.query.get(team_id)
+    if team is None:
+        return None
+    with transaction():
+        changes = storage._team_record_changes(_team_dict(team), wins_inc, losses_inc, games_behind)
+        for field, value in changes.items():
+            setattr(team, field, value)
+    team = _team_dict(team)
+    storage._notify_teams(updated=[team])
+    return team
+
+
+def delete_team(team_id):
+    from models import db, Team, Player
+    team = Team.query.get(team_id)
+    if team is None:
+        return None
+    with transaction():
+        player_ids = [pid for (pid,) in Player.query.with_entities(Player.id).filter_by(team_id=team.id)]
+        Player.query.filter_by(team_id=team.id).delete()
+        db.session.delete(team)
+    storage._notify_teams(deleted_ids=[team_id])
+    storage._notify_players(deleted_ids=player_ids)
+    return {'id': team_id}
+
+
+# ── Players ───────────────────────────────────────────────────────────────────
+
+def get_players(team_id=None, limit=500, after=None):
+    """Without a cursor the listing is unbounded, as it always was."""
+    from models import Player
+    q = Player.query
+    if team_id is not None:
+        q = q.filter_by(team_id=team_id)
+    q = q.order_by(Player.id)
+    if after is not None:
+        q = q.filter(Player.id > after).limit(limit)
+    return [_player_dict(p) for p in q.all()]
+
+
+def get_player_by_id(player_id):
+    from models import Player
+    p = Player.query.get(player_id)
+    return _player_dict(p) if p else None
+
+
+def search_players(query, team_id=None, limit=200):
+    """pg_trgm on PostgreSQL (GIN index from migration 0004); prefix / substring
+    matches only elsewhere."""
+    from models import db, Player
+    q = Player.query
+    if team_id is not None:
+        q = q.filter_by(team_id=int(team_id))
+    if not query:
+        return [_player_dict(p) for p in q.order_by(Player.id).limit(limit).all()]
+    name = db.func.lower(Player.name)
+    pattern = namesearch.like_escape(query)
+    prefix = name.like(f'{pattern}%', escape='\\')
+    word_prefix = name.like(f'% {pattern}%', escape='\\')
+    substring = name.like(f'%{pattern}%', escape='\\')
+    tier = db.case((prefix, 0), (word_prefix, 1), else_=2)
+    fuzzy = len(query) >= namesearch.MIN_FUZZY
+    literal = q.filter(substring if fuzzy else db.or_(prefix, word_prefix))
+    rows = literal.order_by(tier, name, Player.id).limit(limit).all()
+    if not rows and fuzzy and db.engine.dialect.name == 'postgresql':
+        # nothing matches literally: typo-tolerant matches via pg_trgm, against
+        # the best-matching stretch of the name (pg_trgm.word_similarity_threshold)
+        similarity = db.func.word_similarity(query, name)
+        rows = (q.filter(db.literal(query).op('<%')(name))
+                .order_by(similarity.desc(), name, Player.id).limit(limit).all())
+    return [_player_dict(p) for p in rows]
+
+
+def add_player(name, team_id):
+    from models import db, Player
+    with transaction():
+        p = Player(name=name, team_id=team_id, Singles=0, Doubles=0, Triples=0,
+                   Dimes=0, HRs=0, Avg=0.0, GP=0, AtBats=0)
+        db.session.add(p)
+    storage._notify_players(updated=[_player_dict(p)])
+    return {'id': p.id, 'name': p.name, 'team_id': p.team_id}
+
+
+def update_players(updates):
+    from models import Player
+    ids = [pid for pid, _ in updates]
+    with transaction():
+        # one SELECT ... WHERE id IN (...) FOR UPDATE, one commit
+        rows = {p.id: p for p in Player.query.filter(Player.id.in_(set(ids))).with_for_update().all()}
+        missing = [pid for pid in ids if pid not in rows]
+        if missing:
+            raise LookupError(missing)
+        for pid, increments in updates:
+            player = rows[pid]
+            for field, value in storage._player_changes(_player_dict(player), increments).items():
+                setattr(player, field, value)
+    updated = [_player_dict(rows[pid]) for pid in ids]
+    storage._notify_players(updated=updated)
+    return updated
+
+
+def get_rosters():
+    """One teams LEFT JOIN players query, grouped here."""
+    from models import db, Team, Player
+    rows = (db.session.query(Team, Player)
+            .outerjoin(Player, Player.team_id == Team.id)
+            .order_by(Team.id, Player.id).all())
+    rosters = {}
+    for team, player in rows:
+        entry = rosters.get(team.id)
+        if entry is None:
+            entry = rosters[team.id] = {**_team_dict(team), 'players': []}
+        if player is not None:
+            entry['players'].append(_player_dict(player))
+    return list(rosters.values())
+
+
+# ── Results ───────────────────────────────────────────────────────────────────
+
+def get_results(date=None, team_id=None, limit=500, after=None, season_id=None):
+    from sqlalchemy.orm import aliased
+    from models import db, Team, Result
+    # team names come from the same statement: two LEFT JOINs on teams
+    team1, team2 = aliased(Team), aliased(Team)
+    q = (db.session.query(Result, team1.id, team1.name, team2.id, team2.name)
+         .outerjoin(team1, team1.id == Result.team1_id)
+         .outerjoin(team2, team2.id == Result.team2_id)
+         .filter(Result.season_id == (season_id if season_id is not None else active_season()['id'])))
+    if date is not None:
+        q = q.filter(Result.date == date)
+    if team_id is not None:
+        q = q.filter((Result.team1_id == team_id) | (Result.team2_id == team_id))
+    if after is not None:
+        a_date, a_game, a_id = after
+        tie = (Result.game_number > a_game) | ((Result.game_number == a_game) & (Result.id > a_id))
+        if a_date is None:
+            # a date-less row (only the JSON store has them; results.date is NOT
+            # NULL here) sorts last, so only its own group can follow it
+            q = q.filter(Result.date.is_(None) & tie)
+        else:
+            a_date = datetime.date.fromisoformat(a_date)
+            q = q.filter((Result.date < a_date) | ((Result.date == a_date) & tie))
+    rows = (q.order_by(Result.date.desc(), Result.game_number.asc(), Result.id.asc())
+            .limit(limit).all())
+
+    def name(tid, tname):
+        return (tname or f"Team {tid}") if tid is not None else None
+
+    return [
+        {
+            'id': r.id,
+            'season_id': r.season_id,
+            'date': r.date.isoformat() if r.date else None,
+            'game_number': r.game_number,
+            'team1_id': r.team1_id,
+            'team1_name': name(t1_id, t1_name),
+            'team2_id': r.team2_id,
+            'team2_name': name(t2_id, t2_name),
+            'team1_score': r.team1_score,
+            'team2_score': r.team2_score,
+        }
+        for r, t1_id, t1_name, t2_id, t2_name in rows
+    ]
+
+
+def add_results(date, team1_id, team2_id, games):
+    from models import db, Result
+    with transaction():
+        season_id = _active_season(fresh=True).id
+        to_create = [
+            Result(
+                season_id=season_id,
+                date=date,
+                game_number=g['game_number'],
+                team1_id=team1_id,
+                team2_id=team2_id,
+                team1_score=g['team1_score'],
+                team2_score=g['team2_score'],
+            )
+            for g in games
+        ]
+        db.session.add_all(to_create)
+    created = [_result_dict(r) for r in to_create]
+    storage._notify_results(created)
+    return created
+
+
+def all_results(season_id=None):
+    from models import Result
+    sid = season_id if season_id is not None else active_season()['id']
+    rows = (Result.query.filter(Result.season_id == sid)
+            .order_by(Result.date.asc(), Result.game_number.asc(), Result.id.asc()).all())
+    return [_result_dict(r) for r in rows]
+
+
+def results_fingerprint():
+    from models import db, Result
+    sid = active_season()['id']
+    count, max_id = (db.session.query(db.func.count(Result.id), db.func.max(Result.id))
+                     .filter(Result.season_id == sid).one())
+    return (sid, count, max_id)
+
+
+# ── Matches ───────────────────────────────────────────────────────────────────
+
+def record_match(key, date, team1_id, team2_id, games, player_updates):
+    from models import db, Team, Player, Result, MatchSubmission
+    from sqlalchemy.exc import IntegrityError
+    record = storage.match_record(team1_id, team2_id, games)
+    prior = MatchSubmission.query.filter_by(key=key).first()
+    if prior is not None:
+        return json.loads(prior.response), True
+    try:
+        with transaction():
+            teams = {t.id: t for t in Team.query.filter(Team.id.in_((team1_id, team2_id))).with_for_update().all()}
+            missing = [tid for tid in (team1_id, team2_id) if tid not in teams]
+            if missing:
+                raise LookupError(('teams', missing))
+            ids = [pid for pid, _ in player_updates]
+            players = {p.id: p for p in Player.query.filter(Player.id.in_(set(ids))).with_for_update().all()}
+            missing = [pid for pid in ids if pid not in players]
+            if missing:
+                raise LookupError(('players', missing))
+
+            season_id = _active_season(fresh=True).id
+            to_create = [
+                Result(season_id=season_id, date=date, game_number=g['game_number'],
+                       team1_id=team1_id, team2_id=team2_id,
+                       team1_score=g['team1_score'], team2_score=g['team2_score'])
+                for g in games
+            ]
+            db.session.add_all(to_create)
+            for tid in (team1_id, team2_id):
+                for field, value in storage._team_record_changes(_team_dict(teams[tid]), *record[tid]).items():
+                    setattr(teams[tid], field, value)
+            for pid, increments in player_updates:
+                for field, value in storage._player_changes(_player_dict(players[pid]), increments).items():
+                    setattr(players[pid], field, value)
+            db.session.flush()
+
+            match = {
+                'key': key,
+                'results': [_result_dict(r) for r in to_create],
+                'teams': [_team_dict(teams[tid]) for tid in (team1_id, team2_id)],
+                'players': [_player_dict(players[pid]) for pid in ids],
+            }
+            db.session.add(MatchSubmission(key=key, response=json.dumps(match)))
+    except IntegrityError:
+        # a concurrent request recorded the same key first
+        prior = MatchSubmission.query.filter_by(key=key).first()
+        if prior is None:
+            raise
+        return json.loads(prior.response), True
+    storage._notify_results(match['results'])
+    storage._notify_teams(updated=match['teams'])
+    storage._notify_players(updated=match['players'])
+    return match, False
+
+
+# ── Seasons ───────────────────────────────────────────────────────────────────
+
+def active_season():
+    """Re-read only when data_version() moves."""
+    version = data_version()
+    if _season_cache['version'] != version or _season_cache['value'] is None:
+        _season_cache['value'] = storage._season_dict(_active_season())
+        _season_cache['version'] = version
+    return _season_cache['value']
+
+
+def get_seasons():
+    from models import Season
+    return [storage._season_dict(s) for s in Season.query.order_by(Season.id).all()]
+
+
+def get_season(season_id):
+    from models import Season
+    s = Season.query.get(season_id)
+    return storage._season_dict(s) if s else None
+
+
+def get_season_snapshot(season_id):
+    from models import db, Season
+    snapshot = db.session.query(Season.snapshot).filter(Season.id == season_id).scalar()
+    return json.loads(snapshot) if snapshot else None
+
+
+def close_season(build_snapshot, next_name=None, closed_on=None, retries=3):
+    """Optimistic: if any other write commits while the snapshot is being built,
+    the close is retried (RuntimeError after `retries` attempts)."""
+    from models import db, Season, Team, Player, Result, DataVersion
+    for _ in range(retries):
+        _version_cache['value'] = None
+        version = data_version()
+        try:
+            current = _active_season(fresh=True)
+            if current.started_on is None:
+                current.started_on = (db.session.query(db.func.min(Result.date))
+                                      .filter(Result.season_id == current.id).scalar())
+            snapshot = build_snapshot()
+            current.status = 'closed'
+            current.closed_on = closed_on
+            current.snapshot = json.dumps(snapshot)
+            # name is NOT NULL: the default one needs the new id, set after the flush
+            opened = Season(name=next_name or '', status='active', started_on=closed_on)
+            db.session.add(opened)
+            Team.query.update(storage.TEAM_COUNTERS, synchronize_session=False)
+            Player.query.update(storage.PLAYER_COUNTERS, synchronize_session=False)
+            db.session.flush()
+            if not next_name:
+                opened.name = f'Season {opened.id}'
+            bumped = (DataVersion.query.filter_by(id=1, version=version)
+                      .update({DataVersion.version: DataVersion.version + 1}))
+            if version and not bumped:
+                db.session.rollback()   # something was written while we snapshotted
+                continue
+            if not bumped:
+                db.session.add(DataVersion(id=1, version=1))
+            db.session.info['data_changed'] = True
+            _install_commit_hooks()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        _version_cache['value'] = None
+        return storage._season_dict(current), storage._season_dict(opened)
+    raise RuntimeError('data kept changing while the season was being closed; try again')
+
+
+# ── Data version / status ─────────────────────────────────────────────────────
+
+def _bump_version():
+    """Increment the data version inside the current transaction (before commit)."""
+    from models import db, DataVersion
+    bumped = DataVersion.query.filter_by(id=1).update({DataVersion.version: DataVersion.version + 1})
+    if not bumped:
+        db.session.add(DataVersion(id=1, version=1))
+    _version_cache['value'] = None
+    # tell the static publisher once this transaction actually commits
+    db.session.info['data_changed'] = True
+    _install_commit_hooks()
+
+
+def _after_commit(session):
+    if session.info.pop('data_changed', False):
+        storage._notify_committed()
+
+
+def _after_rollback(session):
+    session.info.pop('data_changed', None)
+
+
+def _install_commit_hooks():
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+    if not event.contains(Session, 'after_commit', _after_commit):
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
+
+
+def data_version():
+    """The data_version row, re-read at most every DATA_VERSION_TTL seconds per
+    worker (immediately after this worker's own writes)."""
+    now = time.monotonic()
+    if _version_cache['value'] is not None and now - _version_cache['at'] < DATA_VERSION_TTL:
+        return _version_cache['value']
+    from models import DataVersion
+    row = DataVersion.query.get(1)
+    _version_cache['value'] = row.version if row else 0
+    _version_cache['at'] = now
+    return _version_cache['value']
+
+
+def status():
+    """Dialect and data version (routes.admin_db_status adds the connection checks)."""
+    from models import db
+    return {'dialect': db.engine.dialect.name, 'data_version': data_version()}
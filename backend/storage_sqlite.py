@@ -0,0 +1,656 @@
+"""
+storage_sqlite.py — STORAGE_BACKEND=sqlite engine: an embedded SQLite file.
+
+Implements the storage.py backend protocol with the stdlib sqlite3 module,
+no ORM and no database server. The file (SQLITE_PATH, default
+backend/data/league.db) has the same schema as the SQL backend: the first
+connection in each process applies any pending migrations/ to it, so it also
+has the same indexes, and export_to_json.py can dump or fill it like any
+other database (sqlite:///SQLITE_PATH).
+
+  * WAL journal: readers never block the writer or each other, and a commit
+    is one sequential append (synchronous=NORMAL: durable at checkpoints,
+    never corrupt).
+  * Connections come from a small per-process pool (POOL_SIZE kept open), not
+    one per thread: under gevent a thread-local is per greenlet, and every
+    request would open a fresh connection with cold caches. Every query is a
+    constant string below, so sqlite3's per-connection statement cache
+    prepares each one once.
+  * Writes run in BEGIN IMMEDIATE transactions: the write lock is taken up
+    front, so a read-modify-write cannot lose an update and two writers
+    cannot deadlock upgrading shared locks; other processes wait up to
+    BUSY_TIMEOUT seconds. That wait, and COMMIT (which may checkpoint), run
+    through jsonstore.off_loop, so under gevent they park one greenlet rather
+    than the whole worker.
+  * Each read is a single statement (the active season is a subquery), so it
+    sees one consistent snapshot without an explicit transaction.
+
+Use it through storage.py, not directly.
+"""
+
+import atexit
+import contextlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+import jsonstore
+import namesearch
+import storage
+
+SQLITE_PATH = os.environ.get('SQLITE_PATH', os.path.join(storage.DATA_DIR, 'league.db'))
+BUSY_TIMEOUT = float(os.environ.get('SQLITE_BUSY_TIMEOUT', 5.0))
+CACHE_KIB = int(os.environ.get('SQLITE_CACHE_KIB', 16384))
+STATEMENT_CACHE = 256
+POOL_SIZE = int(os.environ.get('SQLITE_POOL_SIZE', 4))
+
+_log = logging.getLogger(__name__)
+
+_local = threading.local()        # the connection of this thread's (greenlet's) open transaction
+_schema_lock = threading.Lock()
+_pool_lock = threading.Lock()     # guards _state['pool_key'] / _state['idle']
+_state = {
+    'ready': set(),     # (pid, path) pairs whose schema is up to date
+    'pool_key': None,   # (pid, path) the idle connections belong to
+    'idle': [],         # open connections not in use
+}
+_MIGRATION = re.compile(r'^(\d{4})_\w+\.py$')   # as in migrations/__init__.py
+
+TEAM_COLUMNS = ('id', 'name', 'wins', 'losses', 'win_pct', 'games_behind', 'games_played')
+PLAYER_COLUMNS = ('id', 'name', 'team_id', 'Singles', 'Doubles', 'Triples', 'Dimes', 'HRs',
+                  'GP', 'AtBats', 'Avg', 'hits')
+RESULT_COLUMNS = ('id', 'season_id', 'date', 'game_number', 'team1_id', 'team2_id',
+                  'team1_score', 'team2_score')
+SEASON_COLUMNS = ('id', 'name', 'status', 'started_on', 'closed_on')
+
+
+# ── Statements ────────────────────────────────────────────────────────────────
+
+_TEAM = ("t.id, t.name, COALESCE(t.wins, 0), COALESCE(t.losses, 0), COALESCE(t.win_pct, 0.0), "
+         "COALESCE(t.games_behind, 0.0), COALESCE(t.games_played, 0)")
+_PLAYER = ("p.id, p.name, p.team_id, p.Singles, p.Doubles, p.Triples, p.Dimes, p.HRs, "
+           "p.GP, p.AtBats, p.Avg, COALESCE(p.hits, 0)")
+_RESULT = ("r.id, r.season_id, r.date, r.game_number, r.team1_id, r.team2_id, "
+           "r.team1_score, r.team2_score")
+_ACTIVE = "(SELECT id FROM seasons WHERE status = 'active' ORDER BY id DESC LIMIT 1)"
+
+SQL_TEAMS = f"SELECT {_TEAM} FROM teams t ORDER BY t.id"
+SQL_TEAM = f"SELECT {_TEAM} FROM teams t WHERE t.id = ?"
+SQL_ADD_TEAM = ("INSERT INTO teams (name, wins, losses, win_pct, games_behind, games_played, updated_at) "
+                "VALUES (?, 0, 0, 0.0, 0.0, 0, CURRENT_TIMESTAMP)")
+SQL_SET_TEAM = ("UPDATE teams SET wins = ?, losses = ?, games_played = ?, win_pct = ?, "
+                "games_behind = COALESCE(?, games_behind), updated_at = CURRENT_TIMESTAMP WHERE id = ?")
+SQL_DELETE_TEAM = "DELETE FROM teams WHERE id = ?"
+SQL_TEAM_PLAYER_IDS = "SELECT id FROM players WHERE team_id = ? ORDER BY id"
+SQL_DELETE_TEAM_PLAYERS = "DELETE FROM players WHERE team_id = ?"
+
+SQL_PLAYERS = f"SELECT {_PLAYER} FROM players p WHERE p.id > ? ORDER BY p.id LIMIT ?"
+SQL_TEAM_PLAYERS = f"SELECT {_PLAYER} FROM players p WHERE p.team_id = ? AND p.id > ? ORDER BY p.id LIMIT ?"
+SQL_PLAYER = f"SELECT {_PLAYER} FROM players p WHERE p.id = ?"
+SQL_ADD_PLAYER = ("INSERT INTO players (name, team_id, Singles, Doubles, Triples, Dimes, HRs, Avg, GP, "
+                  "AtBats, hits, updated_at) VALUES (?, ?, 0, 0, 0, 0, 0, 0.0, 0, 0, 0, CURRENT_TIMESTAMP)")
+SQL_SET_PLAYER = ("UPDATE players SET name = ?, Singles = ?, Doubles = ?, Triples = ?, Dimes = ?, HRs = ?, "
+                  "AtBats = ?, hits = ?, GP = ?, Avg = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?")
+# ?1 team filter (NULL: any), ?2 lower-cased LIKE pattern, ?3 limit
+_SEARCH = (f"SELECT {_PLAYER} FROM players p WHERE (?1 IS NULL OR p.team_id = ?1) AND {{where}} "
+           "ORDER BY CASE WHEN lower(p.name) LIKE ?2 || '%' ESCAPE '\\' THEN 0 "
+           "WHEN lower(p.name) LIKE '% ' || ?2 || '%' ESCAPE '\\' THEN 1 ELSE 2 END, "
+           "lower(p.name), p.id LIMIT ?3")
+SQL_SEARCH_PREFIX = _SEARCH.format(where="(lower(p.name) LIKE ?2 || '%' ESCAPE '\\' "
+                                         "OR lower(p.name) LIKE '% ' || ?2 || '%' ESCAPE '\\')")
+SQL_SEARCH_SUBSTRING = _SEARCH.format(where="lower(p.name) LIKE '%' || ?2 || '%' ESCAPE '\\'")
+SQL_SEARCH_FIRST = f"SELECT {_PLAYER} FROM players p WHERE (?1 IS NULL OR p.team_id = ?1) ORDER BY p.id LIMIT ?2"
+SQL_SEARCH_NAMES = "SELECT id, name FROM players WHERE (?1 IS NULL OR team_id = ?1)"
+SQL_ROSTERS = f"SELECT {_TEAM}, {_PLAYER} FROM teams t LEFT JOIN players p ON p.team_id = t.id ORDER BY t.id, p.id"
+
+# one statement per filter combination, so each can seek its own index
+# (ix_results_season_date, or ix_results_season_team1/2 via the OR); :a_* is the
+# keyset cursor and :after is NULL on the first page. The cursor date is NULL
+# after a date-less row (JSON store only, sorted last); r.date IS :a_date then
+# matches just that group, which is empty here since results.date is NOT NULL
+_RESULTS = (f"SELECT {_RESULT}, t1.name, t2.name FROM results r "
+            "LEFT JOIN teams t1 ON t1.id = r.team1_id LEFT JOIN teams t2 ON t2.id = r.team2_id "
+            f"WHERE r.season_id = COALESCE(:season, {_ACTIVE}) {{where}}"
+            "AND (:after IS NULL OR r.date < :a_date OR (r.date IS :a_date AND (r.game_number > :a_game "
+            "OR (r.game_number = :a_game AND r.id > :a_id)))) "
+            "ORDER BY r.date DESC, r.game_number, r.id LIMIT :limit")
+_ON_DATE = "AND r.date = :date "
+_FOR_TEAM = "AND (r.team1_id = :team OR r.team2_id = :team) "
+SQL_RESULTS = {
+    (False, False): _RESULTS.format(where=''),
+    (True, False): _RESULTS.format(where=_ON_DATE),
+    (False, True): _RESULTS.format(where=_FOR_TEAM),
+    (True, True): _RESULTS.format(where=_ON_DATE + _FOR_TEAM),
+}
+SQL_ALL_RESULTS = (f"SELECT {_RESULT} FROM results r WHERE r.season_id = COALESCE(?, {_ACTIVE}) "
+                   "ORDER BY r.date, r.game_number, r.id")
+SQL_FINGERPRINT = (f"SELECT s.id, COUNT(r.id), MAX(r.id) FROM seasons s "
+                   f"LEFT JOIN results r ON r.season_id = s.id WHERE s.id = {_ACTIVE} GROUP BY s.id")
+SQL_ADD_RESULT = ("INSERT INTO results (season_id, date, game_number, team1_id, team2_id, team1_score, "
+                  "team2_score, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)")
+
+SQL_MATCH = 'SELECT response FROM match_submissions WHERE "key" = ?'
+SQL_ADD_MATCH = 'INSERT INTO match_submissions ("key", created_at, response) VALUES (?, CURRENT_TIMESTAMP, ?)'
+
+SQL_ACTIVE_SEASON = f"SELECT {', '.join(SEASON_COLUMNS)} FROM seasons WHERE id = {_ACTIVE}"
+SQL_SEASONS = f"SELECT {', '.join(SEASON_COLUMNS)} FROM seasons ORDER BY id"
+SQL_SEASON = f"SELECT {', '.join(SEASON_COLUMNS)} FROM seasons WHERE id = ?"
+SQL_SNAPSHOT = "SELECT snapshot FROM seasons WHERE id = ?"
+SQL_SEASON_START = "SELECT MIN(date) FROM results WHERE season_id = ?"
+SQL_CLOSE_SEASON = ("UPDATE seasons SET status = 'closed', started_on = ?, closed_on = ?, snapshot = ?, "
+                    "updated_at = CURRENT_TIMESTAMP WHERE id = ?")
+SQL_OPEN_SEASON = ("INSERT INTO seasons (id, name, status, started_on, updated_at) "
+                   "SELECT COALESCE(MAX(id), 0) + 1, ?, 'active', ?, CURRENT_TIMESTAMP FROM seasons")
+SQL_NAME_SEASON = "UPDATE seasons SET name = ? WHERE id = ?"
+SQL_RESET_TEAMS = ("UPDATE teams SET wins = 0, losses = 0, win_pct = 0.0, games_behind = 0.0, "
+                   "games_played = 0, updated_at = CURRENT_TIMESTAMP")
+SQL_RESET_PLAYERS = ("UPDATE players SET Singles = 0, Doubles = 0, Triples = 0, Dimes = 0, HRs = 0, "
+                     "AtBats = 0, hits = 0, GP = 0, Avg = 0.0, updated_at = CURRENT_TIMESTAMP")
+
+SQL_VERSION = "SELECT version FROM data_version WHERE id = 1"
+SQL_BUMP = "UPDATE data_version SET version = version + 1 WHERE id = 1"
+SQL_FIRST_VERSION = "INSERT INTO data_version (id, version) VALUES (1, 1)"
+
+
+# ── Connections ───────────────────────────────────────────────────────────────
+
+def uri(path=None):
+    """SQLAlchemy URL of the database file (for migrations and export_to_json.py)."""
+    return f'sqlite:///{os.path.abspath(path or SQLITE_PATH)}'
+
+
+def _schema_current(path):
+    """True if every file in migrations/ is recorded in the database's schema_migrations
+    (checked with sqlite3 alone, so an up-to-date file never imports SQLAlchemy)."""
+    here = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+    wanted = {int(m.group(1)) for m in map(_MIGRATION.match, os.listdir(here)) if m}
+    if not os.path.exists(path):
+        return False
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+    try:
+        applied = {v for (v,) in conn.execute('SELECT version FROM schema_migrations')}
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+    return wanted <= applied
+
+
+def _ensure_schema(path):
+    """Create / migrate the file once per process, serialized across workers."""
+    key = (os.getpid(), path)
+    if key in _state['ready']:
+        return
+    with _schema_lock:
+        if key in _state['ready']:
+            return
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with jsonstore.file_lock(directory):
+            if not _schema_current(path):
+                from sqlalchemy import create_engine
+                import migrations
+                engine = create_engine(uri(path))
+                try:
+                    migrations.upgrade(engine, log=_log.info)
+                finally:
+                    engine.dispose()
+            conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+            try:
+                # persistent: every later connection to the file opens in WAL mode
+                conn.execute('PRAGMA journal_mode=WAL')
+                # planner statistics: gathered once, then kept current by optimize
+                if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+                    conn.execute('ANALYZE')
+                conn.execute('PRAGMA optimize')
+            finally:
+                conn.close()
+        _state['ready'].add(key)
+
+
+def _open(path):
+    _ensure_schema(path)
+    # isolation_level=None: autocommit reads; writes BEGIN IMMEDIATE explicitly.
+    # check_same_thread=False: a pooled connection moves between threads (and
+    # off_loop's pool thread), but is only ever used by one at a time
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None,
+                           cached_statements=STATEMENT_CACHE, check_same_thread=False)
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA foreign_keys=ON')
+    conn.execute(f'PRAGMA cache_size=-{CACHE_KIB}')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    return conn
+
+
+@contextlib.contextmanager
+def _connection():
+    """A connection to SQLITE_PATH for one read or transaction.
+
+    Inside transaction() it is that transaction's connection, so reads see its
+    writes. Otherwise an idle one is borrowed from the pool (or opened) and
+    given back afterwards; beyond POOL_SIZE idle connections it is closed.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        yield conn
+        return
+    key = (os.getpid(), SQLITE_PATH)
+    stale = []
+    with _pool_lock:
+        if _state['pool_key'] != key:
+            # after a fork the parent's connections are dropped, never closed
+            # here: closing would release the parent's file locks
+            if _state['pool_key'] is not None and _state['pool_key'][0] == key[0]:
+                stale = _state['idle']
+            _state['pool_key'], _state['idle'] = key, []
+        conn = _state['idle'].pop() if _state['idle'] else None
+    for old in stale:
+        old.close()
+    if conn is None:
+        conn = _open(key[1])
+    try:
+        yield conn
+    finally:
+        with _pool_lock:
+            keep = (_state['pool_key'] == key and len(_state['idle']) < POOL_SIZE
+                    and not conn.in_transaction)
+            if keep:
+                _state['idle'].append(conn)
+        if not keep:
+            conn.close()
+
+
+def _close_idle():
+    with _pool_lock:
+        idle = _state['idle'] if _state['pool_key'] and _state['pool_key'][0] == os.getpid() else []
+        _state['idle'] = []
+    for conn in idle:
+        conn.close()
+
+
+atexit.register(_close_idle)
+
+
+def _begin(conn):
+    """BEGIN IMMEDIATE, waiting for another process's write lock via jsonstore.off_loop."""
+    conn.execute('PRAGMA busy_timeout=0')
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        return
+    except sqlite3.OperationalError as e:
+        if e.sqlite_errorcode & 0xff != sqlite3.SQLITE_BUSY:
+            raise
+    finally:
+        conn.execute(f'PRAGMA busy_timeout={int(BUSY_TIMEOUT * 1000)}')
+    jsonstore.off_loop(conn.execute, 'BEGIN IMMEDIATE')
+
+
+@contextlib.contextmanager
+def transaction():
+    """One write transaction on a pooled connection; commits on success."""
+    with _connection() as conn:
+        _begin(conn)
+        _local.conn, _local.changed = conn, False
+        try:
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                _local.changed = False
+                raise
+            jsonstore.off_loop(conn.execute, 'COMMIT')
+        finally:
+            _local.conn = None
+    if _local.changed:
+        _local.changed = False
+        storage._notify_committed()
+
+
+def _bump_version(conn):
+    """Increment the data version inside the current transaction."""
+    if not conn.execute(SQL_BUMP).rowcount:
+        conn.execute(SQL_FIRST_VERSION)
+    _local.changed = True
+
+
+def _read(sql, params=()):
+    with _connection() as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def _team(row):
+    return dict(zip(TEAM_COLUMNS, row))
+
+
+def _player(row):
+    return dict(zip(PLAYER_COLUMNS, row))
+
+
+def _result(row):
+    return dict(zip(RESULT_COLUMNS, row))
+
+
+def _placeholders(values):
+    return ', '.join('?' * len(values))
+
+
+# ── Teams ─────────────────────────────────────────────────────────────────────
+
+def get_teams():
+    return [_team(row) for row in _read(SQL_TEAMS)]
+
+
+def get_team_by_id(team_id):
+    rows = _read(SQL_TEAM, (team_id,))
+    return _team(rows[0]) if rows else None
+
+
+def add_team(name):
+    with transaction() as conn:
+        team_id = conn.execute(SQL_ADD_TEAM, (name,)).lastrowid
+        _bump_version(conn)
+        team = _team(conn.execute(SQL_TEAM, (team_id,)).fetchone())
+    storage._notify_teams(updated=[team])
+    return team
+
+
+def _set_team(conn, team_id, changes):
+    conn.execute(SQL_SET_TEAM, (changes['wins'], changes['losses'], changes['games_played'],
+                                changes['win_pct'], changes.get('games_behind'), team_id))
+
+
+def update_team_record(team_id, wins_inc, losses_inc, games_behind=None):
+    with transaction() as conn:
+        row = conn.execute(SQL_TEAM, (team_id,)).fetchone()
+        if row is None:
+            return None
+        team = _team(row)
+        changes = storage._team_record_changes(team, wins_inc, losses_inc, games_behind)
+        _set_team(conn, team_id, changes)
+        _bump_version(conn)
+    team = {**team, **changes}
+    storage._notify_teams(updated=[team])
+    return team
+
+
+def delete_team(team_id):
+    with transaction() as conn:
+        if conn.execute(SQL_TEAM, (team_id,)).fetchone() is None:
+            return None
+        player_ids = [pid for (pid,) in conn.execute(SQL_TEAM_PLAYER_IDS, (team_id,))]
+        conn.execute(SQL_DELETE_TEAM_PLAYERS, (team_id,))
+        conn.execute(SQL_DELETE_TEAM, (team_id,))
+        _bump_version(conn)
+    storage._notify_teams(deleted_ids=[team_id])
+    storage._notify_players(deleted_ids=player_ids)
+    return {'id': team_id}
+
+
+# ── Players ───────────────────────────────────────────────────────────────────
+
+def get_players(team_id=None, limit=500, after=None):
+    """Without a cursor the listing is unbounded, as in SQL mode."""
+    after_id, limit = (after, limit) if after is not None else (0, -1)
+    if limit is None:
+        limit = -1
+    if team_id is not None:
+        return [_player(row) for row in _read(SQL_TEAM_PLAYERS, (team_id, after_id, limit))]
+    return [_player(row) for row in _read(SQL_PLAYERS, (after_id, limit))]
+
+
+def get_player_by_id(player_id):
+    rows = _read(SQL_PLAYER, (player_id,))
+    return _player(rows[0]) if rows else None
+
+
+def search_players(query, team_id=None, limit=200):
+    """Prefix / substring tiers in SQL, like SQL mode on SQLite; when nothing
+    matches literally, namesearch.rank's fuzzy tier over the names in Python
+    (a league has a few hundred players)."""
+    team_id = int(team_id) if team_id is not None else None
+    if not query:
+        return [_player(row) for row in _read(SQL_SEARCH_FIRST, (team_id, limit))]
+    fuzzy = len(query) >= namesearch.MIN_FUZZY
+    sql = SQL_SEARCH_SUBSTRING if fuzzy else SQL_SEARCH_PREFIX
+    rows = _read(sql, (team_id, namesearch.like_escape(query), limit))
+    if rows or not fuzzy:
+        return [_player(row) for row in rows]
+    grams = namesearch.trigrams(query)
+    ranked = []
+    for pid, name in _read(SQL_SEARCH_NAMES, (team_id,)):
+        key = namesearch.rank(query, name, grams)
+        if key is not None:
+            ranked.append((key, pid))
+    ranked.sort()
+    found = [get_player_by_id(pid) for _, pid in ranked[:limit]]
+    return [p for p in found if p is not None]
+
+
+def add_player(name, team_id):
+    with transaction() as conn:
+        player_id = conn.execute(SQL_ADD_PLAYER, (name, team_id)).lastrowid
+        _bump_version(conn)
+        player = _player(conn.execute(SQL_PLAYER, (player_id,)).fetchone())
+    storage._notify_players(updated=[player])
+    return player
+
+
+def _apply_players(conn, updates):
+    """Apply (player_id, increments) pairs inside a transaction; returns {id: player}.
+
+    Raises LookupError(missing_ids) before writing anything.
+    """
+    ids = list(dict.fromkeys(pid for pid, _ in updates))
+    current = {}
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        sql = f"SELECT {_PLAYER} FROM players p WHERE p.id IN ({_placeholders(chunk)})"
+        current.update((row[0], _player(row)) for row in conn.execute(sql, chunk))
+    missing = [pid for pid, _ in updates if pid not in current]
+    if missing:
+        raise LookupError(missing)
+    for pid, increments in updates:
+        current[pid] = {**current[pid], **storage._player_changes(current[pid], increments)}
+    conn.executemany(SQL_SET_PLAYER, [
+        (p['name'], p['Singles'], p['Doubles'], p['Triples'], p['Dimes'], p['HRs'],
+         p['AtBats'], p['hits'], p['GP'], p['Avg'], pid)
+        for pid, p in current.items()
+    ])
+    return current
+
+
+def update_players(updates):
+    with transaction() as conn:
+        players = _apply_players(conn, updates)
+        _bump_version(conn)
+    updated = [dict(players[pid]) for pid, _ in updates]
+    storage._notify_players(updated=updated)
+    return updated
+
+
+def get_rosters():
+    """One teams LEFT JOIN players query, grouped here."""
+    rosters = {}
+    width = len(TEAM_COLUMNS)
+    for row in _read(SQL_ROSTERS):
+        entry = rosters.get(row[0])
+        if entry is None:
+            entry = rosters[row[0]] = {**_team(row[:width]), 'players': []}
+        if row[width] is not None:
+            entry['players'].append(_player(row[width:]))
+    return list(rosters.values())
+
+
+# ── Results ───────────────────────────────────────────────────────────────────
+
+def get_results(date=None, team_id=None, limit=500, after=None, season_id=None):
+    a_date, a_game, a_id = after if after is not None else (None, None, None)
+    sql = SQL_RESULTS[date is not None, team_id is not None]
+    rows = _read(sql, {'season': season_id, 'date': date.isoformat() if date else None,
+                       'team': team_id, 'after': 1 if after is not None else None,
+                       'a_date': a_date, 'a_game': a_game, 'a_id': a_id,
+                       'limit': limit})
+
+    def name(tid, tname):
+        return (tname or f"Team {tid}") if tid is not None else None
+
+    out = []
+    for row in rows:
+        r = _result(row[:-2])
+        r['team1_name'] = name(r['team1_id'], row[-2])
+        r['team2_name'] = name(r['team2_id'], row[-1])
+        out.append(r)
+    return out
+
+
+def _insert_results(conn, date_str, team1_id, team2_id, games):
+    season = conn.execute(SQL_ACTIVE_SEASON).fetchone()
+    if season is None:
+        raise RuntimeError(f'no active season in {SQLITE_PATH}')
+    created = []
+    for g in games:
+        values = (season[0], date_str, g['game_number'], team1_id, team2_id,
+                  g['team1_score'], g['team2_score'])
+        result_id = conn.execute(SQL_ADD_RESULT, values).lastrowid
+        created.append(dict(zip(RESULT_COLUMNS, (result_id, *values))))
+    return created
+
+
+def add_results(date, team1_id, team2_id, games):
+    with transaction() as conn:
+        created = _insert_results(conn, date.isoformat(), team1_id, team2_id, games)
+        _bump_version(conn)
+    storage._notify_results(created)
+    return created
+
+
+def all_results(season_id=None):
+    return [_result(row) for row in _read(SQL_ALL_RESULTS, (season_id,))]
+
+
+def results_fingerprint():
+    rows = _read(SQL_FINGERPRINT)
+    return tuple(rows[0]) if rows else (None, 0, None)
+
+
+# ── Matches ───────────────────────────────────────────────────────────────────
+
+def record_match(key, date, team1_id, team2_id, games, player_updates):
+    """The idempotency key is checked under the write lock, so a concurrent
+    retry of the same key waits and then replays."""
+    record = storage.match_record(team1_id, team2_id, games)
+    with transaction() as conn:
+        prior = conn.execute(SQL_MATCH, (key,)).fetchone()
+        if prior is not None:
+            return json.loads(prior[0]), True
+        teams = {}
+        for tid in (team1_id, team2_id):
+            row = conn.execute(SQL_TEAM, (tid,)).fetchone()
+            if row is not None:
+                teams[tid] = _team(row)
+        missing = [tid for tid in (team1_id, team2_id) if tid not in teams]
+        if missing:
+            raise LookupError(('teams', missing))
+        try:
+            players = _apply_players(conn, player_updates)
+        except LookupError as e:
+            raise LookupError(('players', e.args[0])) from None
+
+        created = _insert_results(conn, date.isoformat(), team1_id, team2_id, games)
+        for tid in (team1_id, team2_id):
+            changes = storage._team_record_changes(teams[tid], *record[tid])
+            _set_team(conn, tid, changes)
+            teams[tid] = {**teams[tid], **changes}
+        match = {
+            'key': key,
+            'results': created,
+            'teams': [teams[tid] for tid in (team1_id, team2_id)],
+            'players': [dict(players[pid]) for pid, _ in player_updates],
+        }
+        conn.execute(SQL_ADD_MATCH, (key, json.dumps(match)))
+        _bump_version(conn)
+    storage._notify_results(match['results'])
+    storage._notify_teams(updated=match['teams'])
+    storage._notify_players(updated=match['players'])
+    return match, False
+
+
+# ── Seasons ───────────────────────────────────────────────────────────────────
+
+def _season(row):
+    return dict(zip(SEASON_COLUMNS, row))
+
+
+def active_season():
+    rows = _read(SQL_ACTIVE_SEASON)
+    if not rows:
+        raise RuntimeError(f'no active season in {SQLITE_PATH}')
+    return _season(rows[0])
+
+
+def get_seasons():
+    return [_season(row) for row in _read(SQL_SEASONS)]
+
+
+def get_season(season_id):
+    rows = _read(SQL_SEASON, (season_id,))
+    return _season(rows[0]) if rows else None
+
+
+def get_season_snapshot(season_id):
+    rows = _read(SQL_SNAPSHOT, (season_id,))
+    return json.loads(rows[0][0]) if rows and rows[0][0] else None
+
+
+def close_season(build_snapshot, next_name=None, closed_on=None, retries=3):
+    """The snapshot is built inside the write transaction (reads on this thread
+    see it), so nothing can change under it and there is nothing to retry."""
+    with transaction() as conn:
+        row = conn.execute(SQL_ACTIVE_SEASON).fetchone()
+        if row is None:
+            raise RuntimeError(f'no active season in {SQLITE_PATH}')
+        current = _season(row)
+        if current['started_on'] is None:
+            current['started_on'] = conn.execute(SQL_SEASON_START, (current['id'],)).fetchone()[0]
+        snapshot = build_snapshot()
+        current.update(status='closed', closed_on=closed_on.isoformat())
+        conn.execute(SQL_CLOSE_SEASON, (current['started_on'], current['closed_on'],
+                                        json.dumps(snapshot), current['id']))
+        new_id = conn.execute(SQL_OPEN_SEASON, (next_name or '', closed_on.isoformat())).lastrowid
+        if not next_name:
+            conn.execute(SQL_NAME_SEASON, (f'Season {new_id}', new_id))
+        opened = _season(conn.execute(SQL_SEASON, (new_id,)).fetchone())
+        conn.execute(SQL_RESET_TEAMS)
+        conn.execute(SQL_RESET_PLAYERS)
+        _bump_version(conn)
+    return current, opened
+
+
+# ── Data version / status ─────────────────────────────────────────────────────
+
+def data_version():
+    """The data_version row. A local read, so it is not cached: a write by any
+    process is visible on the next call."""
+    rows = _read(SQL_VERSION)
+    return rows[0][0] if rows else 0
+
+
+def status():
+    """Database file, journal mode and live row counts."""
+    with _connection() as conn:
+        counts = {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                  for table in ('seasons', 'teams', 'players', 'results', 'match_submissions')}
+        journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+    wal = SQLITE_PATH + '-wal'
+    return {
+        'path': SQLITE_PATH,
+        'sqlite_version': sqlite3.sqlite_version,
+        'journal_mode': journal_mode,
+        'bytes': os.path.getsize(SQLITE_PATH),
+        'wal_bytes': os.path.getsize(wal) if os.path.exists(wal) else 0,
+        'counts': counts,
+        'data_version': data_version(),
+    }
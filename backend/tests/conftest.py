@@ -0,0 +1,40 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# the suite runs on the JSON engine unless a test picks another one
+os.environ.setdefault('STORAGE_BACKEND', 'json')
+
+import jsonstore  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """An empty JSON data directory (required snapshots only), dropped from the store cache afterwards."""
+    for entity in jsonstore.REQUIRED_ENTITIES:
+        (tmp_path / f'{entity}.json').write_text(json.dumps([]))
+    yield str(tmp_path)
+    jsonstore._stores.pop(str(tmp_path), None)
+
+
+def write_snapshots(data_dir, **entities):
+    for entity, records in entities.items():
+        with open(os.path.join(data_dir, f'{entity}.json'), 'w') as f:
+            json.dump(records, f)
+
+
+@pytest.fixture
+def league_dir(data_dir, monkeypatch):
+    """data_dir as the JSON engine's DATA_DIR, holding two teams and five results (two date-less)."""
+    import storage
+    write_snapshots(data_dir, teams=[{'id': 1, 'name': 'A'}, {'id': 2, 'name': 'B'}], results=[
+        {'id': i, 'season_id': 1, 'date': date, 'game_number': game, 'team1_id': 1, 'team2_id': 2,
+         'team1_score': 3, 'team2_score': 1}
+        for i, date, game in ((1, '2026-01-08', 1), (2, None, 2), (3, '2026-01-15', 1),
+                              (4, None, 1), (5, '2026-01-08', 2))])
+    monkeypatch.setattr(storage, 'STORAGE_BACKEND', 'json')
+    monkeypatch.setattr(storage, 'DATA_DIR', data_dir)
+    return data_dir
@@ -0,0 +1,84 @@
+import os
+import threading
+
+import jsonstore
+
+
+def _team(team_id, name):
+    return jsonstore.put('teams', {'id': team_id, 'name': name, 'wins': 0, 'losses': 0})
+
+
+def test_commit_survives_reader_replaying_mid_commit(data_dir, monkeypatch):
+    lock = threading.Lock()
+    s = jsonstore.store(data_dir)
+    real_fsync = os.fsync
+    readers = []
+
+    def fsync_then_read(fd):
+        real_fsync(fd)
+        # a same-process reader refreshes between the journal append and the apply
+        with lock:
+            readers.append(jsonstore.store(data_dir).seq)
+
+    monkeypatch.setattr(jsonstore.os, 'fsync', fsync_then_read)
+    with jsonstore.file_lock(data_dir):
+        s.commit([_team(1, 'A')], lock)
+        s.commit([_team(2, 'B')], lock)
+        s.commit([_team(3, 'C')], lock)
+    monkeypatch.setattr(jsonstore.os, 'fsync', real_fsync)
+
+    assert readers == [1, 2, 3]
+    assert s.seq == 3
+    assert s.journal_pos == os.path.getsize(s.journal_path)
+    with open(s.journal_path, 'rb') as f:
+        assert b'\0' not in f.read()
+    fresh = jsonstore.Store(data_dir)
+    fresh.load()
+    assert fresh.seq == 3
+    assert sorted(t['name'] for t in fresh.tables['teams'].all()) == ['A', 'B', 'C']
+
+
+def test_commit_drops_torn_tail(data_dir):
+    lock = threading.Lock()
+    s = jsonstore.store(data_dir)
+    with jsonstore.file_lock(data_dir):
+        s.commit([_team(1, 'A')], lock)
+    with open(s.journal_path, 'ab') as f:
+        f.write(b'{"seq":2,"ops":[')     # crash mid-append
+    with jsonstore.file_lock(data_dir):
+        s = jsonstore.store(data_dir)
+        s.commit([_team(2, 'B')], lock)
+    fresh = jsonstore.Store(data_dir)
+    fresh.load()
+    assert fresh.seq == 2
+    assert sorted(t['name'] for t in fresh.tables['teams'].all()) == ['A', 'B']
+
+
+def test_compact_writes_snapshots_without_readers_lock(data_dir, monkeypatch):
+    lock = threading.Lock()
+    s = jsonstore.store(data_dir)
+    with jsonstore.file_lock(data_dir):
+        s.commit([_team(1, 'A')], lock)
+        s.commit([_team(2, 'B'), jsonstore.put('seasons', {'id': 1, 'name': 'Season 1', 'status': 'active'})],
+                 lock)
+    real_write_temp = jsonstore._write_temp
+    held = []
+
+    def write_temp(path, text):
+        held.append(lock.locked())
+        return real_write_temp(path, text)
+
+    monkeypatch.setattr(jsonstore, '_write_temp', write_temp)
+    with jsonstore.file_lock(data_dir):
+        assert s.compact(lock)
+        assert not s.compact(lock)    # nothing left to fold
+    assert held == [False] * (len(jsonstore.ENTITIES) + 1)
+
+    assert s.journal_pos == 0 and os.path.getsize(s.journal_path) == 0
+    assert not [name for name in os.listdir(data_dir) if '.tmp.' in name]
+    fresh = jsonstore.Store(data_dir)
+    fresh.load()
+    assert fresh.seq == 2
+    assert sorted(t['name'] for t in fresh.tables['teams'].all()) == ['A', 'B']
+    assert [r['name'] for r in fresh.tables['seasons'].all()] == ['Season 1']
+    assert jsonstore.store(data_dir) is s and s.seq == 2    # our own swap needs no reload
@@ -0,0 +1,21 @@
+import pytest
+
+
+@pytest.fixture
+def client(league_dir):
+    import app
+    return app.app.test_client()
+
+
+def test_results_pages_cross_dateless_rows(client):
+    ids, url = [], '/routes/results?page_size=2'
+    while url:
+        r = client.get(url)
+        assert r.status_code == 200
+        ids += [row['id'] for row in r.json['items']]
+        url = f"/routes/results?page_size=2&cursor={r.json['next']}" if r.json['next'] else None
+    assert ids == [3, 1, 5, 4, 2]
+
+
+def test_results_rejects_bad_cursor(client):
+    assert client.get('/routes/results?page_size=2&cursor=bm90LWpzb24').status_code == 400
@@ -0,0 +1,28 @@
+import os
+
+import storage
+import storage_json
+
+
+def test_status_lists_optional_snapshots_as_absent(data_dir, monkeypatch):
+    monkeypatch.setattr(storage, 'DATA_DIR', data_dir)
+    files = storage_json.status()['files']
+    assert files['teams'] == {'exists': True, 'snapshot_bytes': 2, 'count': 0}
+    assert files['seasons'] == {'exists': False, 'optional': True, 'count': 0}
+    assert files['matches'] == {'exists': False, 'optional': True, 'count': 0}
+
+
+def test_status_reports_missing_required_snapshot(data_dir, monkeypatch):
+    monkeypatch.setattr(storage, 'DATA_DIR', data_dir)
+    os.remove(os.path.join(data_dir, 'players.json'))
+    files = storage_json.status()['files']
+    assert files['players']['exists'] is False
+    assert 'error' in files['players']
+
+
+def test_results_paging_crosses_dateless_rows(league_dir):
+    everything = storage.get_results()
+    assert [r['id'] for r in everything] == [3, 1, 5, 4, 2]    # date-less rows last
+    assert [r['id'] for r in storage.iter_results(batch=1)] == [3, 1, 5, 4, 2]
+    assert [r['id'] for r in storage.iter_results(batch=2)] == [3, 1, 5, 4, 2]
+    assert storage.get_results(after=(None, 1, 4)) == everything[4:]
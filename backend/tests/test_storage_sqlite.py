@@ -0,0 +1,42 @@
+import datetime
+import threading
+
+import pytest
+
+import storage
+import storage_sqlite
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, 'STORAGE_BACKEND', 'sqlite')
+    monkeypatch.setattr(storage_sqlite, 'SQLITE_PATH', str(tmp_path / 'league.db'))
+    return tmp_path / 'league.db'
+
+
+def test_results_keyset_cursor(sqlite_db):
+    a, b = storage.add_team('A'), storage.add_team('B')
+    games = [{'game_number': g, 'team1_score': 2, 'team2_score': 1} for g in (1, 2)]
+    storage.add_results(datetime.date(2026, 1, 8), a['id'], b['id'], games)
+    storage.add_results(datetime.date(2026, 1, 15), a['id'], b['id'], games)
+    assert [r['id'] for r in storage.iter_results(batch=1)] == [3, 4, 1, 2]
+    assert [r['id'] for r in storage.get_results(after=('2026-01-15', 2, 4))] == [1, 2]
+    # a cursor from a date-less JSON row: nothing sorts after it (results.date is NOT NULL)
+    assert storage.get_results(after=(None, 1, 1)) == []
+
+
+def test_connections_are_pooled_across_threads(sqlite_db):
+    storage.add_team('A')
+    threads = [threading.Thread(target=storage.get_teams) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert 1 <= len(storage_sqlite._state['idle']) <= storage_sqlite.POOL_SIZE
+
+
+def test_reads_inside_a_transaction_see_its_writes(sqlite_db):
+    with storage_sqlite.transaction() as conn:
+        conn.execute("INSERT INTO teams (name) VALUES ('A')")
+        assert [t['name'] for t in storage.get_teams()] == ['A']
+    assert storage_sqlite._local.conn is None
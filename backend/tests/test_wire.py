@@ -0,0 +1,59 @@
+import datetime
+import gzip
+import json
+
+import wire
+
+
+def _result(result_id, date, game_number=1):
+    return {'id': result_id, 'date': date, 'game_number': game_number, 'team1_id': 11, 'team2_id': 16,
+            'team1_score': 3, 'team2_score': 1, 'season_id': 1,
+            'team1_name': 'Labelle Firehall', 'team2_name': 'KGB'}
+
+
+def test_results_round_trip():
+    rows = [_result(439, '2026-01-22'), _result(438, '2026-01-22', 2), _result(431, '2026-01-15')]
+    payload = wire.results(rows, 1)
+    assert payload['columns']['id'] == [439, -1, -7]
+    assert payload['columns']['date'] == [20475, 0, -7]
+    assert wire.decode(payload) == rows
+
+
+def test_results_without_date():
+    rows = [_result(439, '2026-01-22'), _result(438, None), _result(431, '2026-01-15')]
+    payload = wire.results(rows, 1)
+    assert payload['columns']['date'] == [20475, None, -7]
+    assert wire.decode(payload) == rows
+
+
+def test_players_round_trip():
+    rows = [{'id': 5, 'name': 'Big Ike', 'team_id': 16, 'Singles': 3, 'Doubles': 1, 'Triples': 0,
+             'Dimes': 0, 'HRs': 1, 'AtBats': 12, 'hits': 5, 'GP': 2, 'Avg': 0.417},
+            {'id': 9, 'name': 'Free Agent', 'team_id': None, 'Singles': 0, 'Doubles': 0, 'Triples': 0,
+             'Dimes': 0, 'HRs': 0, 'AtBats': 0, 'hits': 0, 'GP': 0, 'Avg': 0.0}]
+    payload = wire.players(rows, {16: 'KGB'})
+    assert payload['teams'] == {'16': 'KGB'}
+    assert wire.decode(payload) == rows
+
+
+def _size(payload):
+    body = json.dumps(payload, separators=(',', ':')).encode()
+    return len(body), len(gzip.compress(body))
+
+
+def test_columns_are_smaller_than_rows():
+    teams = {11: 'Labelle Firehall', 16: 'KGB', 17: 'Legion', 20: 'Rock Valley'}
+    rows, day, result_id = [], datetime.date(2026, 1, 8), 600
+    for week in range(20):
+        for team1, team2 in ((11, 16), (17, 20)):
+            for game in (1, 2, 3):
+                rows.append({'id': result_id, 'date': day.isoformat(), 'game_number': game,
+                             'team1_id': team1, 'team2_id': team2,
+                             'team1_score': (week + game) % 7, 'team2_score': (week * game) % 5,
+                             'season_id': 1, 'team1_name': teams[team1], 'team2_name': teams[team2]})
+                result_id -= 1
+        day -= datetime.timedelta(days=7)
+    raw_rows, gzip_rows = _size(rows)
+    raw_columns, gzip_columns = _size(wire.results(rows, 1))
+    assert raw_columns < raw_rows
+    assert gzip_columns < gzip_rows
@@ -0,0 +1,106 @@
+"""
+wire.py — compact columnar encoding of the bulk listing payloads.
+
+/routes/results and /routes/players answer ?format=columnar with one object of
+column arrays instead of a list of row objects, so each key is sent once:
+
+  {"format": "columnar", "count": 3, "season_id": 1,
+   "teams": {"11": "Labelle Firehall", "16": "KGB"},
+   "columns": {"id": [439, -1, -1], "date": [20476, 0, -7], "team1_id": [11, 11, 16], ...}}
+
+- id and date are delta-encoded: the first value is absolute and each later
+  one is the difference from the row before (a running sum decodes them).
+  Dates are day numbers since 1970-01-01. A missing date is null and is
+  skipped by the running sum.
+- Team names are sent once, in the teams dictionary keyed by team id; rows
+  only carry the ids. Results drop team1_name / team2_name, and season_id
+  (one value for the whole listing) moves to the top level.
+
+decode() turns a payload back into the row dicts the plain format returns.
+"""
+
+import datetime
+
+RESULT_COLUMNS = ('id', 'date', 'game_number', 'team1_id', 'team2_id', 'team1_score', 'team2_score')
+PLAYER_COLUMNS = ('id', 'name', 'team_id', 'Singles', 'Doubles', 'Triples', 'Dimes', 'HRs',
+                  'AtBats', 'hits', 'GP', 'Avg')
+DELTA_COLUMNS = ('id', 'date')
+
+_EPOCH = datetime.date(1970, 1, 1).toordinal()
+
+
+def _day(value):
+    if value is None:
+        return None
+    if not isinstance(value, datetime.date):
+        value = datetime.date.fromisoformat(value)
+    return value.toordinal() - _EPOCH
+
+
+def _delta(values):
+    out, previous = [], 0
+    for v in values:
+        if v is None:
+            out.append(None)
+            continue
+        out.append(v - previous)
+        previous = v
+    return out
+
+
+def _undelta(values):
+    out, total = [], 0
+    for v in values:
+        if v is None:
+            out.append(None)
+            continue
+        total += v
+        out.append(total)
+    return out
+
+
+def _columns(rows, names):
+    columns = {}
+    for name in names:
+        values = [r.get(name) for r in rows]
+        if name == 'date':
+            values = [_day(v) for v in values]
+        columns[name] = _delta(values) if name in DELTA_COLUMNS else values
+    return columns
+
+
+def results(rows, season_id):
+    """Columnar payload for get_results rows (one season's listing)."""
+    teams = {}
+    for r in rows:
+        teams[str(r['team1_id'])] = r.get('team1_name')
+        teams[str(r['team2_id'])] = r.get('team2_name')
+    return {'format': 'columnar', 'count': len(rows), 'season_id': season_id,
+            'teams': teams, 'columns': _columns(rows, RESULT_COLUMNS)}
+
+
+def players(rows, team_names):
+    """Columnar payload for get_players rows; team_names: {team_id: name}."""
+    teams = {str(r['team_id']): team_names.get(r['team_id'])
+             for r in rows if r.get('team_id') is not None}
+    return {'format': 'columnar', 'count': len(rows),
+            'teams': teams, 'columns': _columns(rows, PLAYER_COLUMNS)}
+
+
+def decode(payload):
+    """Row dicts from a columnar payload (results rows get their team names back)."""
+    columns = dict(payload['columns'])
+    for name in DELTA_COLUMNS:
+        if name in columns:
+            columns[name] = _undelta(columns[name])
+    if 'date' in columns:
+        columns['date'] = [None if d is None else datetime.date.fromordinal(d + _EPOCH).isoformat()
+                           for d in columns['date']]
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    if 'team1_id' in columns:
+        teams = payload['teams']
+        for r in rows:
+            r['season_id'] = payload['season_id']
+            r['team1_name'] = teams.get(str(r['team1_id']))
+            r['team2_name'] = teams.get(str(r['team2_id']))
+    return rows
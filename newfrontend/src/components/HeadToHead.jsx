@@ -9,83 +9,18 @@ const HeadToHead = () => {
   useEffect(() => {
     const load = async () => {
       try {
-        const [teamsResp, resultsResp] = await Promise.all([
-          fetchWithToken('/routes/teams', { method: 'GET' }),
-          fetchWithToken('/routes/results?limit=10000', { method: 'GET' })
+        // standings give the row order; the matrix is precomputed server-side
+        const [standingsResp, h2hResp] = await Promise.all([
+          fetchWithToken('/routes/standings', { method: 'GET' }),
+          fetchWithToken('/routes/h2h', { method: 'GET' })
         ]);
-        if (!teamsResp.ok) throw new Error(`Teams HTTP ${teamsResp.status}`);
-        if (!resultsResp.ok) throw new Error(`Results HTTP ${resultsResp.status}`);
-        const teamsData = await teamsResp.json();
-        const resultsData = await resultsResp.json();
+        if (!standingsResp.ok) throw new Error(`Standings HTTP ${standingsResp.status}`);
+        if (!h2hResp.ok) throw new Error(`H2H HTTP ${h2hResp.status}`);
+        const standingsData = await standingsResp.json();
+        const h2hData = await h2hResp.json();
 
-        // Build name map
-        const nameMap = {};
-        (Array.isArray(teamsData) ? teamsData : []).forEach(t => {
-          nameMap[String(t.id)] = t.name || t.team_name || `Team ${t.id}`;
-        });
-
-        // Seed all teams from teamsData so teams with no results still appear
-        const overallStats = {};
-        (Array.isArray(teamsData) ? teamsData : []).forEach(t => {
-          overallStats[String(t.id)] = { wins: 0, losses: 0, games_played: 0 };
-        });
-
-        // Build h2h[teamId][opponentId] = { wins, losses }
-        const h2h = {};
-        const ensureH2H = (a, b) => {
-          if (!h2h[a]) h2h[a] = {};
-          if (!h2h[a][b]) h2h[a][b] = { wins: 0, losses: 0 };
-        };
-        const ensureOverall = (id) => {
-          if (!overallStats[id]) overallStats[id] = { wins: 0, losses: 0, games_played: 0 };
-          return overallStats[id];
-        };
-
-        (Array.isArray(resultsData) ? resultsData : []).forEach(r => {
-          const t1 = String(r.team1_id);
-          const t2 = String(r.team2_id);
-          const s1 = Number(r.team1_score) || 0;
-          const s2 = Number(r.team2_score) || 0;
-
-          ensureH2H(t1, t2);
-          ensureH2H(t2, t1);
-          const st1 = ensureOverall(t1);
-          const st2 = ensureOverall(t2);
-          st1.games_played++;
-          st2.games_played++;
-
-          if (s1 > s2) {
-            h2h[t1][t2].wins++;
-            h2h[t2][t1].losses++;
-            st1.wins++;
-            st2.losses++;
-          } else if (s2 > s1) {
-            h2h[t2][t1].wins++;
-            h2h[t1][t2].losses++;
-            st2.wins++;
-            st1.losses++;
-          }
-          // ties: games_played incremented but no wins/losses
-        });
-
-        // Sort by win_pct desc, then wins desc — same order as standings
-        const sortedTeams = Object.keys(overallStats)
-          .map(id => {
-            const s = overallStats[id];
-            return {
-              id,
-              name: nameMap[id] ?? `Team ${id}`,
-              ...s,
-              win_pct: s.games_played > 0 ? s.wins / s.games_played : 0
-            };
-          })
-          .sort((a, b) => {
-            if (b.win_pct !== a.win_pct) return b.win_pct - a.win_pct;
-            return (b.wins || 0) - (a.wins || 0);
-          });
-
-        setTeams(sortedTeams);
-        setMatrix(h2h);
+        setTeams(Array.isArray(standingsData?.teams) ? standingsData.teams : []);
+        setMatrix(h2hData?.matrix || {});
       } catch (err) {
         console.error('HeadToHead load failed', err);
       } finally {
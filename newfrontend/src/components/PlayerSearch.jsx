@@ -181,13 +181,14 @@ const PlayerSearch = () => {
     return () => { mounted = false; };
   }, []);
 
-  // fetch from server and return normalized array (no extra client-side filtering)
-  const fetchPlayers = async (q) => {
+  // fetch from server and return normalized array (no extra client-side filtering);
+  // the server ranks matches best-first, so a limit keeps the top ones
+  const fetchPlayers = async (q, limit) => {
     const qtrim = (q || '').trim();
     if (!qtrim) return [];
     setLoading(true);
     try {
-      const path = `/routes/players/search?q=${encodeURIComponent(qtrim)}`;
+      const path = `/routes/players/search?q=${encodeURIComponent(qtrim)}${limit ? `&limit=${limit}` : ''}`;
       const res = await fetchWithToken(path);
 
       // If fetchWithToken returned a Response object, read/parse the body
@@ -259,7 +260,7 @@ const PlayerSearch = () => {
     if (!query || query.trim() === '') { setMatches([]); return; }
 
     debounceRef.current = setTimeout(async () => {
-      const list = await fetchPlayers(query);
+      const list = await fetchPlayers(query, 12);
       setMatches(list.slice(0, 12));
     }, 220);
     return () => clearTimeout(debounceRef.current);
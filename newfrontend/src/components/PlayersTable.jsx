@@ -14,22 +14,14 @@ const PlayersTable = () => {
 
         const load = async () => {
             try {
-                const teamsRes = await fetchWithToken('/routes/teams', { method: 'GET' });
-                if (!teamsRes.ok) throw new Error(`teams fetch ${teamsRes.status}`);
-                const teamsData = await teamsRes.json();
+                // one request: every team with its players nested
+                const res = await fetchWithToken('/routes/rosters', { method: 'GET' });
+                if (!res.ok) throw new Error(`rosters fetch ${res.status}`);
+                const rosters = await res.json();
                 if (!mounted) return;
-                setTeams(teamsData);
-
-                const groups = await Promise.all(teamsData.map(async (t) => {
-                    try {
-                        const res = await fetchWithToken(`/routes/players?team_id=${t.id}`, { method: 'GET' });
-                        const players = res.ok ? await res.json() : [];
-                        return { teamId: t.id, teamName: t.name, players };
-                    } catch (err) {
-                        console.error('fetch players for team failed', t.id, err);
-                        return { teamId: t.id, teamName: t.name, players: [] };
-                    }
-                }));
+                setTeams(rosters);
+
+                const groups = rosters.map(t => ({ teamId: t.id, teamName: t.name, players: t.players || [] }));
 
                 if (mounted) {
                     setGroupedPlayers(groups);
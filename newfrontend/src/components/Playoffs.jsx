@@ -7,56 +7,11 @@ const Playoffs = () => {
     useEffect(() => {
         const fetchStandings = async () => {
             try {
-                const [teamsResp, resultsResp] = await Promise.all([
-                    fetchWithToken('/routes/teams', { method: 'GET' }),
-                    fetchWithToken('/routes/results?limit=10000', { method: 'GET' })
-                ]);
-
-                if (!teamsResp.ok) throw new Error(`Teams HTTP ${teamsResp.status}`);
-                if (!resultsResp.ok) throw new Error(`Results HTTP ${resultsResp.status}`);
-
-                const teamsData = await teamsResp.json();
-                const resultsData = await resultsResp.json();
-
-                const nameMap = {};
-                (Array.isArray(teamsData) ? teamsData : []).forEach(t => {
-                    nameMap[String(t.id)] = t.name || t.team_name || `Team ${t.id}`;
-                });
-
-                const stats = {};
-                const addTeamIfMissing = (id) => {
-                    const key = String(id);
-                    if (!stats[key]) stats[key] = { id: key, wins: 0, losses: 0, games_played: 0 };
-                    return stats[key];
-                };
-
-                (Array.isArray(resultsData) ? resultsData : []).forEach(r => {
-                    const t1 = String(r.team1_id);
-                    const t2 = String(r.team2_id);
-                    const s1 = Number(r.team1_score) || 0;
-                    const s2 = Number(r.team2_score) || 0;
-
-                    const st1 = addTeamIfMissing(t1);
-                    const st2 = addTeamIfMissing(t2);
-
-                    st1.games_played += 1;
-                    st2.games_played += 1;
-
-                    if (s1 > s2) { st1.wins += 1; st2.losses += 1; }
-                    else if (s2 > s1) { st2.wins += 1; st1.losses += 1; }
-                });
-
-                const rows = Object.values(stats).map(s => {
-                    const winPct = s.games_played > 0 ? (s.wins / s.games_played) * 100 : 0;
-                    return { ...s, win_pct: winPct, name: nameMap[s.id] ?? `Team ${s.id}` };
-                });
-
-                rows.sort((a, b) => {
-                    if (b.win_pct !== a.win_pct) return b.win_pct - a.win_pct;
-                    return (b.wins || 0) - (a.wins || 0);
-                });
-
-                setTeams(rows);
+                // seeds follow the server-side standings order
+                const resp = await fetchWithToken('/routes/standings', { method: 'GET' });
+                if (!resp.ok) throw new Error(`Standings HTTP ${resp.status}`);
+                const data = await resp.json();
+                setTeams(Array.isArray(data?.teams) ? data.teams : []);
             } catch (err) {
                 console.error('fetchStandings failed', err);
             }
@@ -7,113 +7,20 @@ const TeamsTable = () => {
     const containerRef = useRef(null);
 
     useEffect(() => {
-        const fetchStandingsFromResults = async () => {
+        const fetchStandings = async () => {
             try {
-                // fetch teams for names and results for computing standings
-                const [teamsResp, resultsResp] = await Promise.all([
-                    fetchWithToken('/routes/teams', { method: 'GET' }),
-                    fetchWithToken('/routes/results?limit=10000', { method: 'GET' })
-                ]);
-
-                if (!teamsResp.ok) throw new Error(`Teams HTTP ${teamsResp.status}`);
-                if (!resultsResp.ok) throw new Error(`Results HTTP ${resultsResp.status}`);
-
-                const teamsData = await teamsResp.json();
-                const resultsData = await resultsResp.json();
-
-                // build name map
-                const nameMap = {};
-                (Array.isArray(teamsData) ? teamsData : []).forEach(t => {
-                    nameMap[String(t.id)] = t.name || t.team_name || `Team ${t.id}`;
-                });
-
-                // aggregate stats from results
-                const stats = {}; // keyed by team id (string)
-                const addTeamIfMissing = (id) => {
-                    const key = String(id);
-                    if (!stats[key]) stats[key] = { id: key, wins: 0, losses: 0, games_played: 0 };
-                    return stats[key];
-                };
-
-                (Array.isArray(resultsData) ? resultsData : []).forEach(r => {
-                    const t1 = String(r.team1_id);
-                    const t2 = String(r.team2_id);
-                    const s1 = Number(r.team1_score) || 0;
-                    const s2 = Number(r.team2_score) || 0;
-
-                    const st1 = addTeamIfMissing(t1);
-                    const st2 = addTeamIfMissing(t2);
-
-                    // each result counts as one game for both teams
-                    st1.games_played += 1;
-                    st2.games_played += 1;
-
-                    if (s1 > s2) {
-                        st1.wins += 1;
-                        st2.losses += 1;
-                    } else if (s2 > s1) {
-                        st2.wins += 1;
-                        st1.losses += 1;
-                    } else {
-                        // tie — do not increment wins/losses (keeps parity with existing logic)
-                    }
-                });
-
-                // compute win_pct (as percent like 65.4)
-                const rows = Object.values(stats).map(s => {
-                    const winPct = s.games_played > 0 ? (s.wins / s.games_played) * 100 : 0;
-                    return { ...s, win_pct: winPct, name: nameMap[s.id] ?? `Team ${s.id}` };
-                });
-
-                // determine leader (highest win_pct, break ties by most wins)
-                const leader = rows.reduce((best, t) => {
-                    if (!best) return t;
-                    if (t.win_pct > best.win_pct) return t;
-                    if (t.win_pct === best.win_pct && (t.wins || 0) > (best.wins || 0)) return t;
-                    return best;
-                }, rows[0] || { wins: 0, losses: 0, win_pct: 0 });
-
-                // compute games behind
-                const withGB = rows.map(t => {
-                    const gb = ((leader.wins - (t.wins || 0)) + ((t.losses || 0) - leader.losses)) / 2;
-                    return { ...t, games_behind: gb };
-                });
-
-                // sort by win_pct desc, then wins desc
-                withGB.sort((a, b) => {
-                    if (b.win_pct !== a.win_pct) return b.win_pct - a.win_pct;
-                    return (b.wins || 0) - (a.wins || 0);
-                });
-
-                // clinching indicators — 96 game season, remaining games per team vary (makeups)
-                // worst case for team: loses all remaining; best case for chaser: wins all remaining
-                // since all teams play 96 total games, final win% = wins/96, so compare wins directly
-                const seasonGames = 96;
-                const gamesLeft = (t) => seasonGames - t.games_played;
-                if (withGB.length >= 2) {
-                    const t1 = withGB[0];
-                    const t2 = withGB[1];
-                    // t1 clinches 1st if even losing all remaining, t2 winning all remaining can't catch t1
-                    if (t1.wins / seasonGames > (t2.wins + gamesLeft(t2)) / seasonGames) {
-                        withGB[0].clinched1st = true;
-                    }
-                }
-                if (withGB.length >= 3) {
-                    const t2 = withGB[1];
-                    const t3 = withGB[2];
-                    if (t2.wins / seasonGames > (t3.wins + gamesLeft(t3)) / seasonGames) {
-                        withGB[1].clinched2nd = true;
-                    }
-                }
-
-                setTeams(withGB);
+                // standings (W/L, games behind, clinch flags) are computed server-side
+                const resp = await fetchWithToken('/routes/standings', { method: 'GET' });
+                if (!resp.ok) throw new Error(`Standings HTTP ${resp.status}`);
+                const data = await resp.json();
+                setTeams(Array.isArray(data?.teams) ? data.teams : []);
             } catch (err) {
-                console.error('fetchStandingsFromResults failed', err);
+                console.error('fetchStandings failed', err);
                 setTeams([]);
             }
         };
 
-        fetchStandingsFromResults();
+        fetchStandings();
     }, []);
 
     const formatPct = (pct) => {